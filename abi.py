@@ -0,0 +1,226 @@
+"""
+Contract ABI Encoding for XMRT DAO
+Selectors, call encoding and log decoding for the token and governance ABIs
+"""
+
+from functools import lru_cache
+from typing import Dict, List, Any, Iterable, Sequence, Tuple
+
+# Keccak-f[1600] round constants and rotation offsets
+_ROUND_CONSTANTS = [
+    0x0000000000000001, 0x0000000000008082, 0x800000000000808A, 0x8000000080008000,
+    0x000000000000808B, 0x0000000080000001, 0x8000000080008081, 0x8000000000008009,
+    0x000000000000008A, 0x0000000000000088, 0x0000000080008009, 0x000000008000000A,
+    0x000000008000808B, 0x800000000000008B, 0x8000000000008089, 0x8000000000008003,
+    0x8000000000008002, 0x8000000000000080, 0x000000000000800A, 0x800000008000000A,
+    0x8000000080008081, 0x8000000000008080, 0x0000000080000001, 0x8000000080008008,
+]
+_ROTATIONS = [
+    [0, 36, 3, 41, 18], [1, 44, 10, 45, 2], [62, 6, 43, 15, 61],
+    [28, 55, 25, 21, 56], [27, 20, 39, 8, 14],
+]
+_MASK = (1 << 64) - 1
+
+def _keccak_f(state: List[List[int]]):
+    for constant in _ROUND_CONSTANTS:
+        parity = [state[x][0] ^ state[x][1] ^ state[x][2] ^ state[x][3] ^ state[x][4] for x in range(5)]
+        for x in range(5):
+            d = parity[(x - 1) % 5] ^ (((parity[(x + 1) % 5] << 1) | (parity[(x + 1) % 5] >> 63)) & _MASK)
+            for y in range(5):
+                state[x][y] ^= d
+        moved = [[0] * 5 for _ in range(5)]
+        for x in range(5):
+            for y in range(5):
+                r = _ROTATIONS[x][y]
+                lane = state[x][y]
+                moved[y][(2 * x + 3 * y) % 5] = ((lane << r) | (lane >> (64 - r))) & _MASK if r else lane
+        for x in range(5):
+            for y in range(5):
+                state[x][y] = moved[x][y] ^ ((~moved[(x + 1) % 5][y]) & moved[(x + 2) % 5][y])
+        state[0][0] ^= constant
+
+def keccak256(data: bytes) -> bytes:
+    """Ethereum's Keccak-256 (original padding, not NIST SHA3-256)"""
+    rate = 136
+    padded = bytearray(data)
+    padded.append(0x01)
+    padded.extend(bytes(-len(padded) % rate))
+    padded[-1] |= 0x80
+    state = [[0] * 5 for _ in range(5)]
+    for offset in range(0, len(padded), rate):
+        block = padded[offset:offset + rate]
+        for index in range(rate // 8):
+            state[index % 5][index // 5] ^= int.from_bytes(block[index * 8:index * 8 + 8], "little")
+        _keccak_f(state)
+    return b"".join(state[index % 5][index // 5].to_bytes(8, "little") for index in range(4))
+
+def signature(entry: Dict[str, Any]) -> str:
+    """Canonical signature of an ABI entry, e.g. ``transfer(address,uint256)``"""
+    return f"{entry['name']}({','.join(item['type'] for item in entry.get('inputs', []))})"
+
+@lru_cache(maxsize=None)
+def _selector(text: str) -> bytes:
+    return keccak256(text.encode())[:4]
+
+def function_selector(entry: Dict[str, Any]) -> bytes:
+    return _selector(signature(entry))
+
+@lru_cache(maxsize=None)
+def _topic(text: str) -> str:
+    return "0x" + keccak256(text.encode()).hex()
+
+def event_topic(entry: Dict[str, Any]) -> str:
+    """topic0 of an event ABI entry"""
+    return _topic(signature(entry))
+
+def checksum_address(address: str) -> str:
+    """EIP-55 mixed-case form of an address"""
+    hex_address = address.lower()[2:] if address.startswith(("0x", "0X")) else address.lower()
+    digest = keccak256(hex_address.encode()).hex()
+    return "0x" + "".join(char.upper() if int(nibble, 16) >= 8 else char
+                          for char, nibble in zip(hex_address, digest))
+
+def find_entry(abi: Iterable[Dict[str, Any]], name: str, kind: str = "function") -> Dict[str, Any]:
+    for entry in abi:
+        if entry.get("type") == kind and entry.get("name") == name:
+            return entry
+    raise KeyError(f"{kind} {name} not in ABI")
+
+def _encode_static(kind: str, value: Any) -> bytes:
+    if kind == "address":
+        return bytes(12) + bytes.fromhex(value[2:] if value.startswith("0x") else value)
+    if kind == "bool":
+        return int(bool(value)).to_bytes(32, "big")
+    if kind.startswith("uint"):
+        return int(value).to_bytes(32, "big")
+    if kind.startswith("int"):
+        return int(value).to_bytes(32, "big", signed=True)
+    if kind == "bytes32":
+        return bytes(value).ljust(32, b"\x00")
+    raise NotImplementedError(f"ABI type {kind} is not supported")
+
+def _encode_dynamic(kind: str, value: Any) -> bytes:
+    data = value.encode() if kind == "string" else bytes(value)
+    return len(data).to_bytes(32, "big") + data + b"\x00" * (-len(data) % 32)
+
+def encode_arguments(types: Sequence[str], values: Sequence[Any]) -> bytes:
+    """Head/tail ABI encoding of static types plus ``string`` and ``bytes``"""
+    heads, tails = [], []
+    tail_offset = 32 * len(types)
+    for kind, value in zip(types, values):
+        if kind in ("string", "bytes"):
+            encoded = _encode_dynamic(kind, value)
+            heads.append(tail_offset.to_bytes(32, "big"))
+            tails.append(encoded)
+            tail_offset += len(encoded)
+        else:
+            heads.append(_encode_static(kind, value))
+    return b"".join(heads) + b"".join(tails)
+
+def encode_call(entry: Dict[str, Any], *args: Any) -> str:
+    """Hex calldata for a function ABI entry"""
+    types = [item["type"] for item in entry.get("inputs", [])]
+    return "0x" + (function_selector(entry) + encode_arguments(types, args)).hex()
+
+def _decode_word(kind: str, word: bytes) -> Any:
+    if kind == "address":
+        return "0x" + word[12:].hex()
+    if kind == "bool":
+        return word[-1] == 1
+    if kind.startswith("uint"):
+        return int.from_bytes(word, "big")
+    if kind.startswith("int"):
+        return int.from_bytes(word, "big", signed=True)
+    if kind == "bytes32":
+        return "0x" + word.hex()
+    raise NotImplementedError(f"ABI type {kind} is not supported")
+
+def decode_values(types: Sequence[str], data: bytes) -> List[Any]:
+    """Decode ABI-encoded static values and ``string``/``bytes``"""
+    values = []
+    for index, kind in enumerate(types):
+        word = data[32 * index:32 * index + 32]
+        if kind in ("string", "bytes"):
+            offset = int.from_bytes(word, "big")
+            length = int.from_bytes(data[offset:offset + 32], "big")
+            raw = data[offset + 32:offset + 32 + length]
+            values.append(raw.decode() if kind == "string" else raw)
+        else:
+            values.append(_decode_word(kind, word))
+    return values
+
+def decode_output(entry: Dict[str, Any], result: str) -> List[Any]:
+    """Decode the hex result of an ``eth_call`` to a function"""
+    return decode_values([item["type"] for item in entry.get("outputs", [])], bytes.fromhex(result[2:]))
+
+class LogDecoder:
+    """Decodes raw logs of the events declared in one or more ABIs"""
+
+    def __init__(self, *abis: Iterable[Dict[str, Any]]):
+        self.events: Dict[str, Dict[str, Any]] = {}
+        for abi in abis:
+            for entry in abi:
+                if entry.get("type") == "event":
+                    self.events[event_topic(entry)] = entry
+
+    @property
+    def topics(self) -> List[str]:
+        return list(self.events)
+
+    def decode(self, log: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        """Event name and arguments of one log"""
+        entry = self.events[log["topics"][0]]
+        indexed = [item for item in entry["inputs"] if item.get("indexed")]
+        plain = [item for item in entry["inputs"] if not item.get("indexed")]
+        args = {}
+        for item, topic in zip(indexed, log["topics"][1:]):
+            args[item["name"]] = _decode_word(item["type"], bytes.fromhex(topic[2:]))
+        data = bytes.fromhex(log["data"][2:]) if log.get("data", "0x") != "0x" else b""
+        for item, value in zip(plain, decode_values([item["type"] for item in plain], data)):
+            args[item["name"]] = value
+        return entry["name"], args
+
+    def decode_many(self, logs: Iterable[Dict[str, Any]]) -> List[Tuple[Dict[str, Any], str, Dict[str, Any]]]:
+        """Decode a batch of logs, skipping events not in the ABIs"""
+        decoded = []
+        for log in logs:
+            if log["topics"] and log["topics"][0] in self.events:
+                name, args = self.decode(log)
+                decoded.append((log, name, args))
+        return decoded
+
+# Multicall3 is deployed at the same address on Ethereum and its testnets
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+_AGGREGATE3_SELECTOR = _selector("aggregate3((address,bool,bytes)[])")
+
+def encode_aggregate3(calls: Sequence[Tuple[str, str]]) -> str:
+    """Calldata for ``Multicall3.aggregate3`` over (target, calldata) pairs, failures allowed"""
+    encoded_calls = []
+    for target, calldata in calls:
+        payload = bytes.fromhex(calldata[2:])
+        # (address target, bool allowFailure, bytes callData): head of 3 words, then the bytes
+        encoded_calls.append(
+            _encode_static("address", target) + _encode_static("bool", True)
+            + (96).to_bytes(32, "big") + _encode_dynamic("bytes", payload)
+        )
+    offsets, position = [], 32 * len(encoded_calls)
+    for encoded in encoded_calls:
+        offsets.append(position.to_bytes(32, "big"))
+        position += len(encoded)
+    body = (32).to_bytes(32, "big") + len(encoded_calls).to_bytes(32, "big") + b"".join(offsets) + b"".join(encoded_calls)
+    return "0x" + (_AGGREGATE3_SELECTOR + body).hex()
+
+def decode_aggregate3(result: str) -> List[Tuple[bool, str]]:
+    """(success, hex returnData) per call of an ``aggregate3`` result"""
+    data = bytes.fromhex(result[2:])
+    array_start = int.from_bytes(data[0:32], "big")
+    count = int.from_bytes(data[array_start:array_start + 32], "big")
+    items_start = array_start + 32
+    results = []
+    for index in range(count):
+        offset = items_start + int.from_bytes(data[items_start + 32 * index:items_start + 32 * index + 32], "big")
+        success = data[offset + 31] == 1
+        data_offset = offset + int.from_bytes(data[offset + 32:offset + 64], "big")
+        length = int.from_bytes(data[data_offset:data_offset + 32], "big")
+        results.append((success, "0x" + data[data_offset + 32:data_offset + 32 + length].hex()))
+    return results
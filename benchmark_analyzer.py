@@ -0,0 +1,156 @@
+"""
+Message Analyzer Benchmark for XMRT DAO
+Compares the analyzer and keyword scans against the original per-keyword checks
+
+    python -m src.benchmark_analyzer [--messages 20000] [--seed 7] [--rounds 5]
+
+Reports the best of ``--rounds`` runs. Also provides the regression corpus
+the analyzer tests compare against.
+"""
+
+import argparse
+import random
+import re
+import time
+from typing import Callable, Dict, List, Any, Optional
+
+from src.services.eliza_agent import (
+    INTENT_KEYWORDS, POSITIVE_WORDS, NEGATIVE_WORDS, HIGH_URGENCY_WORDS,
+    MEDIUM_URGENCY_WORDS, ACTION_WORDS, TOKEN_WORDS, DAO_WORDS, RESPONSE_WORDS,
+    get_message_analyzer
+)
+
+# Hand-picked messages covering overlapping keywords ("voting"/"vote",
+# "dislike"/"like", "known"/"now"), proposal references and empty input
+CORPUS = [
+    "",
+    "hello there",
+    "what is the status of proposal #12?",
+    "i dislike this proposal 7 and proposal#8",
+    "voting on the treasury allocation now",
+    "urgent: security audit found a vulnerability",
+    "how do i stake xmrt tokens in the dao?",
+    "please execute the transfer asap, it is critical",
+    "i love the new governance update, great work",
+    "this is a bad idea, i oppose it and have a concern",
+    "known issue, i will report it soon",
+    "snow is falling quickly; nothing to vote on",
+    "the first option has the best returns and performance",
+    "deploy, implement, create and allocate funds fast",
+    "explain the risk and the threat model",
+    "summary of the financial report for the dao treasury",
+    "proposalproposal #3 proposal  #44 proposal#",
+    "supportive unlikeable hateful",
+]
+
+def reference_analyze(message: str) -> Dict[str, Any]:
+    """The original per-keyword analysis of a lowercased message"""
+    intent = "general_inquiry"
+    for candidate, words in INTENT_KEYWORDS:
+        if any(word in message for word in words):
+            intent = candidate
+            break
+
+    entities = []
+    if "proposal" in message:
+        entities.extend([f"proposal_{match}" for match in re.findall(r'proposal\s*#?(\d+)', message)])
+    if "xmrt" in message or "token" in message:
+        entities.append("xmrt_token")
+    if "dao" in message:
+        entities.append("dao")
+
+    positive_count = sum(1 for word in POSITIVE_WORDS if word in message)
+    negative_count = sum(1 for word in NEGATIVE_WORDS if word in message)
+    if positive_count > negative_count:
+        sentiment = "positive"
+    elif negative_count > positive_count:
+        sentiment = "negative"
+    else:
+        sentiment = "neutral"
+
+    if any(word in message for word in HIGH_URGENCY_WORDS):
+        urgency = "high"
+    elif any(word in message for word in MEDIUM_URGENCY_WORDS):
+        urgency = "medium"
+    else:
+        urgency = "low"
+
+    return {
+        "intent": intent,
+        "entities": entities,
+        "sentiment": sentiment,
+        "urgency": urgency,
+        "requires_action": any(word in message for word in ACTION_WORDS)
+    }
+
+def keywords() -> List[str]:
+    """Every keyword the analyzer knows"""
+    groups = [words for _, words in INTENT_KEYWORDS] + [
+        POSITIVE_WORDS, NEGATIVE_WORDS, HIGH_URGENCY_WORDS, MEDIUM_URGENCY_WORDS,
+        ACTION_WORDS, TOKEN_WORDS, DAO_WORDS, RESPONSE_WORDS
+    ]
+    return sorted({word for words in groups for word in words})
+
+def generate_messages(count: int, seed: int = 7) -> List[str]:
+    """Random messages built from keywords, keyword fragments and filler
+
+    Fragments are glued together without spaces so keywords overlap and
+    straddle each other, which is where a single-pass scan can go wrong.
+    """
+    rng = random.Random(seed)
+    words = keywords()
+    pieces = words + [word[:rng.randint(1, len(word))] for word in words] + [
+        " ", " ", "#", "proposal #", "the", "xm", "ow", "kn", "di", "12", "3"
+    ]
+    return [
+        "".join(rng.choice(pieces) for _ in range(rng.randint(0, 24)))
+        for _ in range(count)
+    ]
+
+def regex_scan(analyzer) -> Callable[[str], int]:
+    """Keyword bitmask from one precompiled alternation, for comparison"""
+    words = sorted(keywords(), key=len, reverse=True)
+    finditer = re.compile("(?=(" + "|".join(map(re.escape, words)) + "))").finditer
+    # The alternation reports the longest keyword at each offset; shorter
+    # ones starting there are substrings of it
+    masks = {word: analyzer.mask(other for other in words if other in word) for word in words}
+
+    def scan(message: str) -> int:
+        found = 0
+        for match in finditer(message):
+            found |= masks[match.group(1)]
+        return found
+
+    return scan
+
+def run(analyze: Callable[[str], Any], messages: List[str], rounds: int = 1) -> float:
+    """Messages analyzed per second, best of ``rounds``"""
+    best = 0.0
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for message in messages:
+            analyze(message)
+        best = max(best, len(messages) / (time.perf_counter() - started))
+    return best
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    messages = CORPUS + generate_messages(args.messages, args.seed)
+    analyzer = get_message_analyzer()
+    scan = regex_scan(analyzer)
+    mismatches = sum(1 for message in messages if analyzer.analyze(message) != reference_analyze(message))
+    mismatches += sum(1 for message in messages if scan(message) != analyzer.scan(message))
+    print(f"{'analyzer':<26}{'messages/s':>12}")
+    for name, analyze in (("per-keyword checks", reference_analyze), ("MessageAnalyzer.analyze", analyzer.analyze),
+                          ("keyword mask: in checks", analyzer.scan), ("keyword mask: regex scan", scan)):
+        print(f"{name:<26}{run(analyze, messages, args.rounds):>12.0f}")
+    print(f"mismatches: {mismatches}")
+    return 1 if mismatches else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,125 @@
+"""
+Database Concurrency Benchmark for XMRT DAO
+Compares write/read throughput of the supported engine configurations
+
+    python -m src.benchmark_db [--seconds 10] [--writers 8] [--readers 8]
+
+Set BENCH_POSTGRES_URL to include a PostgreSQL run.
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, List, Any
+
+from flask import Flask
+
+from src.database import configure_database
+from src.models.user import db
+from src.models.dao import ChatMessage
+from src.migrations import upgrade
+from src.routes.listing import keyset_page_json
+
+# Engine configurations under test: environment overrides per mode
+MODES: Dict[str, Dict[str, str]] = {
+    "sqlite-default": {"SQLITE_JOURNAL_MODE": "DELETE", "SQLITE_SYNCHRONOUS": "FULL", "SQLITE_BUSY_TIMEOUT_MS": "0"},
+    "sqlite-wal": {"SQLITE_JOURNAL_MODE": "WAL", "SQLITE_SYNCHRONOUS": "NORMAL", "SQLITE_BUSY_TIMEOUT_MS": "5000"},
+    "postgresql": {},
+}
+
+def _create_app(url: str, overrides: Dict[str, str]) -> Flask:
+    saved = {name: os.environ.get(name) for name in overrides}
+    os.environ.update(overrides)
+    try:
+        app = Flask(__name__)
+        configure_database(app, "", url=url)
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+    return app
+
+def run_mode(url: str, overrides: Dict[str, str], seconds: float, writers: int, readers: int) -> Dict[str, Any]:
+    """Run concurrent single-row writers and page readers for ``seconds``"""
+    app = _create_app(url, overrides)
+    with app.app_context():
+        upgrade()
+        db.session.execute(db.delete(ChatMessage))
+        db.session.commit()
+
+    counts = {"writes": 0, "reads": 0, "errors": 0}
+    lock = threading.Lock()
+    deadline = time.monotonic() + seconds
+
+    def writer(worker: int):
+        done = errors = 0
+        with app.app_context():
+            while time.monotonic() < deadline:
+                try:
+                    db.session.add(ChatMessage(session_id=f"bench-{worker}", agent_name="bench",
+                                               message_type="user", content="benchmark message"))
+                    db.session.commit()
+                    done += 1
+                except Exception:
+                    db.session.rollback()
+                    errors += 1
+        with lock:
+            counts["writes"] += done
+            counts["errors"] += errors
+
+    def reader(worker: int):
+        done = errors = 0
+        with app.app_context():
+            while time.monotonic() < deadline:
+                try:
+                    keyset_page_json(ChatMessage, limit=50)
+                    db.session.rollback()
+                    done += 1
+                except Exception:
+                    db.session.rollback()
+                    errors += 1
+        with lock:
+            counts["reads"] += done
+            counts["errors"] += errors
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    threads += [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    with app.app_context():
+        db.engine.dispose()
+    return {
+        "writes_per_sec": round(counts["writes"] / seconds, 1),
+        "reads_per_sec": round(counts["reads"] / seconds, 1),
+        "errors": counts["errors"]
+    }
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=8)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        urls = {
+            "sqlite-default": f"sqlite:///{os.path.join(directory, 'default.db')}",
+            "sqlite-wal": f"sqlite:///{os.path.join(directory, 'wal.db')}",
+            "postgresql": os.environ.get("BENCH_POSTGRES_URL"),
+        }
+        print(f"{'mode':<16}{'writes/s':>10}{'reads/s':>10}{'errors':>8}")
+        for mode, overrides in MODES.items():
+            if not urls[mode]:
+                continue
+            result = run_mode(urls[mode], overrides, args.seconds, args.writers, args.readers)
+            print(f"{mode:<16}{result['writes_per_sec']:>10}{result['reads_per_sec']:>10}{result['errors']:>8}")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,88 @@
+"""
+Conversation History Benchmark for XMRT DAO
+Compares the ring-buffer history with the re-sliced list it replaced
+
+    python -m src.benchmark_history [--sessions 100000] [--messages 30] [--window 20]
+
+Message texts are shared between sessions, so the memory figures measure
+the history structures and their timestamps, not the chat text itself.
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List, Any, Optional, Tuple
+
+from src.services.eliza_agent import ConversationHistory
+
+USER_MESSAGE = "what is the status of proposal #12?"
+AGENT_RESPONSE = "Proposal #12 is open for voting until the end of the week."
+
+class ListHistory:
+    """The original history: dicts with formatted timestamps, re-sliced past the window"""
+    __slots__ = ("entries", "window")
+
+    def __init__(self, window: int):
+        self.entries: List[Dict[str, str]] = []
+        self.window = window
+
+    def append(self, user_message: str, agent_response: str):
+        self.entries.append({
+            "timestamp": datetime.utcnow().isoformat(),
+            "user": user_message,
+            "agent": agent_response
+        })
+        if len(self.entries) > self.window:
+            self.entries = self.entries[-self.window:]
+
+class RingHistory:
+    """Adapter giving ConversationHistory the same append signature"""
+    __slots__ = ("history",)
+
+    def __init__(self, window: int):
+        self.history = ConversationHistory(window)
+
+    def append(self, user_message: str, agent_response: str):
+        self.history.append(time.time(), user_message, agent_response)
+
+def fill(factory: Callable[[int], Any], sessions: int, messages: int, window: int) -> List[Any]:
+    histories = [factory(window) for _ in range(sessions)]
+    # Round-robin over sessions, as interleaved chats would arrive
+    for _ in range(messages):
+        for history in histories:
+            history.append(USER_MESSAGE, AGENT_RESPONSE)
+    return histories
+
+def run(factory: Callable[[int], Any], sessions: int, messages: int, window: int) -> Tuple[float, int]:
+    """Return (appends per second, bytes held once every session is filled)"""
+    gc.collect()
+    started = time.perf_counter()
+    histories = fill(factory, sessions, messages, window)
+    rate = sessions * messages / (time.perf_counter() - started)
+    del histories
+    gc.collect()
+    # Measured on a second fill, since tracing slows allocation down
+    tracemalloc.start()
+    histories = fill(factory, sessions, messages, window)
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del histories
+    return rate, held
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=100000)
+    parser.add_argument("--messages", type=int, default=30)
+    parser.add_argument("--window", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    print(f"{'history':<22}{'appends/s':>12}{'MiB held':>10}{'bytes/session':>15}")
+    for name, factory in (("re-sliced list", ListHistory), ("ring buffer", RingHistory)):
+        rate, held = run(factory, args.sessions, args.messages, args.window)
+        print(f"{name:<22}{rate:>12.0f}{held / 2 ** 20:>10.1f}{held / args.sessions:>15.0f}")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,121 @@
+"""
+RPC Transport Benchmark for XMRT DAO
+Compares node clients against a local stand-in node with fixed latency
+
+    python -m src.benchmark_rpc [--calls 2000] [--threads 32] [--latency 0.005]
+"""
+
+import argparse
+import json
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Any, Optional
+
+from src.services.rpc import JsonRpcClient, PooledRpcClient
+
+class StandInNode:
+    """Minimal JSON-RPC node answering every call after ``latency`` seconds"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.round_trips = 0
+        self.connections = 0
+        node = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                node.connections += 1
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                node.round_trips += 1
+                time.sleep(node.latency)
+                answer = lambda call: {"jsonrpc": "2.0", "id": call["id"], "result": hex(12345680)}
+                body = json.dumps([answer(call) for call in request] if isinstance(request, list)
+                                  else answer(request)).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        class Server(ThreadingHTTPServer):
+            daemon_threads = True
+            request_queue_size = 256
+
+        self.server = Server(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def reset(self):
+        self.round_trips = 0
+        self.connections = 0
+
+    def shutdown(self):
+        self.server.shutdown()
+
+def _connection_per_call(url: str) -> Callable[[], Any]:
+    def call():
+        body = json.dumps({"jsonrpc": "2.0", "id": 1, "method": "eth_blockNumber", "params": []}).encode()
+        request = urllib.request.Request(url, body, {"Content-Type": "application/json"})
+        with urllib.request.urlopen(request) as response:
+            return json.loads(response.read())["result"]
+    return call
+
+def run(call: Callable[[], Any], calls: int, threads: int) -> float:
+    """Issue ``calls`` calls from ``threads`` threads; return calls per second"""
+    per_thread = calls // threads
+
+    def worker():
+        for _ in range(per_thread):
+            call()
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return per_thread * threads / (time.perf_counter() - started)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--latency", type=float, default=0.005)
+    args = parser.parse_args(argv)
+
+    node = StandInNode(args.latency)
+    thread_local = threading.local()
+
+    def keep_alive_call():
+        if not hasattr(thread_local, "client"):
+            thread_local.client = JsonRpcClient(node.url)
+        return thread_local.client.call("eth_blockNumber")
+
+    pooled = PooledRpcClient([node.url], max_concurrency=16)
+    clients: Dict[str, Callable[[], Any]] = {
+        "connection per call": _connection_per_call(node.url),
+        "keep-alive per thread": keep_alive_call,
+        "pooled async, pipelined": lambda: pooled.call("eth_blockNumber"),
+    }
+    print(f"{'client':<26}{'calls/s':>10}{'round trips':>13}{'connections':>13}")
+    for name, call in clients.items():
+        node.reset()
+        rate = run(call, args.calls, args.threads)
+        print(f"{name:<26}{rate:>10.0f}{node.round_trips:>13}{node.connections:>13}")
+    pooled.close()
+    node.shutdown()
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
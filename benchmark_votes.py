@@ -0,0 +1,123 @@
+"""
+Vote Casting Benchmark for XMRT DAO
+Votes/sec and lost counter updates under concurrent writers
+
+    python -m src.benchmark_votes [--seconds 10] [--writers 8] [--proposals 4]
+
+Set BENCH_POSTGRES_URL to include a PostgreSQL run.
+"""
+
+import argparse
+import itertools
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Any, Optional
+
+from flask import Flask
+
+from src.benchmark_db import MODES, _create_app
+from src.models.user import db
+from src.models.dao import Proposal, Vote
+from src.migrations import upgrade
+from src.services.voting import cast_vote, reconcile_vote_counts
+
+def read_modify_write_vote(proposal_id: int, voter_address: str, vote_choice: bool, vote_weight: int = 1):
+    """The counter update the service replaced: read the proposal, add in Python, write back"""
+    db.session.add(Vote(proposal_id=proposal_id, voter_address=voter_address,
+                        vote_choice=vote_choice, vote_weight=vote_weight))
+    proposal = db.session.get(Proposal, proposal_id)
+    if vote_choice:
+        proposal.votes_for = (proposal.votes_for or 0) + vote_weight
+    else:
+        proposal.votes_against = (proposal.votes_against or 0) + vote_weight
+    proposal.total_votes = (proposal.total_votes or 0) + vote_weight
+    db.session.commit()
+
+STRATEGIES: Dict[str, Callable[..., Any]] = {
+    "read-modify-write": read_modify_write_vote,
+    "atomic increment": cast_vote,
+}
+
+def _reset(app: Flask, proposals: int) -> List[int]:
+    with app.app_context():
+        upgrade()
+        db.session.execute(db.delete(Vote))
+        db.session.execute(db.delete(Proposal))
+        rows = [
+            Proposal(title=f"Benchmark {index}", description="benchmark", creator_address="0x0",
+                     voting_ends_at=datetime.utcnow() + timedelta(days=7))
+            for index in range(proposals)
+        ]
+        db.session.add_all(rows)
+        db.session.commit()
+        return [row.id for row in rows]
+
+def run_strategy(app: Flask, vote: Callable[..., Any], seconds: float, writers: int, proposals: int) -> Dict[str, Any]:
+    """Cast unique votes from ``writers`` threads for ``seconds``, then count lost updates"""
+    proposal_ids = _reset(app, proposals)
+    counts = {"votes": 0, "errors": 0}
+    lock = threading.Lock()
+    deadline = time.monotonic() + seconds
+
+    def writer(worker: int):
+        done = errors = 0
+        with app.app_context():
+            for sequence in itertools.count():
+                if time.monotonic() >= deadline:
+                    break
+                try:
+                    vote(proposal_ids[sequence % proposals], f"0x{worker:04x}{sequence:036x}",
+                         sequence % 3 != 0, 1 + sequence % 5)
+                    done += 1
+                except Exception:
+                    db.session.rollback()
+                    errors += 1
+        with lock:
+            counts["votes"] += done
+            counts["errors"] += errors
+
+    threads = [threading.Thread(target=writer, args=(index,)) for index in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    with app.app_context():
+        mismatches = reconcile_vote_counts(fix=False)
+        lost = sum(
+            mismatch["expected"]["total_votes"] - mismatch["stored"]["total_votes"]
+            for mismatch in mismatches
+        )
+        db.engine.dispose()
+    return {
+        "votes_per_sec": round(counts["votes"] / seconds, 1),
+        "errors": counts["errors"],
+        "lost_weight": lost
+    }
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--proposals", type=int, default=4)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        urls = {
+            "sqlite-wal": f"sqlite:///{os.path.join(directory, 'votes.db')}",
+            "postgresql": os.environ.get("BENCH_POSTGRES_URL"),
+        }
+        print(f"{'mode':<12}{'strategy':<20}{'votes/s':>10}{'errors':>8}{'lost weight':>13}")
+        for mode, url in urls.items():
+            if not url:
+                continue
+            app = _create_app(url, MODES[mode])
+            for name, vote in STRATEGIES.items():
+                result = run_strategy(app, vote, args.seconds, args.writers, args.proposals)
+                print(f"{mode:<12}{name:<20}{result['votes_per_sec']:>10}{result['errors']:>8}{result['lost_weight']:>13}")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -3,12 +3,28 @@ Blockchain Integration Service for XMRT DAO
 Handles Web3 interactions with XMRT token on Sepolia Testnet
 """
 
-import json
+import os
+import threading
 import time
-from typing import Dict, List, Any, Optional, Tuple
+from decimal import Decimal, InvalidOperation
+from typing import Dict, List, Any, Optional, Sequence, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 import hashlib
+from collections import OrderedDict
+
+from src.services.abi import (MULTICALL3_ADDRESS, decode_aggregate3, decode_output, encode_aggregate3,
+                              encode_call, find_entry)
+from src.services.chain_cache import ChainReadCache
+from src.services.rpc import PooledRpcClient
+from src.services.tx_queue import LocalSigner, TransactionQueue, require_eth_account
+
+# Gas limits with headroom over the contracts' measured usage
+GAS_LIMITS = {
+    "stake": 100000,
+    "castVote": 80000,
+    "createProposal": 200000
+}
 
 # Mock Web3 implementation for demonstration
 # In production, this would use actual Web3.py library
@@ -32,12 +48,52 @@ class TransactionResult:
     error_message: Optional[str] = None
 
 class BlockchainService:
-    """Service for blockchain interactions"""
+    """Service for blockchain interactions
+
+    Without an ``rpc_client`` every read returns mock data. With one, the
+    bulk readers ``get_balances``/``get_staking_infos`` fetch many
+    addresses per round trip: ``batch_size`` ``eth_call``s per JSON-RPC
+    batch, or ``multicall_size`` calls aggregated into one Multicall3
+    ``eth_call`` when ``use_multicall`` is set.
+
+    Dashboard reads (token info, network stats, single balances and
+    transaction status) go through a ``ChainReadCache``, so concurrent
+    polls share one RPC per block; receipts ``finality_depth`` blocks deep
+    are kept for good.
+
+    Staking, voting and proposal creation are sent through one
+    ``TransactionQueue`` per signing key and return once the node has
+    accepted the transaction; its status is then read with
+    ``get_transaction_status``.
+    """
     
-    def __init__(self):
+    def __init__(self, rpc_client=None, batch_size: int = 100, multicall_size: int = 500,
+                 use_multicall: bool = False, multicall_address: str = MULTICALL3_ADDRESS,
+                 head_ttl: float = 1.0, finality_depth: int = 12, governance_address: Optional[str] = None,
+                 private_key: Optional[str] = None, tx_workers: int = 4, submit_timeout: float = 30.0,
+                 confirm_timeout: float = 600.0, max_tx_queues: int = 16):
         self.token_info = TokenInfo()
         self.network_url = "https://sepolia.infura.io/v3/YOUR_PROJECT_ID"
         self.chain_id = 11155111  # Sepolia testnet
+        self.governance_address = governance_address
+        self.rpc = rpc_client
+        self.batch_size = batch_size
+        self.multicall_size = multicall_size
+        self.use_multicall = use_multicall
+        self.multicall_address = multicall_address
+        self.finality_depth = finality_depth
+        self.chain_cache = ChainReadCache(self._fetch_head, head_ttl) if rpc_client is not None else None
+        self._abi_entries: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        if rpc_client is not None and private_key is not None:
+            # Fail at startup rather than on the first write request
+            require_eth_account()
+        self.default_private_key = private_key
+        self.tx_workers = tx_workers
+        self.submit_timeout = submit_timeout
+        self.confirm_timeout = confirm_timeout
+        self.max_tx_queues = max_tx_queues
+        self._tx_queues: "OrderedDict[str, TransactionQueue]" = OrderedDict()
+        self._tx_queues_lock = threading.Lock()
         
         # Mock contract ABI for XMRT token
         self.token_abi = [
@@ -87,6 +143,33 @@ class BlockchainService:
                 "name": "vote",
                 "outputs": [{"name": "", "type": "bool"}],
                 "type": "function"
+            },
+            {
+                "inputs": [{"name": "account", "type": "address"}],
+                "name": "stakeInfo",
+                "outputs": [
+                    {"name": "amount", "type": "uint256"},
+                    {"name": "rewards", "type": "uint256"},
+                    {"name": "since", "type": "uint256"}
+                ],
+                "type": "function"
+            },
+            {
+                "inputs": [
+                    {"name": "from", "type": "address", "indexed": True},
+                    {"name": "to", "type": "address", "indexed": True},
+                    {"name": "value", "type": "uint256", "indexed": False}
+                ],
+                "name": "Transfer",
+                "type": "event"
+            },
+            {
+                "inputs": [
+                    {"name": "account", "type": "address", "indexed": True},
+                    {"name": "amount", "type": "uint256", "indexed": False}
+                ],
+                "name": "Staked",
+                "type": "event"
             }
         ]
         
@@ -117,23 +200,80 @@ class BlockchainService:
                 "name": "executeProposal",
                 "outputs": [{"name": "", "type": "bool"}],
                 "type": "function"
+            },
+            {
+                "inputs": [
+                    {"name": "proposalId", "type": "uint256", "indexed": True},
+                    {"name": "proposer", "type": "address", "indexed": True},
+                    {"name": "description", "type": "string", "indexed": False},
+                    {"name": "votingPeriod", "type": "uint256", "indexed": False}
+                ],
+                "name": "ProposalCreated",
+                "type": "event"
+            },
+            {
+                "inputs": [
+                    {"name": "proposalId", "type": "uint256", "indexed": True},
+                    {"name": "voter", "type": "address", "indexed": True},
+                    {"name": "support", "type": "bool", "indexed": False},
+                    {"name": "weight", "type": "uint256", "indexed": False}
+                ],
+                "name": "VoteCast",
+                "type": "event"
+            },
+            {
+                "inputs": [
+                    {"name": "proposalId", "type": "uint256", "indexed": True}
+                ],
+                "name": "ProposalExecuted",
+                "type": "event"
             }
         ]
     
+    def _token_function(self, name: str) -> Dict[str, Any]:
+        """ABI entry of a token function; the ABI never changes, so lookups are memoized"""
+        key = ("token", name)
+        entry = self._abi_entries.get(key)
+        if entry is None:
+            entry = self._abi_entries[key] = find_entry(self.token_abi, name)
+        return entry
+    
+    def _governance_function(self, name: str) -> Dict[str, Any]:
+        key = ("governance", name)
+        entry = self._abi_entries.get(key)
+        if entry is None:
+            entry = self._abi_entries[key] = find_entry(self.governance_abi, name)
+        return entry
+    
+    def _fetch_head(self) -> int:
+        return int(self.rpc.call("eth_blockNumber"), 16)
+    
+    def _read_token(self, name: str, *args: Any) -> List[Any]:
+        """Decoded token call at the current head, shared by every caller in the block"""
+        entry = self._token_function(name)
+        return self.chain_cache.get(name, args, lambda block: decode_output(entry, self.rpc.call("eth_call", [
+            {"to": self.token_info.contract_address, "data": encode_call(entry, *args)}, hex(block)
+        ])))
+    
     def get_token_info(self) -> Dict[str, Any]:
         """Get XMRT token information"""
+        total_supply = self.token_info.total_supply
+        if self.rpc is not None:
+            total_supply = self._format_units(self._read_token("totalSupply")[0])
         return {
             "contract_address": self.token_info.contract_address,
             "network": self.token_info.network,
             "symbol": self.token_info.symbol,
             "decimals": self.token_info.decimals,
-            "total_supply": self.token_info.total_supply,
+            "total_supply": total_supply,
             "chain_id": self.chain_id,
             "explorer_url": f"https://sepolia.etherscan.io/token/{self.token_info.contract_address}"
         }
     
     def get_balance(self, address: str) -> Dict[str, Any]:
         """Get XMRT token balance for an address"""
+        if self.rpc is not None:
+            return self._balance_result(address, self._read_token("balanceOf", address)[0])
         # Mock implementation - in production, this would call the actual contract
         mock_balances = {
             "0x77307DFbc436224d5e6f2048d2b6bDfA66998a15": "15000",
@@ -152,6 +292,8 @@ class BlockchainService:
     
     def get_staking_info(self, address: str) -> Dict[str, Any]:
         """Get staking information for an address"""
+        if self.rpc is not None:
+            return self.get_staking_infos([address])[0]
         # Mock staking data
         mock_staking = {
             "0x77307DFbc436224d5e6f2048d2b6bDfA66998a15": {
@@ -180,8 +322,167 @@ class BlockchainService:
             "apy": "12.5%"
         }
     
+    def get_balances(self, addresses: Sequence[str], chunk_size: int = None,
+                     use_multicall: bool = None) -> List[Dict[str, Any]]:
+        """Get XMRT balances for many addresses, in input order"""
+        if self.rpc is None:
+            return [self.get_balance(address) for address in addresses]
+        balance_of = self._token_function("balanceOf")
+        results = self._call_token_many(
+            [encode_call(balance_of, address) for address in addresses], chunk_size, use_multicall
+        )
+        return [
+            self._balance_result(address, decode_output(balance_of, result)[0])
+            for address, result in zip(addresses, results)
+        ]
+    
+    def get_staking_infos(self, addresses: Sequence[str], chunk_size: int = None,
+                          use_multicall: bool = None) -> List[Dict[str, Any]]:
+        """Get staking information for many addresses, in input order"""
+        if self.rpc is None:
+            return [self.get_staking_info(address) for address in addresses]
+        stake_info = self._token_function("stakeInfo")
+        results = self._call_token_many(
+            [encode_call(stake_info, address) for address in addresses], chunk_size, use_multicall
+        )
+        now = time.time()
+        staking_infos = []
+        for address, result in zip(addresses, results):
+            amount, rewards, since = decode_output(stake_info, result)
+            days = int((now - since) // 86400) if amount and since else 0
+            staking_infos.append({
+                "address": address,
+                "staked_amount": self._format_units(amount),
+                "rewards_earned": self._format_units(rewards),
+                "staking_duration": f"{days} days",
+                "apy": "12.5%"
+            })
+        return staking_infos
+    
+    def _call_token_many(self, calldata: List[str], chunk_size: int = None,
+                         use_multicall: bool = None) -> List[str]:
+        """Run read-only token calls in as few round trips as possible"""
+        target = self.token_info.contract_address
+        if self.use_multicall if use_multicall is None else use_multicall:
+            size = chunk_size or self.multicall_size
+            results = []
+            for start in range(0, len(calldata), size):
+                chunk = calldata[start:start + size]
+                reply = self.rpc.call("eth_call", [
+                    {"to": self.multicall_address, "data": encode_aggregate3([(target, data) for data in chunk])},
+                    "latest"
+                ])
+                for success, data in decode_aggregate3(reply):
+                    if not success:
+                        raise ValueError(f"Token call reverted inside multicall: {data}")
+                    results.append(data)
+            return results
+        size = chunk_size or self.batch_size
+        results = []
+        for start in range(0, len(calldata), size):
+            results.extend(self.rpc.batch([
+                ("eth_call", [{"to": target, "data": data}, "latest"])
+                for data in calldata[start:start + size]
+            ]))
+        return results
+    
+    def _format_units(self, amount: int) -> str:
+        """Whole-token string for a base-unit amount, without trailing zeros"""
+        value = (Decimal(amount) / (Decimal(10) ** self.token_info.decimals)).normalize()
+        return f"{value:f}"
+    
+    def _balance_result(self, address: str, wei: int) -> Dict[str, Any]:
+        balance = self._format_units(wei)
+        return {
+            "address": address,
+            "balance": balance,
+            "balance_formatted": f"{balance} XMRT",
+            "balance_wei": str(wei)
+        }
+    
+    def transaction_queue(self, private_key: str) -> TransactionQueue:
+        """The submission queue of a signing key, created on first use
+
+        At most ``max_tx_queues`` queues are kept; the least recently used
+        one is stopped to make room, after sending what it has queued.
+        """
+        key = hashlib.sha256(private_key.encode()).hexdigest()
+        evicted = None
+        with self._tx_queues_lock:
+            tx_queue = self._tx_queues.get(key)
+            if tx_queue is not None:
+                self._tx_queues.move_to_end(key)
+                return tx_queue
+            tx_queue = self._tx_queues[key] = TransactionQueue(self, LocalSigner(private_key),
+                                                               workers=self.tx_workers,
+                                                               confirm_timeout=self.confirm_timeout)
+            if len(self._tx_queues) > self.max_tx_queues:
+                _, evicted = self._tx_queues.popitem(last=False)
+        if evicted is not None:
+            threading.Thread(target=evicted.stop, args=(self.submit_timeout,), name="tx-queue-evict",
+                             daemon=True).start()
+        return tx_queue
+    
+    def _submit(self, address: str, private_key: Optional[str], to: Optional[str], entry: Dict[str, Any],
+                *args: Any) -> TransactionResult:
+        """Queue a contract call and wait until the node accepts it"""
+        private_key = private_key or self.default_private_key
+        if private_key is None:
+            return TransactionResult(success=False, transaction_hash="",
+                                     error_message="No private key configured for sending transactions")
+        if to is None:
+            return TransactionResult(success=False, transaction_hash="",
+                                     error_message="GOVERNANCE_CONTRACT_ADDRESS is not configured")
+        try:
+            tx_queue = self.transaction_queue(private_key)
+        except RuntimeError as exc:
+            return TransactionResult(success=False, transaction_hash="", error_message=str(exc))
+        except ValueError:
+            return TransactionResult(success=False, transaction_hash="", error_message="Invalid private key")
+        if address and address.lower() != tx_queue.signer.address.lower():
+            return TransactionResult(success=False, transaction_hash="",
+                                     error_message=f"Signing key does not belong to {address}")
+        pending = tx_queue.submit(
+            to, encode_call(entry, *args), GAS_LIMITS[entry["name"]], label=entry["name"]
+        )
+        if not pending.wait_sent(self.submit_timeout):
+            return TransactionResult(success=False, transaction_hash="",
+                                     error_message="Timed out waiting for the transaction to be sent")
+        return TransactionResult(
+            success=pending.error is None,
+            transaction_hash=pending.tx_hash or "",
+            error_message=pending.error
+        )
+    
+    def stop_transaction_queues(self, timeout: float = 30.0):
+        """Send every queued transaction, then stop the queues' threads"""
+        with self._tx_queues_lock:
+            queues = list(self._tx_queues.values())
+        for tx_queue in queues:
+            tx_queue.stop(timeout)
+    
+    def get_transaction_stats(self) -> List[Dict[str, Any]]:
+        """Queue depth, in-flight count and time-to-confirm per signing account"""
+        with self._tx_queues_lock:
+            queues = list(self._tx_queues.values())
+        return [tx_queue.get_stats() for tx_queue in queues]
+    
     def stake_tokens(self, address: str, amount: str, private_key: str = None) -> TransactionResult:
         """Stake XMRT tokens"""
+        try:
+            tokens = Decimal(amount)
+        except (InvalidOperation, TypeError, ValueError):
+            tokens = None
+        if tokens is None or not tokens.is_finite() or tokens <= 0:
+            return TransactionResult(success=False, transaction_hash="",
+                                     error_message=f"Invalid amount: {amount!r}")
+        if tokens.normalize().as_tuple().exponent < -self.token_info.decimals:
+            return TransactionResult(success=False, transaction_hash="",
+                                     error_message=f"Amount has more than {self.token_info.decimals} decimals")
+        if self.rpc is not None:
+            wei = int(tokens.scaleb(self.token_info.decimals))
+            return self._submit(address, private_key, self.token_info.contract_address,
+                                self._token_function("stake"), wei)
         # Mock transaction - in production, this would create and send a real transaction
         tx_hash = self._generate_mock_tx_hash(f"stake_{address}_{amount}")
         
@@ -194,6 +495,9 @@ class BlockchainService:
     
     def vote_on_proposal(self, address: str, proposal_id: int, support: bool, private_key: str = None) -> TransactionResult:
         """Vote on a governance proposal"""
+        if self.rpc is not None:
+            return self._submit(address, private_key, self.governance_address,
+                                self._governance_function("castVote"), proposal_id, support)
         # Mock voting transaction
         tx_hash = self._generate_mock_tx_hash(f"vote_{address}_{proposal_id}_{support}")
         
@@ -206,6 +510,9 @@ class BlockchainService:
     
     def create_proposal(self, address: str, description: str, voting_period: int = 604800, private_key: str = None) -> TransactionResult:
         """Create a new governance proposal"""
+        if self.rpc is not None:
+            return self._submit(address, private_key, self.governance_address,
+                                self._governance_function("createProposal"), description, voting_period)
         # Mock proposal creation
         tx_hash = self._generate_mock_tx_hash(f"proposal_{address}_{description[:20]}")
         
@@ -218,6 +525,8 @@ class BlockchainService:
     
     def get_transaction_status(self, tx_hash: str) -> Dict[str, Any]:
         """Get transaction status and details"""
+        if self.rpc is not None:
+            return self._transaction_status(tx_hash)
         # Mock transaction status
         return {
             "hash": tx_hash,
@@ -230,19 +539,67 @@ class BlockchainService:
             "explorer_url": f"https://sepolia.etherscan.io/tx/{tx_hash}"
         }
     
+    def _transaction_status(self, tx_hash: str) -> Dict[str, Any]:
+        cache = self.chain_cache
+        final, receipt = cache.lookup_immutable("eth_getTransactionReceipt", (tx_hash,))
+        head = cache.head()
+        if not final:
+            # Shallow receipts can still be reorged away, so re-read them each block
+            receipt = cache.get("eth_getTransactionReceipt", (tx_hash,),
+                                lambda block: self.rpc.call("eth_getTransactionReceipt", [tx_hash]))
+        if receipt is None:
+            return {
+                "hash": tx_hash,
+                "status": "pending",
+                "block_number": None,
+                "confirmations": 0,
+                "gas_used": None,
+                "gas_price": None,
+                "timestamp": None,
+                "explorer_url": f"https://sepolia.etherscan.io/tx/{tx_hash}"
+            }
+        block_number = int(receipt["blockNumber"], 16)
+        confirmations = max(head - block_number + 1, 0)
+        # A block looked up by hash never changes
+        block = cache.get_immutable("eth_getBlockByHash", (receipt["blockHash"],),
+                                    lambda: self.rpc.call("eth_getBlockByHash", [receipt["blockHash"], False]))
+        # A node behind the one that served the receipt (or a reorg) may not
+        # know the block; the receipt is then not final either
+        if block is not None and not final and confirmations >= self.finality_depth:
+            cache.remember("eth_getTransactionReceipt", (tx_hash,), receipt)
+        return {
+            "hash": tx_hash,
+            "status": "confirmed" if int(receipt["status"], 16) == 1 else "failed",
+            "block_number": block_number,
+            "confirmations": confirmations,
+            "gas_used": int(receipt["gasUsed"], 16),
+            "gas_price": str(int(receipt.get("effectiveGasPrice", "0x0"), 16)),
+            "timestamp": datetime.utcfromtimestamp(int(block["timestamp"], 16)).isoformat() if block else None,
+            "explorer_url": f"https://sepolia.etherscan.io/tx/{tx_hash}"
+        }
+    
     def get_network_stats(self) -> Dict[str, Any]:
         """Get network statistics"""
+        latest_block, gas_price = 12345680, "20 gwei"
+        if self.rpc is not None:
+            latest_block = self.chain_cache.head()
+            wei = self.chain_cache.get("eth_gasPrice", (), lambda block: int(self.rpc.call("eth_gasPrice"), 16))
+            gas_price = f"{(Decimal(wei) / Decimal(10) ** 9).normalize():f} gwei"
         return {
             "network": "Sepolia Testnet",
             "chain_id": self.chain_id,
-            "latest_block": 12345680,
-            "gas_price": "20 gwei",
+            "latest_block": latest_block,
+            "gas_price": gas_price,
             "total_xmrt_holders": 1247,
             "total_staked": "450000 XMRT",
             "treasury_balance": "150000 XMRT",
             "active_proposals": 3
         }
     
+    def get_cache_stats(self) -> Optional[Dict[str, Any]]:
+        """Chain read cache counters, or None when serving mock data"""
+        return self.chain_cache.get_stats() if self.chain_cache is not None else None
+    
     def _generate_mock_tx_hash(self, data: str) -> str:
         """Generate a mock transaction hash"""
         timestamp = str(int(time.time()))
@@ -300,8 +657,33 @@ class ZKProofService:
             "verification_time": "3.1s"
         }
 
+def _rpc_client_from_env() -> Optional[PooledRpcClient]:
+    """Node client for BLOCKCHAIN_RPC_URL; mock data is served when unset
+
+    Several comma-separated URLs are tried in order, failing over when one
+    is unhealthy.
+    """
+    urls = [url.strip() for url in os.environ.get("BLOCKCHAIN_RPC_URL", "").split(",") if url.strip()]
+    if not urls:
+        return None
+    return PooledRpcClient(
+        urls,
+        max_concurrency=int(os.environ.get("BLOCKCHAIN_RPC_CONCURRENCY", 16)),
+        timeout=float(os.environ.get("BLOCKCHAIN_RPC_TIMEOUT", 10)),
+        retries=int(os.environ.get("BLOCKCHAIN_RPC_RETRIES", 3))
+    )
+
 # Global service instances
-blockchain_service = BlockchainService()
+blockchain_service = BlockchainService(
+    rpc_client=_rpc_client_from_env(),
+    head_ttl=float(os.environ.get("BLOCKCHAIN_HEAD_TTL", 1.0)),
+    finality_depth=int(os.environ.get("BLOCKCHAIN_FINALITY_DEPTH", 12)),
+    governance_address=os.environ.get("GOVERNANCE_CONTRACT_ADDRESS") or None,
+    private_key=os.environ.get("BLOCKCHAIN_PRIVATE_KEY") or None,
+    tx_workers=int(os.environ.get("BLOCKCHAIN_TX_WORKERS", 4)),
+    confirm_timeout=float(os.environ.get("BLOCKCHAIN_TX_CONFIRM_TIMEOUT", 600)),
+    max_tx_queues=int(os.environ.get("BLOCKCHAIN_TX_MAX_ACCOUNTS", 16))
+)
 zk_proof_service = ZKProofService()
 
 def get_blockchain_service() -> BlockchainService:
@@ -0,0 +1,251 @@
+"""
+Response Cache for XMRT DAO
+Read-through caching with TTL, write invalidation and ETag revalidation
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Dict, Any, Callable, Optional, Set, Tuple, Union
+
+from flask import Response, request
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+class LRUCacheBackend:
+    """In-process cache with per-entry expiry and least-recently-used eviction"""
+
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl: float):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def generation(self, namespace: str) -> int:
+        with self._lock:
+            return self._generations.get(namespace, 0)
+
+    def bump(self, namespace: str):
+        # Entries of older generations are never read again and age out
+        with self._lock:
+            self._generations[namespace] = self._generations.get(namespace, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"backend": "memory", "entries": len(self._entries),
+                    "max_entries": self.max_entries, "evictions": self.evictions}
+
+class RedisCacheBackend:
+    """Cache shared by all workers through Redis
+
+    ``client`` is a redis-py compatible client; by default one is created
+    for ``REDIS_URL``. Namespace generations are Redis counters, so a write
+    in one worker invalidates cached reads in every other.
+    """
+
+    def __init__(self, client=None, url: Optional[str] = None, prefix: str = "xmrt:cache:"):
+        if client is None:
+            import redis
+            client = redis.Redis.from_url(url or os.environ.get("REDIS_URL", "redis://localhost:6379/0"))
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(self.prefix + key)
+
+    def set(self, key: str, value: bytes, ttl: float):
+        self.client.set(self.prefix + key, value, px=max(1, int(ttl * 1000)))
+
+    def generation(self, namespace: str) -> int:
+        return int(self.client.get(f"{self.prefix}gen:{namespace}") or 0)
+
+    def bump(self, namespace: str):
+        self.client.incr(f"{self.prefix}gen:{namespace}")
+
+    def clear(self):
+        for key in self.client.scan_iter(match=self.prefix + "*"):
+            self.client.delete(key)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"backend": "redis"}
+
+def _pack(status: int, mimetype: str, etag: str, body: bytes) -> bytes:
+    return f"{status}\n{mimetype}\n{etag}\n".encode() + body
+
+def _unpack(value: bytes) -> Tuple[int, str, str, bytes]:
+    status, mimetype, etag, body = value.split(b"\n", 3)
+    return int(status), mimetype.decode(), etag.decode(), body
+
+class ResponseCache:
+    """Read-through cache for JSON views
+
+    Every key lives in a namespace named after the table it is derived
+    from. Committed writes to that table bump the namespace generation,
+    which is part of every key, so stale entries are skipped at once while
+    ``ttl`` bounds staleness for changes made outside the ORM. Cached
+    responses carry an ETag and answer a matching If-None-Match with 304.
+    ``max_ttl`` caps every entry's lifetime, including explicit ones.
+    """
+
+    def __init__(self, backend=None, default_ttl: float = 30, max_ttl: Optional[float] = None):
+        self.backend = backend or LRUCacheBackend()
+        self.default_ttl = default_ttl
+        self.max_ttl = max_ttl
+        self._lock = threading.Lock()
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "not_modified": 0,
+            "invalidations": 0
+        }
+
+    def _key(self, namespace: str, key: str) -> str:
+        return f"{namespace}:{self.backend.generation(namespace)}:{key}"
+
+    def _ttl(self, ttl: Optional[float]) -> float:
+        ttl = ttl if ttl is not None else self.default_ttl
+        return ttl if self.max_ttl is None else min(ttl, self.max_ttl)
+
+    def _count(self, name: str):
+        with self._lock:
+            self.stats[name] += 1
+
+    def cached(self, namespace: Union[str, Callable[..., Optional[str]]], ttl: Optional[float] = None):
+        """Cache a view's successful responses, keyed by path and query string
+
+        ``namespace`` may be a callable receiving the view's arguments; when
+        it returns None the request bypasses the cache.
+        """
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                name = namespace(*args, **kwargs) if callable(namespace) else namespace
+                if name is None:
+                    return view(*args, **kwargs)
+                full_key = self._key(name, request.full_path)
+                cached = self.backend.get(full_key)
+                if cached is not None:
+                    self._count("hits")
+                    status, mimetype, etag, body = _unpack(cached)
+                    response = Response(body, status=status, mimetype=mimetype)
+                    response.headers["X-Cache"] = "HIT"
+                else:
+                    self._count("misses")
+                    response = view(*args, **kwargs)
+                    if not isinstance(response, Response) or response.status_code != 200 \
+                            or response.is_streamed:
+                        return response
+                    body = response.get_data()
+                    etag = hashlib.sha1(body).hexdigest()
+                    self.backend.set(full_key, _pack(response.status_code, response.mimetype, etag, body),
+                                     self._ttl(ttl))
+                    response.headers["X-Cache"] = "MISS"
+                response.set_etag(etag)
+                response.headers["Cache-Control"] = "no-cache"
+                response.make_conditional(request)
+                if response.status_code == 304:
+                    self._count("not_modified")
+                return response
+            return wrapper
+        return decorator
+
+    def invalidate(self, *namespaces: str):
+        """Drop every cached entry of the given namespaces"""
+        for namespace in namespaces:
+            self.backend.bump(namespace)
+            self._count("invalidations")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit-rate counters and backend details"""
+        with self._lock:
+            stats = dict(self.stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        stats["default_ttl"] = self.default_ttl
+        stats["max_ttl"] = self.max_ttl
+        stats.update(self.backend.get_stats())
+        return stats
+
+def _written_tables(session: Session) -> Set[str]:
+    return session.info.setdefault("cache_written_tables", set())
+
+def install_invalidation(cache: ResponseCache):
+    """Invalidate a table's namespace whenever a transaction writing it commits
+
+    Unit-of-work flushes and ORM-enabled bulk INSERT/UPDATE/DELETE
+    statements are both tracked, so ``cast_vote`` and ``ingest_votes``
+    invalidate like ordinary ``session.add`` writes.
+    """
+    @event.listens_for(Session, "after_flush")
+    def track_flush(session, flush_context):
+        tables = _written_tables(session)
+        for instance in list(session.new) + list(session.dirty) + list(session.deleted):
+            tables.add(instance.__table__.name)
+
+    @event.listens_for(Session, "do_orm_execute")
+    def track_statement(orm_execute_state):
+        if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+            mapper = orm_execute_state.bind_mapper
+            if mapper is not None:
+                _written_tables(orm_execute_state.session).add(mapper.local_table.name)
+
+    @event.listens_for(Session, "after_commit")
+    def invalidate_written(session):
+        tables = session.info.pop("cache_written_tables", None)
+        if tables:
+            cache.invalidate(*tables)
+
+    @event.listens_for(Session, "after_rollback")
+    def forget_written(session):
+        session.info.pop("cache_written_tables", None)
+
+def create_cache_backend():
+    """Backend named by CACHE_BACKEND: 'memory' (default) or 'redis'"""
+    if os.environ.get("CACHE_BACKEND", "memory") == "redis":
+        return RedisCacheBackend()
+    return LRUCacheBackend(int(os.environ.get("CACHE_MAX_ENTRIES", 2048)))
+
+def create_response_cache() -> ResponseCache:
+    """Response cache configured from the environment
+
+    A write only invalidates the in-process backend of the worker that made
+    it, so with several workers (WEB_CONCURRENCY > 1) and no shared backend
+    every entry is capped at CACHE_MULTIWORKER_TTL seconds, which bounds how
+    long other workers can serve stale data.
+    """
+    backend = create_cache_backend()
+    max_ttl = None
+    if isinstance(backend, LRUCacheBackend) and int(os.environ.get("WEB_CONCURRENCY", 1)) > 1:
+        max_ttl = float(os.environ.get("CACHE_MULTIWORKER_TTL", 2))
+    return ResponseCache(backend, float(os.environ.get("CACHE_TTL", 30)), max_ttl)
+
+response_cache = create_response_cache()
+install_invalidation(response_cache)
@@ -0,0 +1,166 @@
+"""
+Block-Aware Chain Read Cache for XMRT DAO
+Caches node reads per block and coalesces concurrent identical requests
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Callable, Hashable, Optional, Tuple
+
+class _InFlight:
+    """A fetch other threads can wait on instead of repeating it"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+    def result(self) -> Any:
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+def _is_empty(value: Any) -> bool:
+    """Whether a read found nothing, e.g. a block or receipt the node does not have yet"""
+    return value is None or (isinstance(value, (list, dict, str, tuple)) and not value)
+
+class ChainReadCache:
+    """Per-block cache of chain reads
+
+    Mutable reads are keyed by (method, args, block number) and only the
+    entries of the current head are kept, so every read costs at most one
+    RPC per block however many callers poll it. The head is taken from
+    ``head_source`` at most once per ``head_ttl`` seconds, or pushed with
+    ``on_new_head`` by anything that already follows the chain. Immutable
+    reads (finalized receipts, old blocks) are remembered for good, unless
+    they came back empty: a node that lags behind answers None for a block
+    it will have later. While
+    a key is being fetched, other callers for the same key wait for that
+    fetch instead of issuing their own.
+    """
+
+    def __init__(self, head_source: Callable[[], int], head_ttl: float = 1.0, max_immutable: int = 10000):
+        self.head_source = head_source
+        self.head_ttl = head_ttl
+        self.max_immutable = max_immutable
+        self._head: Optional[int] = None
+        self._head_checked = 0.0
+        self._entries: Dict[Tuple[str, Hashable], Any] = {}
+        self._immutable: "OrderedDict[Tuple[str, Hashable], Any]" = OrderedDict()
+        self._inflight: Dict[Hashable, _InFlight] = {}
+        self._lock = threading.Lock()
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "head_polls": 0,
+            "new_heads": 0
+        }
+
+    def _coalesced(self, key: Hashable, fetch: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Run ``fetch`` once per key at a time; returns (value, fetched_here)"""
+        with self._lock:
+            inflight = self._inflight.get(key)
+            owner = inflight is None
+            if owner:
+                inflight = self._inflight[key] = _InFlight()
+            else:
+                self.stats["coalesced"] += 1
+        if not owner:
+            return inflight.result(), False
+        try:
+            inflight.value = fetch()
+        except BaseException as exc:
+            inflight.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            inflight.done.set()
+        return inflight.value, True
+
+    def head(self) -> int:
+        """Latest block number, polled at most once per ``head_ttl``"""
+        now = time.monotonic()
+        if self._head is not None and now - self._head_checked < self.head_ttl:
+            return self._head
+
+        def poll() -> int:
+            self.stats["head_polls"] += 1
+            return self.head_source()
+
+        block, _ = self._coalesced(("head",), poll)
+        self.on_new_head(block)
+        return block
+
+    def on_new_head(self, block: int):
+        """Advance to a new head, dropping the reads of earlier blocks"""
+        with self._lock:
+            self._head_checked = time.monotonic()
+            if block == self._head:
+                return
+            self._head = block
+            self._entries.clear()
+            self.stats["new_heads"] += 1
+
+    def get(self, method: str, args: Hashable, fetch: Callable[[int], Any]) -> Any:
+        """Value of a mutable read at the current head; ``fetch`` gets the block number"""
+        block = self.head()
+        key = (method, args)
+        with self._lock:
+            if key in self._entries:
+                self.stats["hits"] += 1
+                return self._entries[key]
+
+        value, fetched = self._coalesced((method, args, block), lambda: fetch(block))
+        with self._lock:
+            if fetched:
+                self.stats["misses"] += 1
+                # Store only if no newer head arrived while fetching
+                if self._head == block:
+                    self._entries[key] = value
+        return value
+
+    def get_immutable(self, method: str, args: Hashable, fetch: Callable[[], Any]) -> Any:
+        """Value that never changes once known, memoized for good once found"""
+        key = (method, args)
+        with self._lock:
+            if key in self._immutable:
+                self._immutable.move_to_end(key)
+                self.stats["hits"] += 1
+                return self._immutable[key]
+        value, fetched = self._coalesced(("immutable",) + key, fetch)
+        if fetched:
+            with self._lock:
+                self.stats["misses"] += 1
+            self.remember(method, args, value)
+        return value
+
+    def remember(self, method: str, args: Hashable, value: Any):
+        """Record an immutable value, e.g. a receipt that reached finality; empty values are ignored"""
+        if _is_empty(value):
+            return
+        with self._lock:
+            self._immutable[(method, args)] = value
+            self._immutable.move_to_end((method, args))
+            while len(self._immutable) > self.max_immutable:
+                self._immutable.popitem(last=False)
+
+    def lookup_immutable(self, method: str, args: Hashable) -> Tuple[bool, Any]:
+        """(found, value) of a remembered immutable read"""
+        with self._lock:
+            if (method, args) in self._immutable:
+                self.stats["hits"] += 1
+                return True, self._immutable[(method, args)]
+        return False, None
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self.stats,
+                "head": self._head,
+                "entries": len(self._entries),
+                "immutable_entries": len(self._immutable)
+            }
@@ -0,0 +1,525 @@
+"""
+Chain Event Indexer for XMRT DAO
+Streams token and governance contract logs into treasury_transactions
+"""
+
+import os
+import socket
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional, Tuple
+
+from sqlalchemy import delete, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+
+from src.models.user import db
+from src.models.dao import IndexedBlock, IndexedTransaction, IndexerLease, TreasuryTransaction
+from src.services.abi import LogDecoder, checksum_address
+from src.services.rpc import RpcError
+
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+# A transaction emitting several known events is described by the most
+# specific one, e.g. a stake's Staked rather than its Transfer
+EVENT_PRIORITY = {"Transfer": 0, "Staked": 1, "VoteCast": 2, "ProposalCreated": 2, "ProposalExecuted": 2}
+
+UPSERT_COLUMNS = ("transaction_type", "description", "amount", "from_address", "to_address",
+                  "block_number", "created_at")
+
+# How providers word "this eth_getLogs query is too big"; only these are
+# worth answering by splitting the range
+RESULT_CAP_ERRORS = (
+    "query returned more than",
+    "block range too large",
+    "block range is too large",
+    "exceed maximum block range",
+    "limit exceeded",
+    "response size exceeded",
+    "too many results",
+)
+
+def is_result_cap_error(error: RpcError) -> bool:
+    message = error.message.lower()
+    return any(fragment in message for fragment in RESULT_CAP_ERRORS)
+
+class IndexerError(RuntimeError):
+    """The chain changed under the indexer while it was reading"""
+
+@dataclass
+class LogRange:
+    """Logs of the blocks ``from_block``..``to_block`` with the headers they need"""
+    from_block: int
+    to_block: int
+    block_hash: str
+    logs: List[Dict[str, Any]]
+    timestamps: Dict[int, int]
+
+def _dialect_insert():
+    """The current dialect's INSERT supporting ON CONFLICT, or None"""
+    dialect = db.session.get_bind().dialect.name
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        return None
+    return dialect_insert
+
+def upsert_transactions(rows: List[Dict[str, Any]], indexer: Optional[str] = None):
+    """Insert or refresh treasury transactions by hash in the current session
+
+    With ``indexer`` the rows are also recorded as that indexer's, which is
+    what a reorg rollback deletes.
+    """
+    session = db.session
+    dialect_insert = _dialect_insert()
+    hashes = [row["transaction_hash"] for row in rows]
+    owned = [{"indexer": indexer, "transaction_hash": row["transaction_hash"],
+              "block_number": row["block_number"]} for row in rows]
+    if dialect_insert is not None:
+        statement = dialect_insert(TreasuryTransaction)
+        statement = statement.on_conflict_do_update(
+            index_elements=["transaction_hash"],
+            set_={column: statement.excluded[column] for column in UPSERT_COLUMNS}
+        )
+        session.execute(statement, rows)
+        if indexer is not None:
+            statement = dialect_insert(IndexedTransaction)
+            statement = statement.on_conflict_do_update(
+                index_elements=["indexer", "transaction_hash"],
+                set_={"block_number": statement.excluded.block_number}
+            )
+            session.execute(statement, owned)
+        return
+    session.execute(delete(TreasuryTransaction).where(TreasuryTransaction.transaction_hash.in_(hashes)))
+    session.execute(insert(TreasuryTransaction), rows)
+    if indexer is not None:
+        session.execute(delete(IndexedTransaction).where(
+            IndexedTransaction.indexer == indexer,
+            IndexedTransaction.transaction_hash.in_(hashes)
+        ))
+        session.execute(insert(IndexedTransaction), owned)
+
+class ChainIndexer:
+    """Follows the token and governance contracts' logs into ``treasury_transactions``
+
+    Blocks are read ``range_size`` at a time with one ``eth_getLogs`` for
+    every known event topic, plus one batch of block headers for
+    timestamps. Each range's rows are upserted by transaction hash in the
+    same transaction that records the range's last block and hash in
+    ``indexed_blocks``, which is the checkpoint. Blocks older than
+    ``reorg_depth`` are final and are backfilled with ``workers`` ranges
+    fetched concurrently. Newer blocks are followed one range at a time
+    up to ``confirmations`` blocks behind the head. When the chain no
+    longer has the checkpoint's hash, the rows this indexer wrote past the
+    newest recorded block still on the chain are deleted and indexed again.
+
+    ``start`` may be called in every web worker: the thread only indexes
+    while it holds the indexer's row in ``indexer_leases``, renewed on
+    every pass and taken over by another process once ``lease_ttl``
+    seconds pass without renewal, so one process indexes at a time.
+    """
+
+    def __init__(self, service, name: str = "treasury", start_block: int = 0, range_size: int = 2000,
+                 confirmations: int = 0, reorg_depth: int = 64, workers: int = 4, poll_interval: float = 12.0,
+                 lease_ttl: Optional[float] = None):
+        self.service = service
+        self.rpc = service.rpc
+        self.name = name
+        self.start_block = start_block
+        self.range_size = range_size
+        self.confirmations = confirmations
+        self.reorg_depth = reorg_depth
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.lease_ttl = lease_ttl if lease_ttl is not None else max(60.0, poll_interval * 5)
+        self.owner: Optional[str] = None
+        self.holds_lease = False
+        self.addresses = [service.token_info.contract_address]
+        if service.governance_address:
+            self.addresses.append(service.governance_address)
+        self.decoder = LogDecoder(service.token_abi, service.governance_abi)
+        self.app = None
+        self.head: Optional[int] = None
+        self.indexed_block: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {
+            "ranges": 0,
+            "logs": 0,
+            "rows": 0,
+            "reorgs": 0,
+            "failures": 0
+        }
+        self.last_error: Optional[str] = None
+
+    def start(self, app):
+        """Attach to an application and start following the chain in a daemon thread"""
+        self.app = app
+        if self._thread is not None and self._thread.is_alive():
+            return
+        # Set per process: a forked worker must not pass for its parent
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="chain-indexer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 30.0):
+        """Stop after the range being written and hand the lease back"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        if self.owner is not None and self.app is not None:
+            with self.app.app_context():
+                self.release_lease()
+
+    def acquire_lease(self) -> bool:
+        """Take or renew this indexer's lease; False while another process holds it"""
+        if self.owner is None:
+            # Not started: a one-off run such as the backfill command
+            self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        session = db.session
+        now = datetime.utcnow()
+        expires_at = now + timedelta(seconds=self.lease_ttl)
+        try:
+            renewed = session.execute(
+                update(IndexerLease)
+                .where(IndexerLease.indexer == self.name,
+                       or_(IndexerLease.owner == self.owner, IndexerLease.expires_at < now))
+                .values(owner=self.owner, expires_at=expires_at)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            if not renewed:
+                session.add(IndexerLease(indexer=self.name, owner=self.owner, expires_at=expires_at))
+            session.commit()
+        except IntegrityError:
+            # Another process holds the lease (or inserted it first)
+            session.rollback()
+            self.holds_lease = False
+            return False
+        except Exception:
+            session.rollback()
+            raise
+        self.holds_lease = True
+        return True
+
+    def release_lease(self):
+        session = db.session
+        try:
+            session.execute(delete(IndexerLease).where(
+                IndexerLease.indexer == self.name, IndexerLease.owner == self.owner
+            ))
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        self.holds_lease = False
+
+    def _hold_lease(self):
+        """Renew the lease between ranges of a long pass"""
+        if self.owner is not None and not self.acquire_lease():
+            raise IndexerError(f"Lease of indexer {self.name} was taken over by another process")
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                with self.app.app_context():
+                    if self.acquire_lease():
+                        self.sync_once()
+                self.last_error = None
+            except Exception as exc:
+                self.stats["failures"] += 1
+                self.last_error = str(exc)
+            self._stop.wait(self.poll_interval)
+
+    def _fetch_head(self) -> int:
+        self.head = int(self.rpc.call("eth_blockNumber"), 16)
+        if self.service.chain_cache is not None:
+            self.service.chain_cache.on_new_head(self.head)
+        return self.head
+
+    def _fetch_logs(self, from_block: int, to_block: int) -> List[Dict[str, Any]]:
+        try:
+            return self.rpc.call("eth_getLogs", [{
+                "fromBlock": hex(from_block),
+                "toBlock": hex(to_block),
+                "address": self.addresses,
+                "topics": [self.decoder.topics]
+            }])
+        except RpcError as exc:
+            # Providers cap the size of one query; split the range and retry.
+            # Any other error would fail the same way on every half.
+            if not is_result_cap_error(exc) or to_block <= from_block:
+                raise
+            middle = (from_block + to_block) // 2
+            return self._fetch_logs(from_block, middle) + self._fetch_logs(middle + 1, to_block)
+
+    def fetch_range(self, from_block: int, to_block: int) -> LogRange:
+        """Logs and headers of a block range; touches only the node"""
+        logs = self._fetch_logs(from_block, to_block)
+        numbers = sorted({int(log["blockNumber"], 16) for log in logs} | {to_block})
+        headers = dict(zip(numbers, self.rpc.batch([
+            ("eth_getBlockByNumber", [hex(number), False]) for number in numbers
+        ])))
+        for number, header in headers.items():
+            if header is None:
+                raise IndexerError(f"Node has no block {number} yet")
+        for log in logs:
+            if log.get("removed") or log["blockHash"] != headers[int(log["blockNumber"], 16)]["hash"]:
+                raise IndexerError(f"Block {int(log['blockNumber'], 16)} was reorganized while reading it")
+        return LogRange(
+            from_block=from_block,
+            to_block=to_block,
+            block_hash=headers[to_block]["hash"],
+            logs=logs,
+            timestamps={number: int(header["timestamp"], 16) for number, header in headers.items()}
+        )
+
+    def _row(self, log: Dict[str, Any], name: str, args: Dict[str, Any], timestamp: int) -> Dict[str, Any]:
+        fmt = self.service._format_units
+        contract = checksum_address(log["address"])
+        row = {
+            "transaction_hash": log["transactionHash"],
+            "block_number": int(log["blockNumber"], 16),
+            "created_at": datetime.utcfromtimestamp(timestamp)
+        }
+        if name == "Transfer":
+            sender, recipient = checksum_address(args["from"]), checksum_address(args["to"])
+            amount = fmt(args["value"])
+            if sender == ZERO_ADDRESS:
+                description = f"Minted {amount} XMRT"
+            elif recipient == ZERO_ADDRESS:
+                description = f"Burned {amount} XMRT"
+            else:
+                description = f"Transferred {amount} XMRT"
+            row.update(transaction_type="treasury", description=description, amount=amount,
+                       from_address=sender, to_address=recipient)
+        elif name == "Staked":
+            amount = fmt(args["amount"])
+            row.update(transaction_type="staking", description=f"Staked {amount} XMRT", amount=amount,
+                       from_address=checksum_address(args["account"]), to_address=contract)
+        elif name == "ProposalCreated":
+            row.update(transaction_type="governance",
+                       description=f"Proposal #{args['proposalId']} created: {args['description']}"[:200],
+                       amount="0", from_address=checksum_address(args["proposer"]), to_address=contract)
+        elif name == "VoteCast":
+            row.update(transaction_type="governance",
+                       description=f"Vote {'for' if args['support'] else 'against'} proposal #{args['proposalId']}",
+                       amount=fmt(args["weight"]), from_address=checksum_address(args["voter"]),
+                       to_address=contract)
+        else:
+            row.update(transaction_type="governance", description=f"Proposal #{args['proposalId']} executed",
+                       amount="0", from_address=None, to_address=contract)
+        return row
+
+    def rows(self, log_range: LogRange) -> List[Dict[str, Any]]:
+        """One ledger row per transaction of the range"""
+        chosen: Dict[str, Tuple[Dict[str, Any], str, Dict[str, Any]]] = {}
+        for log, name, args in self.decoder.decode_many(log_range.logs):
+            current = chosen.get(log["transactionHash"])
+            if current is None or EVENT_PRIORITY[name] > EVENT_PRIORITY[current[1]]:
+                chosen[log["transactionHash"]] = (log, name, args)
+        return [
+            self._row(log, name, args, log_range.timestamps[int(log["blockNumber"], 16)])
+            for log, name, args in chosen.values()
+        ]
+
+    def store(self, log_range: LogRange) -> int:
+        """Write a range's rows and advance the checkpoint in one transaction"""
+        rows = self.rows(log_range)
+        session = db.session
+        try:
+            if rows:
+                upsert_transactions(rows, indexer=self.name)
+            session.merge(IndexedBlock(indexer=self.name, block_number=log_range.to_block,
+                                       block_hash=log_range.block_hash))
+            # Hashes older than the reorg window are never compared again
+            session.execute(delete(IndexedBlock).where(
+                IndexedBlock.indexer == self.name,
+                IndexedBlock.block_number < log_range.to_block - self.reorg_depth
+            ))
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        self.indexed_block = log_range.to_block
+        self.stats["ranges"] += 1
+        self.stats["logs"] += len(log_range.logs)
+        self.stats["rows"] += len(rows)
+        return len(rows)
+
+    def checkpoint(self) -> Optional[IndexedBlock]:
+        """Last block indexed, with its hash"""
+        return db.session.execute(
+            select(IndexedBlock)
+            .where(IndexedBlock.indexer == self.name)
+            .order_by(IndexedBlock.block_number.desc())
+            .limit(1)
+        ).scalar_one_or_none()
+
+    def next_block(self) -> int:
+        checkpoint = self.checkpoint()
+        return checkpoint.block_number + 1 if checkpoint is not None else self.start_block
+
+    def handle_reorg(self) -> Optional[int]:
+        """Roll back past a reorganization; return the block resumed after, or None"""
+        recorded = db.session.execute(
+            select(IndexedBlock)
+            .where(IndexedBlock.indexer == self.name)
+            .order_by(IndexedBlock.block_number.desc())
+        ).scalars().all()
+        if not recorded:
+            return None
+        latest = self.rpc.call("eth_getBlockByNumber", [hex(recorded[0].block_number), False])
+        # A lagging node may not have the checkpoint yet; that is not a reorg
+        if latest is None or latest["hash"] == recorded[0].block_hash:
+            return None
+        older = recorded[1:]
+        headers = self.rpc.batch([("eth_getBlockByNumber", [hex(block.block_number), False]) for block in older])
+        ancestor, ancestor_hash = None, None
+        for block, header in zip(older, headers):
+            if header is not None and header["hash"] == block.block_hash:
+                ancestor, ancestor_hash = block.block_number, block.block_hash
+                break
+        if ancestor is None:
+            # No recorded hash survived: blocks past the reorg window are final
+            ancestor = max(recorded[0].block_number - self.reorg_depth, self.start_block - 1)
+            header = self.rpc.call("eth_getBlockByNumber", [hex(ancestor), False]) if ancestor >= 0 else None
+            ancestor_hash = header["hash"] if header is not None else "0x"
+        session = db.session
+        # Only rows this indexer wrote; ledger rows from elsewhere are kept
+        orphaned = (
+            select(IndexedTransaction.transaction_hash)
+            .where(IndexedTransaction.indexer == self.name, IndexedTransaction.block_number > ancestor)
+        )
+        try:
+            session.execute(delete(TreasuryTransaction).where(TreasuryTransaction.transaction_hash.in_(orphaned)))
+            session.execute(delete(IndexedTransaction).where(
+                IndexedTransaction.indexer == self.name,
+                IndexedTransaction.block_number > ancestor
+            ))
+            session.execute(delete(IndexedBlock).where(
+                IndexedBlock.indexer == self.name,
+                IndexedBlock.block_number >= ancestor
+            ))
+            session.add(IndexedBlock(indexer=self.name, block_number=ancestor, block_hash=ancestor_hash))
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        self.stats["reorgs"] += 1
+        self.indexed_block = ancestor
+        return ancestor
+
+    def backfill(self, to_block: Optional[int] = None) -> int:
+        """Index final blocks up to ``to_block`` fetching ``workers`` ranges at a time
+
+        Ranges are written in block order as their fetches complete, so the
+        checkpoint only ever covers contiguous blocks and an interrupted
+        backfill resumes where it stopped.
+        """
+        final = self._fetch_head() - self.reorg_depth
+        target = final if to_block is None else min(to_block, final)
+        start = self.next_block()
+        ranges = [(first, min(first + self.range_size - 1, target))
+                  for first in range(start, target + 1, self.range_size)]
+        written = 0
+        window = self.workers * 4
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="chain-backfill") as pool:
+            for offset in range(0, len(ranges), window):
+                if self._stop.is_set():
+                    break
+                self._hold_lease()
+                chunk = ranges[offset:offset + window]
+                for log_range in pool.map(lambda bounds: self.fetch_range(*bounds), chunk):
+                    written += self.store(log_range)
+        return written
+
+    def sync_once(self) -> int:
+        """Catch up with the chain once; return the number of rows written"""
+        head = self._fetch_head()
+        self.handle_reorg()
+        written = 0
+        if head - self.reorg_depth - self.next_block() >= self.range_size:
+            written += self.backfill()
+        target = head - self.confirmations
+        first = self.next_block()
+        while first <= target and not self._stop.is_set():
+            self._hold_lease()
+            last = min(first + self.range_size - 1, target)
+            written += self.store(self.fetch_range(first, last))
+            first = last + 1
+        return written
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get progress and lag behind the head"""
+        indexed = self.indexed_block
+        return {
+            "running": self._thread is not None and self._thread.is_alive(),
+            "owner": self.owner,
+            "holds_lease": self.holds_lease,
+            "indexed_block": indexed,
+            "head": self.head,
+            "lag": self.head - indexed if self.head is not None and indexed is not None else None,
+            "last_error": self.last_error,
+            **self.stats
+        }
+
+def create_chain_indexer(service=None) -> Optional[ChainIndexer]:
+    """Indexer configured from INDEXER_* variables, or None without a node"""
+    from src.services.blockchain import get_blockchain_service
+
+    service = service or get_blockchain_service()
+    if service.rpc is None:
+        return None
+    return ChainIndexer(
+        service,
+        start_block=int(os.environ.get("INDEXER_START_BLOCK", 0)),
+        range_size=int(os.environ.get("INDEXER_RANGE_SIZE", 2000)),
+        confirmations=int(os.environ.get("INDEXER_CONFIRMATIONS", 0)),
+        reorg_depth=int(os.environ.get("INDEXER_REORG_DEPTH", 64)),
+        workers=int(os.environ.get("INDEXER_WORKERS", 4)),
+        poll_interval=float(os.environ.get("INDEXER_POLL_INTERVAL", 12)),
+        lease_ttl=float(os.environ["INDEXER_LEASE_TTL"]) if os.environ.get("INDEXER_LEASE_TTL") else None
+    )
+
+def main(argv: List[str]) -> int:
+    from src.migrations import create_app
+
+    indexer = create_chain_indexer()
+    if indexer is None:
+        print("BLOCKCHAIN_RPC_URL is not set")
+        return 2
+    app = create_app()
+    command = argv[0] if argv else "follow"
+    if command == "backfill":
+        with app.app_context():
+            if not indexer.acquire_lease():
+                print(f"Indexer {indexer.name} is running in another process")
+                return 1
+            started = time.monotonic()
+            try:
+                written = indexer.backfill()
+            finally:
+                indexer.release_lease()
+            print(f"Backfilled {written} transactions up to block {indexer.next_block() - 1} "
+                  f"in {time.monotonic() - started:.1f}s")
+        return 0
+    if command == "follow":
+        indexer.start(app)
+        try:
+            while True:
+                time.sleep(60)
+        except KeyboardInterrupt:
+            indexer.stop()
+        return 0
+    print(f"Unknown command: {command} (expected 'backfill' or 'follow')")
+    return 2
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
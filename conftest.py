@@ -0,0 +1,161 @@
+"""
+Shared Test Fixtures for XMRT DAO
+A local JSON-RPC node that answers token reads and counts round trips
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Any, Optional, Sequence, Tuple
+
+import pytest
+
+from src.services.abi import _selector, encode_arguments
+
+BALANCE_OF = _selector("balanceOf(address)").hex()
+STAKE_INFO = _selector("stakeInfo(address)").hex()
+TOTAL_SUPPLY = _selector("totalSupply()").hex()
+AGGREGATE3 = _selector("aggregate3((address,bool,bytes)[])").hex()
+STAKED_SINCE = 1700000000
+
+class NodeError(Exception):
+    """Raised by a handler to answer with a JSON-RPC error"""
+
+    def __init__(self, message: str, code: int = -32000):
+        super().__init__(message)
+        self.code = code
+
+def _word(data: bytes, offset: int) -> int:
+    return int.from_bytes(data[offset:offset + 32], "big")
+
+def _decode_aggregate3(calldata: str) -> List[Tuple[str, str]]:
+    data = bytes.fromhex(calldata[10:])
+    array = _word(data, 0)
+    items = array + 32
+    calls = []
+    for index in range(_word(data, array)):
+        item = items + _word(data, items + 32 * index)
+        payload = item + _word(data, item + 64)
+        length = _word(data, payload)
+        calls.append(("0x" + data[item + 12:item + 32].hex(), "0x" + data[payload + 32:payload + 32 + length].hex()))
+    return calls
+
+def _encode_aggregate3_result(results: Sequence[str]) -> str:
+    items = []
+    for result in results:
+        payload = bytes.fromhex(result[2:])
+        padding = b"\0" * (-len(payload) % 32)
+        items.append(encode_arguments(["uint256", "uint256", "uint256"], [1, 64, len(payload)]) + payload + padding)
+    offsets, position = [], 32 * len(items)
+    for item in items:
+        offsets.append(position)
+        position += len(item)
+    head = encode_arguments(["uint256", "uint256"] + ["uint256"] * len(items), [32, len(items)] + offsets)
+    return "0x" + (head + b"".join(items)).hex()
+
+class MockNode:
+    """JSON-RPC node on a local port
+
+    Token reads (``balanceOf``, ``stakeInfo``, ``totalSupply`` and
+    Multicall3 ``aggregate3``) are answered from deterministic data. Other
+    methods are answered by ``handlers``, which tests fill in; a handler
+    raising ``NodeError`` produces a JSON-RPC error. Every HTTP request
+    counts as one round trip, and calls are counted per method; the next
+    ``unavailable`` requests are answered with HTTP 503 after their calls
+    were seen, like a proxy timing out on a node that did act.
+    """
+
+    def __init__(self, block: int = 100):
+        self.block = block
+        self.unavailable = 0
+        self.round_trips = 0
+        self.methods: Dict[str, int] = {}
+        self.handlers: Dict[str, Callable[[List[Any]], Any]] = {
+            "eth_call": self._eth_call,
+            "eth_blockNumber": lambda params: hex(self.block),
+            "eth_gasPrice": lambda params: hex(20 * 10 ** 9),
+        }
+        self._lock = threading.Lock()
+        node = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with node._lock:
+                    node.round_trips += 1
+                body = json.dumps([node.answer(call) for call in request] if isinstance(request, list)
+                                  else node.answer(request)).encode()
+                with node._lock:
+                    unavailable = node.unavailable > 0
+                    node.unavailable -= unavailable
+                if unavailable:
+                    self.send_response(503)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        class Server(ThreadingHTTPServer):
+            daemon_threads = True
+            request_queue_size = 256
+
+        self.server = Server(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def answer(self, call: Dict[str, Any]) -> Dict[str, Any]:
+        method = call["method"]
+        with self._lock:
+            self.methods[method] = self.methods.get(method, 0) + 1
+        handler: Optional[Callable[[List[Any]], Any]] = self.handlers.get(method)
+        try:
+            if handler is None:
+                raise NodeError(f"the method {method} does not exist/is not available", -32601)
+            return {"jsonrpc": "2.0", "id": call["id"], "result": handler(call.get("params", []))}
+        except NodeError as exc:
+            return {"jsonrpc": "2.0", "id": call["id"], "error": {"code": exc.code, "message": str(exc)}}
+
+    @staticmethod
+    def balance_of(address: str) -> int:
+        """Deterministic balance of an address, in base units"""
+        return int(address[-6:], 16) * 10 ** 15
+
+    def _eth_call(self, params: List[Any]) -> str:
+        data = params[0]["data"]
+        selector = data[2:10]
+        if selector == AGGREGATE3:
+            return _encode_aggregate3_result([self._eth_call([{"data": call}]) for _, call in _decode_aggregate3(data)])
+        if selector == TOTAL_SUPPLY:
+            return "0x" + encode_arguments(["uint256"], [10 ** 24]).hex()
+        address = "0x" + data[-40:]
+        if selector == BALANCE_OF:
+            return "0x" + encode_arguments(["uint256"], [self.balance_of(address)]).hex()
+        if selector == STAKE_INFO:
+            return "0x" + encode_arguments(["uint256", "uint256", "uint256"],
+                                           [self.balance_of(address) // 2, 10 ** 18, STAKED_SINCE]).hex()
+        raise NodeError("execution reverted")
+
+    def reset(self):
+        with self._lock:
+            self.round_trips = 0
+            self.methods.clear()
+
+    def shutdown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+@pytest.fixture
+def node():
+    node = MockNode()
+    yield node
+    node.shutdown()
@@ -28,6 +28,14 @@ class Proposal(db.Model):
     ai_recommendation = db.Column(db.String(50), default="Analyzing")
     creator_address = db.Column(db.String(42), nullable=False)
     
+    __table_args__ = (
+        # Active/closing proposal lookups and newest-first listings
+        db.Index('ix_proposals_status_voting_ends_at', 'status', 'voting_ends_at'),
+        db.Index('ix_proposals_created_at', 'created_at'),
+        # ?status= listing pages, seeking and ordering on (created_at, id)
+        db.Index('ix_proposals_status_created_at_id', 'status', 'created_at', 'id'),
+    )
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -53,8 +61,15 @@ class Vote(db.Model):
     vote_weight = db.Column(db.Integer, default=1)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
-    # Ensure one vote per address per proposal
-    __table_args__ = (db.UniqueConstraint('proposal_id', 'voter_address'),)
+    __table_args__ = (
+        # Ensure one vote per address per proposal (also serves per-proposal lookups)
+        db.UniqueConstraint('proposal_id', 'voter_address', name='uq_votes_proposal_id_voter_address'),
+        # "My votes" history for an address
+        db.Index('ix_votes_voter_address_created_at', 'voter_address', 'created_at'),
+        db.Index('ix_votes_created_at', 'created_at'),
+        # ?proposal_id= listing pages, seeking and ordering on (created_at, id)
+        db.Index('ix_votes_proposal_id_created_at_id', 'proposal_id', 'created_at', 'id'),
+    )
     
     def to_dict(self):
         return {
@@ -103,6 +118,14 @@ class TreasuryTransaction(db.Model):
     block_number = db.Column(db.Integer)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    __table_args__ = (
+        # Ledger views per address and by block range
+        db.Index('ix_treasury_transactions_from_address_created_at', 'from_address', 'created_at'),
+        db.Index('ix_treasury_transactions_to_address_created_at', 'to_address', 'created_at'),
+        db.Index('ix_treasury_transactions_block_number', 'block_number'),
+        db.Index('ix_treasury_transactions_created_at', 'created_at'),
+    )
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -116,6 +139,51 @@ class TreasuryTransaction(db.Model):
             'created_at': self.created_at.isoformat()
         }
 
+class IndexedBlock(db.Model):
+    """Hash of a block an indexer has processed up to, for reorg detection"""
+    __tablename__ = 'indexed_blocks'
+    
+    indexer = db.Column(db.String(50), primary_key=True)
+    block_number = db.Column(db.Integer, primary_key=True)
+    block_hash = db.Column(db.String(66), nullable=False)
+    indexed_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def to_dict(self):
+        return {
+            'indexer': self.indexer,
+            'block_number': self.block_number,
+            'block_hash': self.block_hash,
+            'indexed_at': self.indexed_at.isoformat()
+        }
+
+class IndexedTransaction(db.Model):
+    """A treasury_transactions row written by an indexer, so a reorg only rolls back its own rows"""
+    __tablename__ = 'indexed_transactions'
+    
+    indexer = db.Column(db.String(50), primary_key=True)
+    transaction_hash = db.Column(db.String(66), primary_key=True)
+    block_number = db.Column(db.Integer, nullable=False)
+    
+    __table_args__ = (
+        # Rows past a reorg's common ancestor
+        db.Index('ix_indexed_transactions_indexer_block_number', 'indexer', 'block_number'),
+    )
+
+class IndexerLease(db.Model):
+    """Which process runs an indexer, until when; renewed while it runs"""
+    __tablename__ = 'indexer_leases'
+    
+    indexer = db.Column(db.String(50), primary_key=True)
+    owner = db.Column(db.String(100), nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False)
+    
+    def to_dict(self):
+        return {
+            'indexer': self.indexer,
+            'owner': self.owner,
+            'expires_at': self.expires_at.isoformat()
+        }
+
 class ChatMessage(db.Model):
     __tablename__ = 'chat_messages'
     
@@ -126,6 +194,13 @@ class ChatMessage(db.Model):
     content = db.Column(db.Text, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    __table_args__ = (
+        # Session transcripts, overall and per agent
+        db.Index('ix_chat_messages_session_id_created_at', 'session_id', 'created_at'),
+        db.Index('ix_chat_messages_session_id_agent_name_created_at', 'session_id', 'agent_name', 'created_at'),
+        db.Index('ix_chat_messages_created_at', 'created_at'),
+    )
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -0,0 +1,92 @@
+"""
+Database Engine Configuration for XMRT DAO
+Environment-driven engine settings for SQLite (WAL) and PostgreSQL (pooled)
+"""
+
+import os
+from typing import Dict, Any, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+from src.models.user import db
+
+DEFAULT_SQLITE_BUSY_TIMEOUT_MS = 5000
+
+def _env_int(name: str, default: int) -> int:
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+def database_url(default_sqlite_path: str) -> str:
+    """DATABASE_URL from the environment, or the bundled SQLite file"""
+    url = os.environ.get("DATABASE_URL")
+    if not url:
+        return f"sqlite:///{default_sqlite_path}"
+    # Hosting platforms still hand out the pre-SQLAlchemy-1.4 scheme
+    if url.startswith("postgres://"):
+        url = "postgresql://" + url[len("postgres://"):]
+    return url
+
+def sqlite_pragmas() -> Dict[str, str]:
+    """Per-connection SQLite settings
+
+    WAL lets readers proceed while a writer commits, ``synchronous=NORMAL``
+    is durable across application crashes in WAL mode and only fsyncs at
+    checkpoints, and ``busy_timeout`` makes a writer wait for the lock
+    instead of failing with "database is locked".
+    """
+    return {
+        "journal_mode": os.environ.get("SQLITE_JOURNAL_MODE", "WAL"),
+        "synchronous": os.environ.get("SQLITE_SYNCHRONOUS", "NORMAL"),
+        "busy_timeout": str(_env_int("SQLITE_BUSY_TIMEOUT_MS", DEFAULT_SQLITE_BUSY_TIMEOUT_MS))
+    }
+
+def engine_options(url: str) -> Dict[str, Any]:
+    """SQLALCHEMY_ENGINE_OPTIONS for a database URL"""
+    backend = make_url(url).get_backend_name()
+    if backend == "sqlite":
+        return {
+            "connect_args": {
+                "timeout": _env_int("SQLITE_BUSY_TIMEOUT_MS", DEFAULT_SQLITE_BUSY_TIMEOUT_MS) / 1000,
+                "check_same_thread": False
+            }
+        }
+    if backend == "postgresql":
+        return {
+            "pool_size": _env_int("DB_POOL_SIZE", 10),
+            "max_overflow": _env_int("DB_MAX_OVERFLOW", 20),
+            "pool_timeout": _env_int("DB_POOL_TIMEOUT", 30),
+            "pool_recycle": _env_int("DB_POOL_RECYCLE", 1800),
+            "pool_pre_ping": True
+        }
+    return {"pool_pre_ping": True}
+
+def _apply_sqlite_pragmas(pragmas: Dict[str, str]):
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+    return on_connect
+
+def configure_database(app, default_sqlite_path: str, url: Optional[str] = None):
+    """Point the app at its database and initialize Flask-SQLAlchemy
+
+    The schema is not created here; run ``python -m src.migrations upgrade``.
+    """
+    url = url or database_url(default_sqlite_path)
+    app.config["SQLALCHEMY_DATABASE_URI"] = url
+    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    app.config.setdefault("SQLALCHEMY_ENGINE_OPTIONS", engine_options(url))
+    db.init_app(app)
+
+    with app.app_context():
+        engine = db.engine
+        if engine.dialect.name == "sqlite":
+            pragmas = sqlite_pragmas()
+            if engine.url.database in (None, "", ":memory:"):
+                # WAL needs a file; in-memory databases keep their journal
+                pragmas.pop("journal_mode")
+            event.listen(engine, "connect", _apply_sqlite_pragmas(pragmas))
@@ -3,25 +3,88 @@ Enhanced Eliza AI Agent Service for XMRT DAO
 Implements advanced AI agent capabilities inspired by ElizaOS framework
 """
 
-import json
+import logging
+import queue
 import random
+import re
+import threading
 import time
-from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+import weakref
+from array import array
+from collections import ChainMap, OrderedDict, deque
+from datetime import datetime
+from types import MappingProxyType
+from typing import Dict, List, Any, Optional, Callable, Iterable, Iterator, Mapping, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
+logger = logging.getLogger(__name__)
+
 class AgentPersonality(Enum):
     GOVERNANCE = "governance"
     TREASURY = "treasury"
     SECURITY = "security"
 
+_EPOCH = datetime(1970, 1, 1)
+
+class ConversationHistory:
+    """Fixed-capacity window of (user, agent) exchanges
+
+    Exchanges are kept as raw ``(timestamp, user, agent)`` tuples in a bounded
+    deque, so the oldest one drops off in O(1) once the window is full.
+    Timestamps are stored as epoch seconds and only formatted when entries
+    are read back as dicts.
+    """
+    __slots__ = ("_entries", "text_size")
+
+    def __init__(self, maxlen: int = 20, entries: Iterable[Tuple[float, str, str]] = ()):
+        self._entries = deque(maxlen=maxlen)
+        self.text_size = 0
+        for timestamp, user_message, agent_response in entries:
+            self.append(timestamp, user_message, agent_response)
+
+    @property
+    def maxlen(self) -> int:
+        return self._entries.maxlen
+
+    def append(self, timestamp: float, user_message: str, agent_response: str):
+        """Add an exchange, dropping the oldest one if the window is full"""
+        entries = self._entries
+        if len(entries) == entries.maxlen:
+            _, old_user, old_agent = entries[0]
+            self.text_size -= len(old_user) + len(old_agent)
+        entries.append((timestamp, user_message, agent_response))
+        self.text_size += len(user_message) + len(agent_response)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[Dict[str, str]]:
+        for entry in self._entries:
+            yield self._format(entry)
+
+    def __getitem__(self, index: int) -> Dict[str, str]:
+        return self._format(self._entries[index])
+
+    def to_list(self) -> List[Dict[str, str]]:
+        """Get the window as a list of formatted dicts"""
+        return [self._format(entry) for entry in self._entries]
+
+    @staticmethod
+    def _format(entry: Tuple[float, str, str]) -> Dict[str, str]:
+        timestamp, user_message, agent_response = entry
+        return {
+            "timestamp": datetime.utcfromtimestamp(timestamp).isoformat(),
+            "user": user_message,
+            "agent": agent_response
+        }
+
 @dataclass
 class AgentMemory:
     """Represents agent memory for context and learning"""
     session_id: str
     context: Dict[str, Any]
-    conversation_history: List[Dict[str, str]]
+    conversation_history: ConversationHistory
     user_preferences: Dict[str, Any]
     created_at: datetime
     last_updated: datetime
@@ -36,6 +99,1199 @@ class AgentDecision:
     data_sources: List[str]
     timestamp: datetime
 
+# Keyword groups checked in priority order when classifying intent
+INTENT_KEYWORDS = [
+    ("governance_inquiry", ["proposal", "vote", "voting", "governance"]),
+    ("treasury_inquiry", ["treasury", "financial", "money", "funds", "allocation"]),
+    ("security_inquiry", ["security", "risk", "audit", "threat", "vulnerability"]),
+    ("status_request", ["status", "update", "report", "summary"]),
+    ("information_request", ["help", "how", "what", "explain"])
+]
+POSITIVE_WORDS = ["good", "great", "excellent", "support", "approve", "like", "love"]
+NEGATIVE_WORDS = ["bad", "terrible", "against", "oppose", "dislike", "hate", "concern"]
+HIGH_URGENCY_WORDS = ["urgent", "emergency", "critical", "immediate", "asap", "now"]
+MEDIUM_URGENCY_WORDS = ["soon", "quickly", "fast"]
+ACTION_WORDS = ["create", "execute", "implement", "deploy", "vote", "transfer", "allocate"]
+TOKEN_WORDS = ["xmrt", "token"]
+DAO_WORDS = ["dao"]
+# Only used to pick response templates
+RESPONSE_WORDS = ["1", "one", "first", "performance", "returns"]
+
+PROPOSAL_REFERENCE_PATTERN = re.compile(r'proposal\s*#?(\d+)')
+
+class MessageAnalyzer:
+    """Keyword analyzer producing intent, entities, sentiment, urgency and action signals
+
+    Every signal is a plain ``word in message`` check, which CPython runs in
+    C and cuts short per group; one regex scan over all keywords measured
+    slower on chat-sized messages (see src/benchmark_analyzer.py). ``scan``
+    returns the keyword bitmask response templates are selected by.
+    """
+
+    def __init__(self):
+        groups = [words for _, words in INTENT_KEYWORDS] + [
+            POSITIVE_WORDS, NEGATIVE_WORDS, HIGH_URGENCY_WORDS, MEDIUM_URGENCY_WORDS,
+            ACTION_WORDS, TOKEN_WORDS, DAO_WORDS, RESPONSE_WORDS
+        ]
+        keywords = sorted({word for words in groups for word in words})
+        self._bits = {word: 1 << index for index, word in enumerate(keywords)}
+        self._keyword_bits = tuple(self._bits.items())
+
+    def mask(self, words) -> int:
+        """Bitmask for a group of known keywords"""
+        return self._mask(words)
+
+    def _mask(self, words) -> int:
+        mask = 0
+        for word in words:
+            mask |= self._bits[word]
+        return mask
+
+    def find_keywords(self, message: str) -> List[str]:
+        """Return every known keyword occurring in the (lowercased) message"""
+        return [word for word, _ in self._keyword_bits if word in message]
+
+    def scan(self, message: str) -> int:
+        """Return the bitmask of keywords occurring in the (lowercased) message"""
+        found = 0
+        for word, bit in self._keyword_bits:
+            if word in message:
+                found |= bit
+        return found
+
+    def analyze(self, message: str) -> Dict[str, Any]:
+        """Analyze a lowercased message"""
+        intent = "general_inquiry"
+        for candidate, words in INTENT_KEYWORDS:
+            if any(word in message for word in words):
+                intent = candidate
+                break
+
+        entities = []
+        if "proposal" in message:
+            entities.extend(f"proposal_{match}" for match in PROPOSAL_REFERENCE_PATTERN.findall(message))
+        if "xmrt" in message or "token" in message:
+            entities.append("xmrt_token")
+        if "dao" in message:
+            entities.append("dao")
+
+        positive_count = sum(1 for word in POSITIVE_WORDS if word in message)
+        negative_count = sum(1 for word in NEGATIVE_WORDS if word in message)
+        if positive_count > negative_count:
+            sentiment = "positive"
+        elif negative_count > positive_count:
+            sentiment = "negative"
+        else:
+            sentiment = "neutral"
+
+        if any(word in message for word in HIGH_URGENCY_WORDS):
+            urgency = "high"
+        elif any(word in message for word in MEDIUM_URGENCY_WORDS):
+            urgency = "medium"
+        else:
+            urgency = "low"
+
+        return {
+            "intent": intent,
+            "entities": entities,
+            "sentiment": sentiment,
+            "urgency": urgency,
+            "requires_action": any(word in message for word in ACTION_WORDS)
+        }
+
+    def analyze_with_keywords(self, message: str) -> Tuple[Dict[str, Any], int]:
+        """Analyze a lowercased message, also returning its keyword bitmask"""
+        return self.analyze(message), self.scan(message)
+
+_message_analyzer: Optional[MessageAnalyzer] = None
+
+def get_message_analyzer() -> MessageAnalyzer:
+    """Shared analyzer, compiled on first use"""
+    global _message_analyzer
+    if _message_analyzer is None:
+        _message_analyzer = MessageAnalyzer()
+    return _message_analyzer
+
+# Response templates per personality as (conditions, template) rules, checked
+# in order. Each condition is a keyword group of which at least one must occur
+# in the message. Templates may reference knowledge base metrics and {message}.
+RESPONSE_RULES = {
+    AgentPersonality.GOVERNANCE: [
+        ((["proposal"], ["1", "one", "first"]),
+         "Based on my analysis of Proposal #1 'Increase Treasury Allocation for AI Development', "
+         "I recommend supporting this proposal. It shows strong community support with 78% approval rate "
+         "and aligns with our long-term strategic goals. The treasury can accommodate this allocation "
+         "without compromising operational reserves. The proposal demonstrates clear benefits for "
+         "enhancing our AI capabilities and autonomous operations."),
+        ((["proposal"],),
+         "I've analyzed the current proposals and can provide detailed insights. Proposal #1 has "
+         "strong support for AI development funding, Proposal #2 focuses on market analysis capabilities, "
+         "and Proposal #3 has been successfully executed for ZK infrastructure. Each proposal is "
+         "evaluated based on community benefit, sustainability, and risk factors."),
+        ((["vote", "voting"],),
+         "Current voting analysis shows healthy participation with {voting_participation} of token holders actively "
+         "engaging in governance. I recommend implementing quadratic voting for future proposals "
+         "to ensure more equitable representation. Proposal #2 currently needs 340 more votes to "
+         "reach quorum. The voting mechanism ensures democratic decision-making while preventing "
+         "concentration of power."),
+        ((["governance"],),
+         "Our governance system operates on principles of transparency, decentralization, and "
+         "community participation. Token holders can create proposals, vote on decisions, and "
+         "participate in autonomous execution. The AI agents provide analysis and recommendations "
+         "but final decisions rest with the community. Current governance health metrics show "
+         "strong engagement and effective decision-making processes."),
+        ((),
+         "As your governance AI agent, I can help with proposal analysis, voting patterns, "
+         "and governance optimization. Regarding '{message}', I can provide insights on how "
+         "this relates to our DAO's governance structure and decision-making processes. "
+         "What specific governance aspect would you like me to analyze?")
+    ],
+    AgentPersonality.TREASURY: [
+        ((["treasury", "financial"],),
+         "Current treasury status: {tvl} TVL with 15% growth this month. Asset allocation is "
+         "optimized across DeFi protocols with 94% efficiency rating. I've identified 3 new "
+         "yield opportunities that could increase returns by 8-12% annually while maintaining "
+         "our risk parameters. The treasury maintains 20% in stable assets for operational "
+         "liquidity and 80% in yield-generating positions."),
+        ((["allocation", "funds"],),
+         "Treasury allocation follows our strategic framework: 60% in high-yield DeFi protocols, "
+         "20% in stable reserves, 15% in strategic investments, and 5% for operational expenses. "
+         "This allocation has generated consistent returns while maintaining liquidity for "
+         "governance decisions. I continuously monitor market conditions and rebalance positions "
+         "to optimize risk-adjusted returns."),
+        ((["performance", "returns"],),
+         "Treasury performance metrics: 12.8% annual yield, 94% capital efficiency, and 2.1% "
+         "volatility. Our diversified approach across multiple protocols has outperformed "
+         "benchmark indices while maintaining lower risk. Recent optimizations have improved "
+         "gas efficiency by 23% and increased yield capture by 8.5%. All positions are "
+         "continuously monitored for optimal performance."),
+        ((),
+         "As the treasury management agent, I oversee financial operations, asset allocation, "
+         "and yield optimization. Regarding '{message}', I can provide analysis on how this "
+         "impacts our financial position and recommend appropriate treasury actions. "
+         "What specific financial aspect would you like me to analyze?")
+    ],
+    AgentPersonality.SECURITY: [
+        ((["security", "audit"],),
+         "Security audit completed successfully. All smart contracts are secure with no critical "
+         "vulnerabilities detected. I've implemented additional monitoring for unusual transaction "
+         "patterns and updated our risk assessment protocols. Current threat level: LOW. "
+         "All systems are operating within normal security parameters with enhanced monitoring "
+         "active across all critical components."),
+        ((["risk"],),
+         "Current risk assessment shows minimal exposure across all vectors. Smart contract risk: "
+         "LOW (audited and verified), Market risk: MEDIUM (managed through diversification), "
+         "Operational risk: LOW (automated systems with redundancy). I continuously monitor "
+         "for emerging threats and maintain updated incident response procedures. All risk "
+         "metrics are within acceptable thresholds."),
+        ((["threat", "vulnerability"],),
+         "Threat monitoring systems are active and detecting no current threats. Vulnerability "
+         "scans are performed continuously with automated patching for non-critical issues. "
+         "The last comprehensive security review identified zero high-severity vulnerabilities. "
+         "All access controls are properly configured and monitored. Security posture remains "
+         "strong with proactive threat detection capabilities."),
+        ((),
+         "As the security agent, I monitor risks, conduct audits, and ensure system safety. "
+         "Regarding '{message}', I can assess security implications and provide risk analysis. "
+         "All systems are currently secure with active monitoring. What specific security "
+         "concern can I help you with?")
+    ]
+}
+DEFAULT_RESPONSE_RULES = [
+    ((), "I understand you're asking about '{message}'. As an AI agent, I'm here to help with DAO operations.")
+]
+
+# Stands in for the user message while templates are pre-rendered
+_MESSAGE_SLOT = "\x00"
+
+class ResponseTemplateCache:
+    """Precomputed response table for one agent personality
+
+    Templates are rendered against the knowledge base ahead of time and split
+    around the ``{message}`` placeholder, so answering is a table lookup plus,
+    for the few templates quoting the message, one string join. Lookups are
+    keyed by the message's trigger keywords and memoised with hit/miss
+    counters; ``reload`` re-renders everything after a knowledge base change.
+    """
+
+    def __init__(self, personality: AgentPersonality, knowledge_base: Dict[str, Any]):
+        self.personality = personality
+        self._rules = [
+            ([get_message_analyzer().mask(group) for group in conditions], template)
+            for conditions, template in RESPONSE_RULES.get(personality, DEFAULT_RESPONSE_RULES)
+        ]
+        self._trigger_mask = 0
+        for conditions, _ in self._rules:
+            for mask in conditions:
+                self._trigger_mask |= mask
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.reload(knowledge_base)
+
+    def reload(self, knowledge_base: Dict[str, Any]):
+        """Re-render every template against the given knowledge base"""
+        fields = dict(knowledge_base.get("current_metrics", {}), message=_MESSAGE_SLOT)
+        rendered = [
+            (conditions, tuple(template.format(**fields).split(_MESSAGE_SLOT)))
+            for conditions, template in self._rules
+        ]
+        with self._lock:
+            self._rendered = rendered
+            self._table: Dict[int, Tuple[str, ...]] = {}
+
+    def render(self, message: str, keywords: int) -> str:
+        """Render the response for a message given its keyword bitmask"""
+        key = keywords & self._trigger_mask
+        # Executor workers render concurrently; selecting is cheap enough to
+        # do under the lock, which keeps the table and counters consistent
+        with self._lock:
+            parts = self._table.get(key)
+            if parts is None:
+                self.misses += 1
+                parts = self._table[key] = self._select(key)
+            else:
+                self.hits += 1
+        return parts[0] if len(parts) == 1 else message.join(parts)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache size and hit/miss counters"""
+        with self._lock:
+            entries, hits, misses = len(self._table), self.hits, self.misses
+        lookups = hits + misses
+        return {
+            "entries": entries,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups else None
+        }
+
+    def _select(self, key: int) -> Tuple[str, ...]:
+        for conditions, parts in self._rendered:
+            if all(key & mask for mask in conditions):
+                return parts
+        return ("",)
+
+def _estimate_memory_size(memory: AgentMemory) -> int:
+    """Rough byte estimate of a session memory, used for budget accounting"""
+    size = 512 + len(memory.session_id)
+    size += 128 * len(memory.conversation_history) + memory.conversation_history.text_size
+    size += 64 * (len(memory.context) + len(memory.user_preferences))
+    return size
+
+class DecisionHistory:
+    """Bounded, column-oriented record of agent decisions
+
+    The most recent ``capacity`` decisions are kept in a ring of parallel
+    arrays: confidences and timestamps as doubles, and decision types,
+    reasoning, actions and data source lists as indexes into intern tables.
+    Lifetime and window aggregates (count, mean confidence, per-type counts)
+    are maintained on every append, so reading them is O(1).
+    """
+
+    def __init__(self, capacity: int = 10000):
+        self.capacity = capacity
+        self._confidence = array("d", bytes(8 * capacity))
+        self._timestamps = array("d", bytes(8 * capacity))
+        self._types = array("I", [0]) * capacity
+        self._reasoning = array("I", [0]) * capacity
+        self._actions = array("I", [0]) * capacity
+        self._sources = array("I", [0]) * capacity
+        self._strings: List[str] = []
+        self._string_ids: Dict[str, int] = {}
+        self._source_lists: List[Tuple[str, ...]] = []
+        self._source_ids: Dict[Tuple[str, ...], int] = {}
+        self._start = 0
+        self._size = 0
+
+        self.total_count = 0
+        self.total_confidence = 0.0
+        self.type_counts: Dict[str, int] = {}
+        self.window_confidence = 0.0
+        self.window_type_counts: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __bool__(self) -> bool:
+        return self._size > 0
+
+    def __getitem__(self, index: int) -> AgentDecision:
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("decision history index out of range")
+        slot = (self._start + index) % self.capacity
+        strings = self._strings
+        return AgentDecision(
+            decision_type=strings[self._types[slot]],
+            confidence=self._confidence[slot],
+            reasoning=strings[self._reasoning[slot]],
+            recommended_action=strings[self._actions[slot]],
+            data_sources=list(self._source_lists[self._sources[slot]]),
+            timestamp=datetime.utcfromtimestamp(self._timestamps[slot])
+        )
+
+    def __iter__(self) -> Iterator[AgentDecision]:
+        for index in range(self._size):
+            yield self[index]
+
+    def append(self, decision: AgentDecision):
+        """Record a decision, evicting the oldest one if the ring is full"""
+        if self._size == self.capacity:
+            slot = self._start
+            self._start = (self._start + 1) % self.capacity
+            old_type = self._strings[self._types[slot]]
+            self.window_confidence -= self._confidence[slot]
+            self.window_type_counts[old_type] -= 1
+            if not self.window_type_counts[old_type]:
+                del self.window_type_counts[old_type]
+        else:
+            slot = (self._start + self._size) % self.capacity
+            self._size += 1
+
+        decision_type = decision.decision_type
+        self._confidence[slot] = decision.confidence
+        self._timestamps[slot] = (decision.timestamp - _EPOCH).total_seconds()
+        self._types[slot] = self._intern(decision_type)
+        self._reasoning[slot] = self._intern(decision.reasoning)
+        self._actions[slot] = self._intern(decision.recommended_action)
+        sources = tuple(decision.data_sources)
+        source_id = self._source_ids.get(sources)
+        if source_id is None:
+            source_id = self._source_ids[sources] = len(self._source_lists)
+            self._source_lists.append(sources)
+        self._sources[slot] = source_id
+
+        self.total_count += 1
+        self.total_confidence += decision.confidence
+        self.type_counts[decision_type] = self.type_counts.get(decision_type, 0) + 1
+        self.window_confidence += decision.confidence
+        self.window_type_counts[decision_type] = self.window_type_counts.get(decision_type, 0) + 1
+
+    def last_timestamp(self) -> Optional[datetime]:
+        """Timestamp of the most recent decision"""
+        if not self._size:
+            return None
+        slot = (self._start + self._size - 1) % self.capacity
+        return datetime.utcfromtimestamp(self._timestamps[slot])
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get lifetime and sliding-window decision aggregates"""
+        return {
+            "total": self.total_count,
+            "mean_confidence": self.total_confidence / self.total_count if self.total_count else None,
+            "by_type": dict(self.type_counts),
+            "window_size": self._size,
+            "window_mean_confidence": self.window_confidence / self._size if self._size else None,
+            "window_by_type": dict(self.window_type_counts)
+        }
+
+    def _intern(self, value: str) -> int:
+        string_id = self._string_ids.get(value)
+        if string_id is None:
+            string_id = self._string_ids[value] = len(self._strings)
+            self._strings.append(value)
+        return string_id
+
+class SessionMemoryStore:
+    """Bounded session memory backend with LRU and idle-TTL eviction
+
+    Sessions are kept in least-recently-used order. A session is evicted when
+    it has been idle (by ``AgentMemory.last_updated``) for longer than
+    ``idle_ttl`` seconds, or when the store exceeds ``max_sessions`` entries or
+    ``max_bytes`` of estimated memory. On a miss the optional ``loader`` is
+    asked to rebuild the session, e.g. from persisted chat messages.
+    """
+
+    def __init__(self, max_sessions: int = 10000, max_bytes: int = 64 * 1024 * 1024,
+                 idle_ttl: float = 3600, loader: Callable[[str], Optional[AgentMemory]] = None):
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self.idle_ttl = idle_ttl
+        self.loader = loader
+        self._sessions: "OrderedDict[str, AgentMemory]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self.total_bytes = 0
+        self.stats = {
+            "evicted_lru": 0,
+            "evicted_ttl": 0,
+            "evicted_bytes": 0,
+            "restored": 0
+        }
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._sessions
+
+    def __iter__(self) -> Iterator[str]:
+        # Snapshot, since lookups reorder the underlying OrderedDict
+        return iter(list(self._sessions))
+
+    def __getitem__(self, session_id: str) -> AgentMemory:
+        memory = self.get(session_id)
+        if memory is None:
+            raise KeyError(session_id)
+        return memory
+
+    def __setitem__(self, session_id: str, memory: AgentMemory):
+        self.put(session_id, memory)
+
+    def get(self, session_id: str, restore: bool = True) -> Optional[AgentMemory]:
+        """Return a live session, restoring it through the loader on a miss unless ``restore`` is off"""
+        memory = self._sessions.get(session_id)
+        if memory is not None and self._is_expired(memory, datetime.utcnow()):
+            self._remove(session_id)
+            self.stats["evicted_ttl"] += 1
+            memory = None
+        if memory is not None:
+            self._sessions.move_to_end(session_id)
+            return memory
+
+        if restore:
+            memory = self.restore(session_id)
+            if memory is not None:
+                self.put(session_id, memory)
+        return memory
+
+    def restore(self, session_id: str) -> Optional[AgentMemory]:
+        """Rebuild a session through the loader without storing it
+
+        Callers may run this outside whatever lock guards the store, since it
+        only touches the loader's backing storage.
+        """
+        if self.loader is None:
+            return None
+        memory = self.loader(session_id)
+        if memory is not None:
+            self.stats["restored"] += 1
+        return memory
+
+    def put(self, session_id: str, memory: AgentMemory):
+        """Insert or replace a session and enforce the configured bounds"""
+        if session_id in self._sessions:
+            self._remove(session_id)
+        self._sessions[session_id] = memory
+        self._sizes[session_id] = _estimate_memory_size(memory)
+        self.total_bytes += self._sizes[session_id]
+        self._enforce_limits()
+
+    def touch(self, session_id: str):
+        """Refresh recency and size accounting after a session was modified"""
+        memory = self._sessions.get(session_id)
+        if memory is None:
+            return
+        self._sessions.move_to_end(session_id)
+        size = _estimate_memory_size(memory)
+        self.total_bytes += size - self._sizes[session_id]
+        self._sizes[session_id] = size
+        self._enforce_limits()
+
+    def evict_expired(self) -> int:
+        """Drop every idle session past its TTL, oldest first"""
+        now = datetime.utcnow()
+        evicted = 0
+        for session_id in list(self._sessions):
+            if self._is_expired(self._sessions[session_id], now):
+                self._remove(session_id)
+                evicted += 1
+        self.stats["evicted_ttl"] += evicted
+        return evicted
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get store occupancy and eviction counters"""
+        return {
+            "sessions": len(self._sessions),
+            "max_sessions": self.max_sessions,
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            **self.stats
+        }
+
+    def _is_expired(self, memory: AgentMemory, now: datetime) -> bool:
+        return self.idle_ttl is not None and (now - memory.last_updated).total_seconds() > self.idle_ttl
+
+    def _remove(self, session_id: str):
+        del self._sessions[session_id]
+        self.total_bytes -= self._sizes.pop(session_id)
+
+    def _enforce_limits(self):
+        now = datetime.utcnow()
+        # Least recently used sessions sit at the front of the ordering
+        while self._sessions:
+            oldest_id = next(iter(self._sessions))
+            if self._is_expired(self._sessions[oldest_id], now):
+                reason = "evicted_ttl"
+            elif len(self._sessions) > self.max_sessions:
+                reason = "evicted_lru"
+            elif self.total_bytes > self.max_bytes and len(self._sessions) > 1:
+                reason = "evicted_bytes"
+            else:
+                break
+            self._remove(oldest_id)
+            self.stats[reason] += 1
+
+def load_memory_from_chat_messages(agent_name: str, session_id: str, limit: int = 20) -> Optional[AgentMemory]:
+    """Rebuild a session memory from the persisted ``ChatMessage`` rows"""
+    from flask import has_app_context
+    from sqlalchemy.exc import SQLAlchemyError
+
+    if not has_app_context():
+        # Outside an application (scripts, tests) there is nothing to restore from
+        return None
+    from src.models.dao import ChatMessage
+    try:
+        rows = (ChatMessage.query
+                .filter_by(session_id=session_id, agent_name=agent_name)
+                .order_by(ChatMessage.created_at.desc(), ChatMessage.id.desc())
+                .limit(limit * 2)
+                .all())
+    except SQLAlchemyError:
+        # A session starting empty is better than a failed chat request
+        logger.exception("Could not restore session %s of %s from chat_messages", session_id, agent_name)
+        return None
+    if not rows:
+        return None
+
+    history = ConversationHistory(limit)
+    pending_user = None
+    for row in reversed(rows):
+        if row.message_type == "user":
+            pending_user = row
+        elif pending_user is not None:
+            history.append((row.created_at - _EPOCH).total_seconds(), pending_user.content, row.content)
+            pending_user = None
+
+    return AgentMemory(
+        session_id=session_id,
+        context={},
+        conversation_history=history,
+        user_preferences={},
+        created_at=rows[-1].created_at,
+        last_updated=datetime.utcnow()
+    )
+
+class TranscriptJournalFullError(Exception):
+    """Raised when the transcript journal buffer stays full"""
+
+class TranscriptJournal:
+    """Write-behind journal persisting chat exchanges to ``chat_messages``
+
+    ``record`` only appends to an in-memory buffer, so the chat path never
+    waits on the database while it keeps up. A background thread writes the
+    buffer in batched transactions whenever ``batch_size`` messages are
+    pending or ``flush_interval`` seconds have passed. Messages leave the
+    buffer only after their transaction commits; a failed batch is put back
+    and retried, so delivery is at-least-once. ``stop`` drains whatever is
+    still pending. The buffer, including the batch being written, holds at
+    most ``max_pending`` messages: once it is full ``record`` waits up to
+    ``max_wait`` seconds for room and then raises
+    ``TranscriptJournalFullError``, so messages are refused, never dropped.
+    """
+
+    def __init__(self, batch_size: int = 500, flush_interval: float = 1.0, retry_delay: float = 5.0,
+                 max_pending: int = 100000, max_wait: float = 5.0):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retry_delay = retry_delay
+        self.max_pending = max_pending
+        self.max_wait = max_wait
+        self.app = None
+        self._buffer: deque = deque()
+        # Messages of the batch being written, still counted against max_pending
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._room = threading.Condition(self._lock)
+        # Serializes flushes so a batch is never written twice concurrently
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {
+            "recorded": 0,
+            "written": 0,
+            "batches": 0,
+            "failures": 0,
+            "waits": 0,
+            "refused": 0
+        }
+        self.last_error: Optional[str] = None
+
+    @property
+    def active(self) -> bool:
+        return self.app is not None
+
+    def start(self, app):
+        """Attach to an application and start the flusher thread"""
+        self.app = app
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="transcript-journal", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 30.0):
+        """Stop the flusher thread and drain the buffer
+
+        Failed writes are retried until ``timeout`` seconds have passed, after
+        which the last error is raised with the messages still buffered.
+        """
+        deadline = time.monotonic() + timeout
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        if not self.active:
+            return
+        while True:
+            try:
+                self.flush()
+                return
+            except Exception:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise
+                time.sleep(min(self.retry_delay, remaining))
+
+    def record(self, agent_name: str, session_id: str, exchanges: Iterable[Tuple[str, str]],
+               timestamp: Optional[float] = None):
+        """Queue (user, agent) exchanges for persistence
+
+        Never blocks on I/O while the buffer has room; a full buffer makes the
+        caller wait for the flusher, up to ``max_wait`` seconds.
+        """
+        if not self.active:
+            return
+        created_at = datetime.utcfromtimestamp(timestamp if timestamp is not None else time.time())
+        rows = []
+        for user_message, agent_response in exchanges:
+            rows.append({"session_id": session_id, "agent_name": agent_name, "message_type": "user",
+                         "content": user_message, "created_at": created_at})
+            rows.append({"session_id": session_id, "agent_name": agent_name, "message_type": "agent",
+                         "content": agent_response, "created_at": created_at})
+        with self._room:
+            if not self._has_room(len(rows)):
+                self.stats["waits"] += 1
+                self._wakeup.set()
+                if not self._room.wait_for(lambda: self._has_room(len(rows)), self.max_wait):
+                    self.stats["refused"] += len(rows)
+                    raise TranscriptJournalFullError(
+                        f"Transcript journal is full ({self.max_pending} messages pending)")
+            self._buffer.extend(rows)
+            self.stats["recorded"] += len(rows)
+            pending = len(self._buffer)
+        if pending >= self.batch_size:
+            self._wakeup.set()
+
+    def _has_room(self, count: int) -> bool:
+        used = len(self._buffer) + self._in_flight
+        # An oversized record still goes through once the buffer is empty
+        return used + count <= self.max_pending or used == 0
+
+    def is_full(self) -> bool:
+        """Whether ``record`` would have to wait for room"""
+        with self._lock:
+            return len(self._buffer) + self._in_flight >= self.max_pending
+
+    def flush(self) -> int:
+        """Write every pending message now; return how many were written"""
+        written = 0
+        with self._flush_lock:
+            while True:
+                with self._lock:
+                    batch = [self._buffer.popleft() for _ in range(min(self.batch_size, len(self._buffer)))]
+                    self._in_flight = len(batch)
+                if not batch:
+                    return written
+                try:
+                    self._write(batch)
+                except Exception as exc:
+                    with self._lock:
+                        # Put the batch back in front, in its original order;
+                        # its room was held while it was in flight
+                        self._buffer.extendleft(reversed(batch))
+                        self._in_flight = 0
+                        self.stats["failures"] += 1
+                    self.last_error = str(exc)
+                    raise
+                written += len(batch)
+                with self._room:
+                    self._in_flight = 0
+                    self.stats["written"] += len(batch)
+                    self.stats["batches"] += 1
+                    self._room.notify_all()
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._buffer)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get buffer depth and write counters"""
+        with self._lock:
+            return {
+                "active": self.active,
+                "pending": len(self._buffer),
+                "max_pending": self.max_pending,
+                "full": len(self._buffer) + self._in_flight >= self.max_pending,
+                "batch_size": self.batch_size,
+                "flush_interval": self.flush_interval,
+                "last_error": self.last_error,
+                **self.stats
+            }
+
+    def _write(self, rows: List[Dict[str, Any]]):
+        from sqlalchemy import insert
+        from src.models.user import db
+        from src.models.dao import ChatMessage
+
+        with self.app.app_context():
+            try:
+                db.session.execute(insert(ChatMessage), rows)
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                raise
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                # The batch is back in the buffer; retry after a pause
+                self._stop.wait(self.retry_delay)
+
+transcript_journal = TranscriptJournal()
+
+def configure_transcript_journal(batch_size: int = 500, flush_interval: float = 1.0,
+                                 max_pending: int = 100000, max_wait: float = 5.0) -> TranscriptJournal:
+    """Configure the transcript journal without starting its thread"""
+    transcript_journal.batch_size = batch_size
+    transcript_journal.flush_interval = flush_interval
+    transcript_journal.max_pending = max_pending
+    transcript_journal.max_wait = max_wait
+    return transcript_journal
+
+def start_transcript_journal(app, batch_size: int = 500, flush_interval: float = 1.0,
+                             max_pending: int = 100000, max_wait: float = 5.0) -> TranscriptJournal:
+    """Start persisting agent transcripts, draining the buffer at interpreter exit"""
+    import atexit
+
+    configure_transcript_journal(batch_size, flush_interval, max_pending, max_wait)
+    transcript_journal.start(app)
+    atexit.register(transcript_journal.stop)
+    return transcript_journal
+
+BASE_KNOWLEDGE = {
+    "dao_principles": [
+        "Transparency in all operations",
+        "Community-driven decision making",
+        "Decentralized governance",
+        "Token-holder representation",
+        "Autonomous execution"
+    ],
+    "xmrt_token": {
+        "contract_address": "0x77307DFbc436224d5e6f2048d2b6bDfA66998a15",
+        "network": "Sepolia Testnet",
+        "total_supply": "1,000,000 XMRT",
+        "governance_rights": True
+    }
+}
+
+DEFAULT_METRICS = {
+    "tvl": "$2.4M",
+    "active_members": 1247,
+    "proposals_count": 3,
+    "voting_participation": "67%"
+}
+
+PERSONALITY_KNOWLEDGE = {
+    AgentPersonality.GOVERNANCE: {
+        "specialization": "Governance and proposal analysis",
+        "expertise": [
+            "Proposal evaluation",
+            "Voting pattern analysis",
+            "Governance optimization",
+            "Community sentiment analysis",
+            "Regulatory compliance"
+        ],
+        "decision_criteria": [
+            "Community benefit",
+            "Long-term sustainability",
+            "Risk assessment",
+            "Resource allocation efficiency"
+        ]
+    },
+    AgentPersonality.TREASURY: {
+        "specialization": "Financial management and treasury operations",
+        "expertise": [
+            "Asset allocation",
+            "Risk management",
+            "Yield optimization",
+            "Market analysis",
+            "Financial reporting"
+        ],
+        "decision_criteria": [
+            "Risk-adjusted returns",
+            "Liquidity requirements",
+            "Diversification",
+            "Market conditions"
+        ]
+    },
+    AgentPersonality.SECURITY: {
+        "specialization": "Security and risk assessment",
+        "expertise": [
+            "Smart contract auditing",
+            "Threat detection",
+            "Risk assessment",
+            "Security monitoring",
+            "Incident response"
+        ],
+        "decision_criteria": [
+            "Security impact",
+            "Threat severity",
+            "Mitigation effectiveness",
+            "System integrity"
+        ]
+    }
+}
+
+def _freeze(value: Any) -> Any:
+    """Recursively convert dicts to read-only mappings and lists to tuples"""
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+class SharedKnowledgeBase:
+    """Process-wide, read-only knowledge base shared by all agents
+
+    The common knowledge, each personality's overlay and the live
+    ``current_metrics`` are frozen once; every agent of a personality reads
+    the same merged view and response table, so adding agents costs no
+    knowledge memory. ``refresh_metrics`` is the single update point: it
+    builds new views and swaps them in atomically, then re-renders the
+    response tables.
+    """
+
+    def __init__(self, base: Dict[str, Any], overlays: Dict[AgentPersonality, Dict[str, Any]],
+                 metrics: Dict[str, Any]):
+        self._base = _freeze(base)
+        self._overlays = {personality: _freeze(overlay) for personality, overlay in overlays.items()}
+        self._metrics = _freeze(metrics)
+        self._templates: Dict[AgentPersonality, ResponseTemplateCache] = {}
+        self._subscribers: "weakref.WeakSet[ElizaAgent]" = weakref.WeakSet()
+        self._lock = threading.Lock()
+        self.refreshed_at = datetime.utcnow()
+        self._views = self._build_views()
+
+    @property
+    def metrics(self) -> Mapping[str, Any]:
+        return self._metrics
+
+    def view(self, personality: AgentPersonality) -> Mapping[str, Any]:
+        """Merged read-only knowledge for a personality"""
+        views = self._views
+        return views.get(personality) or views[None]
+
+    def response_templates(self, personality: AgentPersonality) -> ResponseTemplateCache:
+        """Shared response table for a personality, built on first use"""
+        templates = self._templates.get(personality)
+        if templates is None:
+            with self._lock:
+                templates = self._templates.get(personality)
+                if templates is None:
+                    templates = ResponseTemplateCache(personality, self.view(personality))
+                    self._templates[personality] = templates
+        return templates
+
+    def subscribe(self, agent: "ElizaAgent"):
+        """Have an agent with its own overlay re-render on every refresh"""
+        self._subscribers.add(agent)
+
+    def refresh_metrics(self, metrics: Dict[str, Any]):
+        """Merge new ``current_metrics`` values and publish them to all agents"""
+        with self._lock:
+            self._metrics = _freeze({**self._metrics, **metrics})
+            self._views = self._build_views()
+            self.refreshed_at = datetime.utcnow()
+            templates = list(self._templates.items())
+        for personality, cache in templates:
+            cache.reload(self.view(personality))
+        for agent in list(self._subscribers):
+            agent.reload_knowledge_base()
+
+    def _build_views(self) -> Dict[Optional[AgentPersonality], Mapping[str, Any]]:
+        shared = {**self._base, "current_metrics": self._metrics}
+        views: Dict[Optional[AgentPersonality], Mapping[str, Any]] = {None: MappingProxyType(shared)}
+        for personality, overlay in self._overlays.items():
+            views[personality] = MappingProxyType({**shared, **overlay})
+        return views
+
+shared_knowledge = SharedKnowledgeBase(BASE_KNOWLEDGE, PERSONALITY_KNOWLEDGE, DEFAULT_METRICS)
+
+def blockchain_metrics_source(blockchain_service=None) -> Callable[[], Dict[str, Any]]:
+    """Metrics source reading the chain head and gas price from ``BlockchainService``
+
+    Only values read from the node are published; holder, staking and treasury
+    figures in ``get_network_stats`` are placeholders, and proposal counts come
+    from ``dao_metrics_source``. A service without a node publishes nothing.
+    """
+    def fetch() -> Dict[str, Any]:
+        service = blockchain_service
+        if service is None:
+            from src.services.blockchain import get_blockchain_service
+            service = get_blockchain_service()
+        if service.rpc is None:
+            return {}
+        stats = service.get_network_stats()
+        return {"latest_block": stats["latest_block"], "gas_price": stats["gas_price"]}
+    return fetch
+
+def dao_metrics_source(app=None) -> Callable[[], Dict[str, Any]]:
+    """Metrics source running aggregate queries over the DAO tables"""
+    def fetch() -> Dict[str, Any]:
+        from src.models.user import db
+        from src.models.dao import Proposal, ProposalStatus, Vote
+
+        def query() -> Dict[str, Any]:
+            active, total = db.session.query(
+                db.func.count(Proposal.id).filter(Proposal.status == ProposalStatus.ACTIVE),
+                db.func.count(Proposal.id)
+            ).one()
+            voters = db.session.query(db.func.count(db.distinct(Vote.voter_address))).scalar()
+            return {"proposals_count": active, "total_proposals": total, "unique_voters": voters}
+
+        if app is None:
+            return query()
+        with app.app_context():
+            return query()
+    return fetch
+
+class MetricsRefresher:
+    """Background task feeding live metrics into the shared knowledge base
+
+    Every ``interval`` seconds each source is polled and the merged result is
+    published through ``SharedKnowledgeBase.refresh_metrics``, so chat requests
+    only ever read cached values. A failing source keeps its last good values
+    until they are older than ``max_staleness`` seconds, after which the
+    metrics are flagged as stale.
+    """
+
+    def __init__(self, sources: Dict[str, Callable[[], Dict[str, Any]]], interval: float = 30,
+                 max_staleness: float = 300, knowledge: SharedKnowledgeBase = None):
+        self.sources = sources
+        self.interval = interval
+        self.max_staleness = max_staleness
+        self.knowledge = knowledge or shared_knowledge
+        self._values: Dict[str, Dict[str, Any]] = {}
+        self._fetched_at: Dict[str, float] = {}
+        self._errors: Dict[str, str] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start refreshing in a daemon thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="metrics-refresher", daemon=True)
+        self._thread.start()
+
+    def stop(self, wait: bool = True):
+        """Stop the refresher thread"""
+        self._stop.set()
+        if wait and self._thread is not None:
+            self._thread.join()
+
+    def refresh_once(self) -> Dict[str, Any]:
+        """Poll every source once and publish the merged metrics"""
+        for name, fetch in self.sources.items():
+            try:
+                self._values[name] = fetch()
+                self._fetched_at[name] = time.time()
+                self._errors.pop(name, None)
+            except Exception as exc:
+                self._errors[name] = str(exc)
+
+        metrics: Dict[str, Any] = {}
+        for name in self.sources:
+            metrics.update(self._values.get(name, {}))
+        metrics["metrics_stale"] = self.is_stale()
+        metrics["metrics_updated_at"] = datetime.utcnow().isoformat()
+        self.knowledge.refresh_metrics(metrics)
+        return metrics
+
+    def is_stale(self) -> bool:
+        """Whether any source has gone without a successful fetch past the bound"""
+        now = time.time()
+        return any(
+            now - self._fetched_at.get(name, 0) > self.max_staleness
+            for name in self.sources
+        )
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get per-source freshness and last errors"""
+        now = time.time()
+        return {
+            "running": self._thread is not None and self._thread.is_alive(),
+            "interval": self.interval,
+            "stale": self.is_stale(),
+            "sources": {
+                name: {
+                    "age": now - self._fetched_at[name] if name in self._fetched_at else None,
+                    "error": self._errors.get(name)
+                }
+                for name in self.sources
+            }
+        }
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.refresh_once()
+            self._stop.wait(self.interval)
+
+def create_metrics_refresher(app=None, blockchain_service=None, interval: float = 30,
+                             max_staleness: float = 300) -> MetricsRefresher:
+    """Refresher feeding blockchain and DAO metrics into all agents, not yet started"""
+    return MetricsRefresher({
+        "blockchain": blockchain_metrics_source(blockchain_service),
+        "dao": dao_metrics_source(app)
+    }, interval=interval, max_staleness=max_staleness)
+
+def start_metrics_refresher(app=None, blockchain_service=None, interval: float = 30,
+                            max_staleness: float = 300) -> MetricsRefresher:
+    """Start feeding blockchain and DAO metrics into all agents"""
+    refresher = create_metrics_refresher(app, blockchain_service, interval, max_staleness)
+    refresher.start()
+    return refresher
+
+class AgentBusyError(Exception):
+    """Raised when an agent's request queue is full"""
+
+class AgentExecutor:
+    """Bounded worker pool that runs chat requests for one agent
+
+    Every session is pinned to one worker by hash, so requests for the same
+    session complete in submission order while different sessions proceed
+    concurrently. Each worker owns a bounded queue: ``submit`` blocks while
+    the target queue is full, or raises ``AgentBusyError`` once ``timeout``
+    expires (immediately for ``timeout=0``). After ``shutdown`` the executor
+    refuses new requests.
+    """
+
+    def __init__(self, agent: "ElizaAgent", workers: int = 4, queue_size: int = 256, app=None):
+        self.agent = agent
+        self.app = app
+        self.workers = workers
+        self.queue_size = queue_size
+        self._queues = [queue.Queue(maxsize=queue_size) for _ in range(workers)]
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._shutdown = False
+        self.stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "rejected": 0
+        }
+
+    def submit(self, session_id: str, message: str, additional_data: Dict[str, Any] = None,
+               timeout: Optional[float] = None) -> "Future":
+        """Queue a request and return a future for the response"""
+        future = self._put(session_id, message, additional_data, block=timeout != 0, timeout=timeout or None)
+        if future is None:
+            self._count("rejected")
+            raise AgentBusyError(f"{self.agent.name} request queue is full")
+        return future
+
+    def try_submit(self, session_id: str, message: str,
+                   additional_data: Dict[str, Any] = None) -> Optional["Future"]:
+        """Queue a request if its queue has room, else return None without counting a rejection"""
+        return self._put(session_id, message, additional_data, block=False, timeout=None)
+
+    def _put(self, session_id: str, message: str, additional_data: Optional[Dict[str, Any]],
+             block: bool, timeout: Optional[float]) -> Optional["Future"]:
+        from concurrent.futures import Future
+
+        self._ensure_started()
+        future = Future()
+        shard = self._queues[hash(session_id) % self.workers]
+        try:
+            shard.put((future, session_id, message, additional_data), block=block, timeout=timeout)
+        except queue.Full:
+            return None
+        # A request queued behind the shutdown sentinel would never run
+        if self._shutdown and future.cancel():
+            raise RuntimeError(f"{self.agent.name} executor is shut down")
+        self._count("submitted")
+        return future
+
+    def shutdown(self, wait: bool = True):
+        """Stop the workers after the already queued requests are processed"""
+        with self._lock:
+            self._shutdown = True
+            threads, self._threads = self._threads, []
+        for shard in self._queues[:len(threads)]:
+            shard.put(None)
+        if wait:
+            for thread in threads:
+                thread.join()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get request counters and current queue depth"""
+        with self._lock:
+            stats = dict(self.stats)
+        stats.update({
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "queue_depth": sum(shard.qsize() for shard in self._queues)
+        })
+        return stats
+
+    def _ensure_started(self):
+        if self._threads:
+            return
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError(f"{self.agent.name} executor is shut down")
+            if self._threads:
+                return
+            for index, shard in enumerate(self._queues):
+                thread = threading.Thread(target=self._run, args=(shard,),
+                                          name=f"{self.agent.name}-worker-{index}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _run(self, shard: queue.Queue):
+        while True:
+            item = shard.get()
+            if item is None:
+                return
+            future, session_id, message, additional_data = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                if self.app is not None:
+                    # Each request gets its own context, and with it a fresh DB session
+                    with self.app.app_context():
+                        response = self.agent.generate_response(message, session_id, additional_data)
+                else:
+                    response = self.agent.generate_response(message, session_id, additional_data)
+                future.set_result(response)
+                self._count("completed")
+            except Exception as exc:
+                future.set_exception(exc)
+                self._count("failed")
+
+    def _count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
 class ElizaAgent:
     """Enhanced AI Agent inspired by ElizaOS framework"""
     
@@ -43,199 +1299,125 @@ class ElizaAgent:
         self.name = name
         self.personality = personality
         self.config = config or {}
-        self.memory_store: Dict[str, AgentMemory] = {}
-        self.knowledge_base = self._initialize_knowledge_base()
-        self.decision_history: List[AgentDecision] = []
-        
-    def _initialize_knowledge_base(self) -> Dict[str, Any]:
-        """Initialize agent-specific knowledge base"""
-        base_knowledge = {
-            "dao_principles": [
-                "Transparency in all operations",
-                "Community-driven decision making",
-                "Decentralized governance",
-                "Token-holder representation",
-                "Autonomous execution"
-            ],
-            "xmrt_token": {
-                "contract_address": "0x77307DFbc436224d5e6f2048d2b6bDfA66998a15",
-                "network": "Sepolia Testnet",
-                "total_supply": "1,000,000 XMRT",
-                "governance_rights": True
-            },
-            "current_metrics": {
-                "tvl": "$2.4M",
-                "active_members": 1247,
-                "proposals_count": 3,
-                "voting_participation": "67%"
-            }
-        }
+        self.history_window: int = self.config.get("history_window", 20)
+        self.memory_store: SessionMemoryStore = self.config.get("memory_store") or SessionMemoryStore(
+            max_sessions=self.config.get("max_sessions", 10000),
+            max_bytes=self.config.get("max_memory_bytes", 64 * 1024 * 1024),
+            idle_ttl=self.config.get("session_ttl", 3600),
+            loader=lambda session_id: load_memory_from_chat_messages(self.name, session_id, self.history_window)
+        )
+        # Per-agent knowledge overlay and templates, only set when overridden
+        self._knowledge_overrides: Optional[Mapping[str, Any]] = None
+        self._response_templates: Optional[ResponseTemplateCache] = None
+        self.decision_history = DecisionHistory(self.config.get("decision_history_size", 10000))
+        # Guards memory_store and decision_history against concurrent requests
+        self._lock = threading.RLock()
+        # Sessions being restored from the database, so each is loaded once
+        self._restoring: Dict[str, threading.Lock] = {}
+        self._executor: Optional[AgentExecutor] = None
+        self.journal: TranscriptJournal = self.config.get("journal") or transcript_journal
         
-        if self.personality == AgentPersonality.GOVERNANCE:
-            base_knowledge.update({
-                "specialization": "Governance and proposal analysis",
-                "expertise": [
-                    "Proposal evaluation",
-                    "Voting pattern analysis",
-                    "Governance optimization",
-                    "Community sentiment analysis",
-                    "Regulatory compliance"
-                ],
-                "decision_criteria": [
-                    "Community benefit",
-                    "Long-term sustainability",
-                    "Risk assessment",
-                    "Resource allocation efficiency"
-                ]
-            })
-        elif self.personality == AgentPersonality.TREASURY:
-            base_knowledge.update({
-                "specialization": "Financial management and treasury operations",
-                "expertise": [
-                    "Asset allocation",
-                    "Risk management",
-                    "Yield optimization",
-                    "Market analysis",
-                    "Financial reporting"
-                ],
-                "decision_criteria": [
-                    "Risk-adjusted returns",
-                    "Liquidity requirements",
-                    "Diversification",
-                    "Market conditions"
-                ]
-            })
-        elif self.personality == AgentPersonality.SECURITY:
-            base_knowledge.update({
-                "specialization": "Security and risk assessment",
-                "expertise": [
-                    "Smart contract auditing",
-                    "Threat detection",
-                    "Risk assessment",
-                    "Security monitoring",
-                    "Incident response"
-                ],
-                "decision_criteria": [
-                    "Security impact",
-                    "Threat severity",
-                    "Mitigation effectiveness",
-                    "System integrity"
-                ]
-            })
-            
-        return base_knowledge
-    
     def get_or_create_memory(self, session_id: str) -> AgentMemory:
-        """Get or create memory for a session"""
-        if session_id not in self.memory_store:
-            self.memory_store[session_id] = AgentMemory(
-                session_id=session_id,
-                context={},
-                conversation_history=[],
-                user_preferences={},
-                created_at=datetime.utcnow(),
-                last_updated=datetime.utcnow()
-            )
-        return self.memory_store[session_id]
+        """Get or create memory for a session
+
+        A session missing from the store is restored from the database
+        outside the agent lock, so other sessions are not held up by the
+        query; concurrent requests for the same session wait on a
+        per-session guard instead of loading it twice.
+        """
+        with self._lock:
+            memory = self.memory_store.get(session_id, restore=False)
+            if memory is not None:
+                return memory
+            guard = self._restoring.setdefault(session_id, threading.Lock())
+        with guard:
+            with self._lock:
+                memory = self.memory_store.get(session_id, restore=False)
+                if memory is not None:
+                    return memory
+            try:
+                restored = self.memory_store.restore(session_id)
+            finally:
+                with self._lock:
+                    self._restoring.pop(session_id, None)
+            with self._lock:
+                memory = self.memory_store.get(session_id, restore=False)
+                if memory is None:
+                    memory = restored or AgentMemory(
+                        session_id=session_id,
+                        context={},
+                        conversation_history=ConversationHistory(self.history_window),
+                        user_preferences={},
+                        created_at=datetime.utcnow(),
+                        last_updated=datetime.utcnow()
+                    )
+                    self.memory_store.put(session_id, memory)
+                return memory
     
     def update_memory(self, session_id: str, user_message: str, agent_response: str):
         """Update agent memory with conversation"""
+        self._append_conversation(session_id, [(user_message, agent_response)])
+    
+    def _append_conversation(self, session_id: str, exchanges: List[Tuple[str, str]],
+                             context: Dict[str, Any] = None):
+        """Append (user, agent) exchanges to a session in one step"""
         memory = self.get_or_create_memory(session_id)
-        memory.conversation_history.append({
-            "timestamp": datetime.utcnow().isoformat(),
-            "user": user_message,
-            "agent": agent_response
-        })
-        memory.last_updated = datetime.utcnow()
-        
-        # Keep only last 20 messages to manage memory
-        if len(memory.conversation_history) > 20:
-            memory.conversation_history = memory.conversation_history[-20:]
+        with self._lock:
+            if session_id not in self.memory_store:
+                # Evicted since it was looked up
+                self.memory_store.put(session_id, memory)
+            if context is not None:
+                memory.context.update(context)
+            timestamp = time.time()
+            history = memory.conversation_history
+            for user_message, agent_response in exchanges:
+                history.append(timestamp, user_message, agent_response)
+            memory.last_updated = datetime.utcfromtimestamp(timestamp)
+            self.memory_store.touch(session_id)
+        self.journal.record(self.name, session_id, exchanges, timestamp)
     
     def analyze_context(self, message: str, session_id: str) -> Dict[str, Any]:
         """Analyze message context and extract relevant information"""
-        memory = self.get_or_create_memory(session_id)
-        message_lower = message.lower()
-        
-        context = {
-            "intent": self._classify_intent(message_lower),
-            "entities": self._extract_entities(message_lower),
-            "sentiment": self._analyze_sentiment(message_lower),
-            "urgency": self._assess_urgency(message_lower),
-            "requires_action": self._requires_action(message_lower)
-        }
+        return self._analyze_context(message, session_id)[0]
+    
+    def _analyze_context(self, message: str, session_id: str) -> Tuple[Dict[str, Any], int]:
+        context, keywords = get_message_analyzer().analyze_with_keywords(message.lower())
         
         # Update memory context
-        memory.context.update(context)
-        return context
+        memory = self.get_or_create_memory(session_id)
+        with self._lock:
+            memory.context.update(context)
+        return context, keywords
     
     def _classify_intent(self, message: str) -> str:
         """Classify user intent"""
-        if any(word in message for word in ["proposal", "vote", "voting", "governance"]):
-            return "governance_inquiry"
-        elif any(word in message for word in ["treasury", "financial", "money", "funds", "allocation"]):
-            return "treasury_inquiry"
-        elif any(word in message for word in ["security", "risk", "audit", "threat", "vulnerability"]):
-            return "security_inquiry"
-        elif any(word in message for word in ["status", "update", "report", "summary"]):
-            return "status_request"
-        elif any(word in message for word in ["help", "how", "what", "explain"]):
-            return "information_request"
-        else:
-            return "general_inquiry"
+        return get_message_analyzer().analyze(message)["intent"]
     
     def _extract_entities(self, message: str) -> List[str]:
         """Extract relevant entities from message"""
-        entities = []
-        
-        # Proposal references
-        if "proposal" in message:
-            import re
-            proposal_matches = re.findall(r'proposal\s*#?(\d+)', message)
-            entities.extend([f"proposal_{match}" for match in proposal_matches])
-        
-        # Token references
-        if "xmrt" in message or "token" in message:
-            entities.append("xmrt_token")
-        
-        # DAO components
-        if "dao" in message:
-            entities.append("dao")
-        
-        return entities
+        return get_message_analyzer().analyze(message)["entities"]
     
     def _analyze_sentiment(self, message: str) -> str:
         """Simple sentiment analysis"""
-        positive_words = ["good", "great", "excellent", "support", "approve", "like", "love"]
-        negative_words = ["bad", "terrible", "against", "oppose", "dislike", "hate", "concern"]
-        
-        positive_count = sum(1 for word in positive_words if word in message)
-        negative_count = sum(1 for word in negative_words if word in message)
-        
-        if positive_count > negative_count:
-            return "positive"
-        elif negative_count > positive_count:
-            return "negative"
-        else:
-            return "neutral"
+        return get_message_analyzer().analyze(message)["sentiment"]
     
     def _assess_urgency(self, message: str) -> str:
         """Assess message urgency"""
-        urgent_words = ["urgent", "emergency", "critical", "immediate", "asap", "now"]
-        if any(word in message for word in urgent_words):
-            return "high"
-        elif any(word in message for word in ["soon", "quickly", "fast"]):
-            return "medium"
-        else:
-            return "low"
+        return get_message_analyzer().analyze(message)["urgency"]
     
     def _requires_action(self, message: str) -> bool:
         """Determine if message requires action"""
-        action_words = ["create", "execute", "implement", "deploy", "vote", "transfer", "allocate"]
-        return any(word in message for word in action_words)
+        return get_message_analyzer().analyze(message)["requires_action"]
     
     def make_decision(self, context: Dict[str, Any], data: Dict[str, Any] = None) -> AgentDecision:
         """Make an AI decision based on context and data"""
+        decision = self._decide(context, data)
+        with self._lock:
+            self.decision_history.append(decision)
+        return decision
+    
+    def _decide(self, context: Dict[str, Any], data: Dict[str, Any] = None) -> AgentDecision:
+        """Compute a decision without recording it"""
         decision_type = context.get("intent", "general")
         
         # Simulate decision-making process
@@ -257,7 +1439,6 @@ class ElizaAgent:
                 timestamp=datetime.utcnow()
             )
         
-        self.decision_history.append(decision)
         return decision
     
     def _make_governance_decision(self, context: Dict[str, Any], data: Dict[str, Any], confidence: float) -> AgentDecision:
@@ -308,145 +1489,162 @@ class ElizaAgent:
     
     def generate_response(self, message: str, session_id: str, additional_data: Dict[str, Any] = None) -> str:
         """Generate enhanced AI response"""
-        context = self.analyze_context(message, session_id)
+        context, keywords = self._analyze_context(message, session_id)
         decision = self.make_decision(context, additional_data)
         
         # Generate response based on personality and context
-        response = self._generate_contextual_response(message, context, decision)
+        response = self._generate_contextual_response(message, context, decision, keywords)
         
         # Update memory
         self.update_memory(session_id, message, response)
         
         return response
     
-    def _generate_contextual_response(self, message: str, context: Dict[str, Any], decision: AgentDecision) -> str:
-        """Generate contextual response based on analysis"""
-        intent = context.get("intent", "general_inquiry")
-        sentiment = context.get("sentiment", "neutral")
-        urgency = context.get("urgency", "low")
-        
-        # Base response templates by personality
-        if self.personality == AgentPersonality.GOVERNANCE:
-            return self._generate_governance_response(message, context, decision)
-        elif self.personality == AgentPersonality.TREASURY:
-            return self._generate_treasury_response(message, context, decision)
-        elif self.personality == AgentPersonality.SECURITY:
-            return self._generate_security_response(message, context, decision)
-        
-        return f"I understand you're asking about '{message}'. As an AI agent, I'm here to help with DAO operations."
+    @property
+    def executor(self) -> AgentExecutor:
+        """Per-agent worker pool, created on first use"""
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = AgentExecutor(
+                        self,
+                        workers=self.config.get("workers", 4),
+                        queue_size=self.config.get("queue_size", 256),
+                        app=self.config.get("app") or self.journal.app
+                    )
+        return self._executor
     
-    def _generate_governance_response(self, message: str, context: Dict[str, Any], decision: AgentDecision) -> str:
-        """Generate governance-specific responses"""
-        message_lower = message.lower()
-        
-        if "proposal" in message_lower:
-            if any(num in message_lower for num in ["1", "one", "first"]):
-                return ("Based on my analysis of Proposal #1 'Increase Treasury Allocation for AI Development', "
-                       "I recommend supporting this proposal. It shows strong community support with 78% approval rate "
-                       "and aligns with our long-term strategic goals. The treasury can accommodate this allocation "
-                       "without compromising operational reserves. The proposal demonstrates clear benefits for "
-                       "enhancing our AI capabilities and autonomous operations.")
-            else:
-                return ("I've analyzed the current proposals and can provide detailed insights. Proposal #1 has "
-                       "strong support for AI development funding, Proposal #2 focuses on market analysis capabilities, "
-                       "and Proposal #3 has been successfully executed for ZK infrastructure. Each proposal is "
-                       "evaluated based on community benefit, sustainability, and risk factors.")
-        
-        elif "vote" in message_lower or "voting" in message_lower:
-            return ("Current voting analysis shows healthy participation with 67% of token holders actively "
-                   "engaging in governance. I recommend implementing quadratic voting for future proposals "
-                   "to ensure more equitable representation. Proposal #2 currently needs 340 more votes to "
-                   "reach quorum. The voting mechanism ensures democratic decision-making while preventing "
-                   "concentration of power.")
-        
-        elif "governance" in message_lower:
-            return ("Our governance system operates on principles of transparency, decentralization, and "
-                   "community participation. Token holders can create proposals, vote on decisions, and "
-                   "participate in autonomous execution. The AI agents provide analysis and recommendations "
-                   "but final decisions rest with the community. Current governance health metrics show "
-                   "strong engagement and effective decision-making processes.")
-        
-        else:
-            return (f"As your governance AI agent, I can help with proposal analysis, voting patterns, "
-                   f"and governance optimization. Regarding '{message}', I can provide insights on how "
-                   f"this relates to our DAO's governance structure and decision-making processes. "
-                   f"What specific governance aspect would you like me to analyze?")
+    async def generate_response_async(self, message: str, session_id: str,
+                                      additional_data: Dict[str, Any] = None,
+                                      timeout: Optional[float] = None) -> str:
+        """Generate a response on the agent's worker pool without blocking the event loop
+
+        While the session's queue is full the call waits on a helper thread
+        for a free slot, raising ``AgentBusyError`` if none frees up within
+        ``timeout`` seconds.
+        """
+        import asyncio
+        import functools
+
+        future = self.executor.try_submit(session_id, message, additional_data)
+        if future is None:
+            submit = functools.partial(self.executor.submit, session_id, message, additional_data, timeout=timeout)
+            future = await asyncio.get_running_loop().run_in_executor(None, submit)
+        return await asyncio.wrap_future(future)
     
-    def _generate_treasury_response(self, message: str, context: Dict[str, Any], decision: AgentDecision) -> str:
-        """Generate treasury-specific responses"""
-        message_lower = message.lower()
-        
-        if "treasury" in message_lower or "financial" in message_lower:
-            return ("Current treasury status: $2.4M TVL with 15% growth this month. Asset allocation is "
-                   "optimized across DeFi protocols with 94% efficiency rating. I've identified 3 new "
-                   "yield opportunities that could increase returns by 8-12% annually while maintaining "
-                   "our risk parameters. The treasury maintains 20% in stable assets for operational "
-                   "liquidity and 80% in yield-generating positions.")
-        
-        elif "allocation" in message_lower or "funds" in message_lower:
-            return ("Treasury allocation follows our strategic framework: 60% in high-yield DeFi protocols, "
-                   "20% in stable reserves, 15% in strategic investments, and 5% for operational expenses. "
-                   "This allocation has generated consistent returns while maintaining liquidity for "
-                   "governance decisions. I continuously monitor market conditions and rebalance positions "
-                   "to optimize risk-adjusted returns.")
-        
-        elif "performance" in message_lower or "returns" in message_lower:
-            return ("Treasury performance metrics: 12.8% annual yield, 94% capital efficiency, and 2.1% "
-                   "volatility. Our diversified approach across multiple protocols has outperformed "
-                   "benchmark indices while maintaining lower risk. Recent optimizations have improved "
-                   "gas efficiency by 23% and increased yield capture by 8.5%. All positions are "
-                   "continuously monitored for optimal performance.")
-        
-        else:
-            return (f"As the treasury management agent, I oversee financial operations, asset allocation, "
-                   f"and yield optimization. Regarding '{message}', I can provide analysis on how this "
-                   f"impacts our financial position and recommend appropriate treasury actions. "
-                   f"What specific financial aspect would you like me to analyze?")
+    def generate_responses(self, messages: Iterable[Tuple[str, str]],
+                           batch_size: int = 256) -> Iterator[Tuple[str, str]]:
+        """Generate responses for many (session_id, message) pairs
+
+        Messages are consumed in batches of ``batch_size`` and results are
+        yielded lazily, in input order, as (session_id, response) tuples.
+        Responses match those of ``generate_response`` for the same input.
+        """
+        batch = []
+        for item in messages:
+            batch.append(item)
+            if len(batch) >= batch_size:
+                yield from self._generate_batch(batch)
+                batch = []
+        if batch:
+            yield from self._generate_batch(batch)
     
-    def _generate_security_response(self, message: str, context: Dict[str, Any], decision: AgentDecision) -> str:
-        """Generate security-specific responses"""
-        message_lower = message.lower()
-        
-        if "security" in message_lower or "audit" in message_lower:
-            return ("Security audit completed successfully. All smart contracts are secure with no critical "
-                   "vulnerabilities detected. I've implemented additional monitoring for unusual transaction "
-                   "patterns and updated our risk assessment protocols. Current threat level: LOW. "
-                   "All systems are operating within normal security parameters with enhanced monitoring "
-                   "active across all critical components.")
+    def _generate_batch(self, batch: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+        """Analyze, decide and respond for a batch, then update memory per session
+
+        The agent lock is only taken to record the batch's decisions and to
+        update each session's memory, so batches on different executor
+        workers overlap.
+        """
+        decisions: Dict[Tuple[str, Tuple[str, ...]], AgentDecision] = {}
+        history: List[AgentDecision] = []
+        conversations: Dict[str, List[Tuple[str, str]]] = {}
+        last_context: Dict[str, Dict[str, Any]] = {}
+        results = []
         
-        elif "risk" in message_lower:
-            return ("Current risk assessment shows minimal exposure across all vectors. Smart contract risk: "
-                   "LOW (audited and verified), Market risk: MEDIUM (managed through diversification), "
-                   "Operational risk: LOW (automated systems with redundancy). I continuously monitor "
-                   "for emerging threats and maintain updated incident response procedures. All risk "
-                   "metrics are within acceptable thresholds.")
+        for session_id, message in batch:
+            context, keywords = get_message_analyzer().analyze_with_keywords(message.lower())
+            # Decisions only depend on the intent and entities, so messages
+            # sharing them within a batch reuse one computed decision
+            key = (context["intent"], tuple(context["entities"]))
+            decision = decisions.get(key)
+            if decision is None:
+                decision = decisions[key] = self._decide(context)
+            history.append(decision)
+            
+            response = self._generate_contextual_response(message, context, decision, keywords)
+            conversations.setdefault(session_id, []).append((message, response))
+            last_context[session_id] = context
+            results.append((session_id, response))
         
-        elif "threat" in message_lower or "vulnerability" in message_lower:
-            return ("Threat monitoring systems are active and detecting no current threats. Vulnerability "
-                   "scans are performed continuously with automated patching for non-critical issues. "
-                   "The last comprehensive security review identified zero high-severity vulnerabilities. "
-                   "All access controls are properly configured and monitored. Security posture remains "
-                   "strong with proactive threat detection capabilities.")
+        with self._lock:
+            for decision in history:
+                self.decision_history.append(decision)
+        for session_id, exchanges in conversations.items():
+            self._append_conversation(session_id, exchanges, last_context[session_id])
         
-        else:
-            return (f"As the security agent, I monitor risks, conduct audits, and ensure system safety. "
-                   f"Regarding '{message}', I can assess security implications and provide risk analysis. "
-                   f"All systems are currently secure with active monitoring. What specific security "
-                   f"concern can I help you with?")
+        return results
+    
+    def _generate_contextual_response(self, message: str, context: Dict[str, Any], decision: AgentDecision,
+                                      keywords: Optional[int] = None) -> str:
+        """Generate contextual response based on analysis"""
+        if keywords is None:
+            keywords = get_message_analyzer().scan(message.lower())
+        return self.response_templates.render(message, keywords)
+    
+    @property
+    def knowledge_base(self) -> Mapping[str, Any]:
+        """Shared knowledge for this personality, under any agent-specific overlay"""
+        shared = shared_knowledge.view(self.personality)
+        if self._knowledge_overrides is None:
+            return shared
+        return ChainMap(self._knowledge_overrides, shared)
+    
+    @property
+    def response_templates(self) -> ResponseTemplateCache:
+        """Response table for this agent, shared per personality unless overridden"""
+        return self._response_templates or shared_knowledge.response_templates(self.personality)
+    
+    def reload_knowledge_base(self, knowledge_base: Dict[str, Any] = None):
+        """Overlay agent-specific knowledge on the shared base and re-render the response templates
+
+        Only the given top-level keys are copied; everything else keeps
+        reading from the shared knowledge base.
+        """
+        with self._lock:
+            if knowledge_base is not None:
+                self._knowledge_overrides = _freeze(knowledge_base)
+                shared_knowledge.subscribe(self)
+            if self._knowledge_overrides is None:
+                return
+            if self._response_templates is None:
+                self._response_templates = ResponseTemplateCache(self.personality, self.knowledge_base)
+            else:
+                self._response_templates.reload(self.knowledge_base)
     
     def get_agent_status(self) -> Dict[str, Any]:
         """Get current agent status and metrics"""
-        return {
-            "name": self.name,
-            "personality": self.personality.value,
-            "status": "active",
-            "memory_sessions": len(self.memory_store),
-            "decisions_made": len(self.decision_history),
-            "last_decision": self.decision_history[-1].timestamp.isoformat() if self.decision_history else None,
-            "performance_score": random.randint(90, 98),  # Simulated performance
-            "uptime": "99.8%",
-            "last_updated": datetime.utcnow().isoformat()
-        }
+        with self._lock:
+            last_decision = self.decision_history.last_timestamp()
+            status = {
+                "name": self.name,
+                "personality": self.personality.value,
+                "status": "active",
+                "memory_sessions": len(self.memory_store),
+                "memory_store": self.memory_store.get_stats(),
+                "decisions_made": self.decision_history.total_count,
+                "last_decision": last_decision.isoformat() if last_decision else None,
+                "decision_stats": self.decision_history.get_stats(),
+                "response_cache": self.response_templates.get_stats(),
+                "performance_score": random.randint(90, 98),  # Simulated performance
+                "uptime": "99.8%",
+                "last_updated": datetime.utcnow().isoformat()
+            }
+        if self._executor is not None:
+            status["executor"] = self._executor.get_stats()
+        if self.journal.active:
+            status["transcript_journal"] = self.journal.get_stats()
+        return status
 
 # Agent factory for creating different agent types
 class AgentFactory:
@@ -467,17 +1665,101 @@ class AgentFactory:
         """Create a security-focused agent"""
         return ElizaAgent("Eliza-Security", AgentPersonality.SECURITY)
 
-# Global agent instances
-governance_agent = AgentFactory.create_governance_agent()
-treasury_agent = AgentFactory.create_treasury_agent()
-security_agent = AgentFactory.create_security_agent()
+class AgentRegistry:
+    """Registry of agents, constructed lazily on first lookup
 
-def get_agent_by_name(agent_name: str) -> Optional[ElizaAgent]:
-    """Get agent instance by name"""
-    agents = {
-        "Eliza-Governance": governance_agent,
-        "Eliza-Treasury": treasury_agent,
-        "Eliza-Security": security_agent
-    }
-    return agents.get(agent_name)
+    Agents are registered by name with a factory and resolved through a
+    prebuilt table, so a lookup is a single dict access. A lookup with a
+    ``tenant`` returns that tenant's own instance if a tenant-specific
+    factory was registered, and the shared global instance otherwise, so
+    arbitrary tenant strings never build new agents. Every lookup is
+    counted per agent.
+    """
+
+    def __init__(self):
+        self._factories: Dict[Tuple[Optional[str], str], Callable[[], ElizaAgent]] = {}
+        self._agents: Dict[Tuple[Optional[str], str], ElizaAgent] = {}
+        self._loads: Dict[Tuple[Optional[str], str], int] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, factory: Callable[[], ElizaAgent], tenant: str = None):
+        """Register an agent factory, replacing any existing instance"""
+        with self._lock:
+            self._factories[(tenant, name)] = factory
+            self._agents.pop((tenant, name), None)
+
+    def register_personality(self, name: str, personality: AgentPersonality, config: Dict[str, Any] = None,
+                             knowledge: Dict[str, Any] = None, tenant: str = None):
+        """Register an agent for a personality, optionally with its own knowledge overlay"""
+        def factory() -> ElizaAgent:
+            agent = ElizaAgent(name, personality, config)
+            if knowledge is not None:
+                agent.reload_knowledge_base(knowledge)
+            return agent
+        self.register(name, factory, tenant)
+
+    def get(self, name: str, tenant: str = None) -> Optional[ElizaAgent]:
+        """Get an agent by name, building it on first use"""
+        key = (tenant, name)
+        if tenant is not None and key not in self._factories:
+            key = (None, name)
+        agent = self._agents.get(key)
+        if agent is None:
+            agent = self._build(key)
+            if agent is None:
+                return None
+        with self._lock:
+            self._loads[key] = self._loads.get(key, 0) + 1
+        return agent
+
+    def names(self) -> List[str]:
+        """Names of the globally registered agents"""
+        return [name for tenant, name in self._factories if tenant is None]
 
+    def loaded_agents(self) -> List[ElizaAgent]:
+        """Agents constructed so far"""
+        return list(self._agents.values())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-agent construction state and lookup counters"""
+        with self._lock:
+            return {
+                (name if tenant is None else f"{tenant}/{name}"): {
+                    "loaded": key in self._agents,
+                    "loads": self._loads.get(key, 0)
+                }
+                for key in set(self._factories) | set(self._agents)
+                for tenant, name in [key]
+            }
+
+    def _build(self, key: Tuple[Optional[str], str]) -> Optional[ElizaAgent]:
+        factory = self._factories.get(key)
+        if factory is None:
+            return None
+        with self._lock:
+            agent = self._agents.get(key)
+            if agent is None:
+                agent = self._agents[key] = factory()
+            return agent
+
+agent_registry = AgentRegistry()
+agent_registry.register("Eliza-Governance", AgentFactory.create_governance_agent)
+agent_registry.register("Eliza-Treasury", AgentFactory.create_treasury_agent)
+agent_registry.register("Eliza-Security", AgentFactory.create_security_agent)
+
+# Module attributes kept for callers of the former eagerly built globals
+_LAZY_ATTRIBUTES = {
+    "governance_agent": lambda: agent_registry.get("Eliza-Governance"),
+    "treasury_agent": lambda: agent_registry.get("Eliza-Treasury"),
+    "security_agent": lambda: agent_registry.get("Eliza-Security"),
+    "message_analyzer": get_message_analyzer
+}
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_ATTRIBUTES:
+        return _LAZY_ATTRIBUTES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def get_agent_by_name(agent_name: str, tenant: str = None) -> Optional[ElizaAgent]:
+    """Get agent instance by name"""
+    return agent_registry.get(agent_name, tenant)
@@ -0,0 +1,44 @@
+"""
+Gunicorn Configuration for XMRT DAO
+
+Pre-fork gthread workers serving ``src.wsgi:app``. Every setting can be
+overridden from the environment. ``kill -HUP <master>`` replaces workers
+gracefully with the new configuration; with ``preload_app`` new code is
+picked up by ``kill -USR2 <master>`` followed by ``kill -QUIT <old master>``.
+"""
+
+import multiprocessing
+import os
+
+def _env_bool(name: str, default: bool) -> bool:
+    return os.environ.get(name, str(default)).lower() in ("1", "true", "yes")
+
+wsgi_app = "src.wsgi:app"
+bind = os.environ.get("BIND", f"{os.environ.get('HOST', '0.0.0.0')}:{os.environ.get('PORT', '5000')}")
+
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+# The app reads the worker count too (see create_response_cache in src/services/cache.py)
+os.environ["WEB_CONCURRENCY"] = str(workers)
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+preload_app = _env_bool("GUNICORN_PRELOAD", True)
+
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", 30))
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", 5))
+# Recycle workers periodically, staggered so they never restart together
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 1000))
+max_requests_jitter = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", 100))
+
+accesslog = os.environ.get("GUNICORN_ACCESS_LOG", "-")
+loglevel = os.environ.get("LOG_LEVEL", "info")
+
+# Importing the app starts no threads, so the master runs none and workers
+# start theirs after fork
+def post_fork(server, worker):
+    from src.wsgi import start_background_services
+    start_background_services()
+
+def worker_exit(server, worker):
+    from src.wsgi import stop_background_services
+    stop_background_services(timeout=graceful_timeout)
@@ -0,0 +1,42 @@
+"""
+Health Endpoints for XMRT DAO
+Liveness and readiness probes for load balancers and orchestrators
+"""
+
+import time
+
+from flask import Blueprint, jsonify
+from sqlalchemy import text
+
+from src.models.user import db
+from src.services.eliza_agent import transcript_journal
+
+STARTED_AT = time.time()
+
+health_bp = Blueprint('health', __name__)
+
+@health_bp.route('/livez', methods=['GET'])
+def liveness():
+    """The worker is running and able to answer; never touches dependencies"""
+    return jsonify({"status": "alive", "uptime": round(time.time() - STARTED_AT, 1)})
+
+@health_bp.route('/readyz', methods=['GET'])
+def readiness():
+    """The worker can serve traffic: database reachable, schema migrated, transcript journal not full"""
+    checks = {}
+    try:
+        db.session.execute(text("SELECT 1 FROM proposals LIMIT 1"))
+        checks["database"] = "ok"
+    except Exception as exc:
+        db.session.rollback()
+        checks["database"] = f"error: {exc.__class__.__name__}"
+    journal = transcript_journal.get_stats()
+    checks["transcript_journal"] = {
+        "pending": journal["pending"],
+        "full": journal["full"],
+        "refused": journal["refused"],
+        "last_error": journal["last_error"]
+    }
+
+    ready = checks["database"] == "ok" and not journal["full"]
+    return jsonify({"status": "ready" if ready else "unavailable", "checks": checks}), 200 if ready else 503
@@ -0,0 +1,202 @@
+"""
+Paginated and Streaming Listings for XMRT DAO
+Keyset pagination and NDJSON export for proposals, votes, transactions and chat
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Dict, List, Any, Iterator, Optional, Sequence, Tuple
+
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+from sqlalchemy import and_, or_
+
+from src.models.user import db
+from src.models.dao import Proposal, ProposalStatus, Vote, TreasuryTransaction, ChatMessage
+from src.models.serializers import encode_json, get_serializer
+from src.services.cache import response_cache
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+class InvalidCursorError(ValueError):
+    """The pagination cursor could not be decoded"""
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Opaque cursor pointing just past a row in (created_at, id) order"""
+    raw = json.dumps([created_at.isoformat(), row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Inverse of ``encode_cursor``"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError) as exc:
+        raise InvalidCursorError(f"Invalid cursor: {cursor}") from exc
+
+def _keyset_query(model, columns: Sequence[Any], filters: Sequence[Any], cursor: Optional[str],
+                  limit: int, newest_first: bool):
+    created_at, row_id = model.created_at, model.id
+    query = db.select(*columns).where(*filters)
+    if cursor is not None:
+        after_created_at, after_id = decode_cursor(cursor)
+        if newest_first:
+            query = query.where(or_(created_at < after_created_at,
+                                    and_(created_at == after_created_at, row_id < after_id)))
+        else:
+            query = query.where(or_(created_at > after_created_at,
+                                    and_(created_at == after_created_at, row_id > after_id)))
+    if newest_first:
+        query = query.order_by(created_at.desc(), row_id.desc())
+    else:
+        query = query.order_by(created_at, row_id)
+    return query.limit(limit + 1)
+
+def keyset_page(model, filters: Sequence[Any] = (), cursor: Optional[str] = None,
+                limit: int = DEFAULT_PAGE_SIZE, newest_first: bool = True) -> Dict[str, Any]:
+    """Fetch one page of rows ordered by (created_at, id)
+
+    Instead of OFFSET, the cursor carries the last row's sort key and the
+    next page starts with a ``WHERE (created_at, id) < (:ts, :id)`` seek on
+    the created_at indexes, so page 10,000 costs the same as page 1.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    query = _keyset_query(model, [model], filters, cursor, limit, newest_first)
+    rows = db.session.execute(query).scalars().all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return {
+        "items": [row.to_dict() for row in rows],
+        "next_cursor": encode_cursor(rows[-1].created_at, rows[-1].id) if has_more else None
+    }
+
+def keyset_page_json(model, filters: Sequence[Any] = (), cursor: Optional[str] = None,
+                     limit: int = DEFAULT_PAGE_SIZE, newest_first: bool = True) -> str:
+    """``keyset_page`` encoded as JSON through the model's fast serializer
+
+    Only the serialized columns are selected, as tuples, and written out
+    directly; the result is the same text as ``encode_json(keyset_page(...))``.
+    """
+    serializer = get_serializer(model)
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    query = _keyset_query(model, serializer.columns, filters, cursor, limit, newest_first)
+    rows = db.session.execute(query).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = None
+    if has_more:
+        last = rows[-1]
+        next_cursor = encode_cursor(last[serializer.index_of("created_at")], last[serializer.index_of("id")])
+    return '{"items":' + serializer.encode_array(rows) + ',"next_cursor":' + json.dumps(next_cursor) + "}"
+
+def stream_ndjson(model, filters: Sequence[Any] = (), chunk_size: int = 1000,
+                  fast: bool = False) -> Iterator[bytes]:
+    """Yield every matching row as one JSON line, reading through a server-side cursor
+
+    Rows are fetched ``chunk_size`` at a time with ``yield_per`` so memory
+    stays constant however large the table is. With ``fast`` the rows are
+    projected to the serialized columns and encoded without loading ORM
+    instances.
+    """
+    serializer = get_serializer(model) if fast else None
+    query = (
+        db.select(*(serializer.columns if fast else [model]))
+        .where(*filters)
+        .order_by(model.created_at, model.id)
+        .execution_options(yield_per=chunk_size)
+    )
+    result = db.session.execute(query)
+    if fast:
+        for partition in result.partitions():
+            yield "".join(line + "\n" for line in serializer.encode_rows(partition)).encode()
+    else:
+        for row in result.scalars():
+            yield encode_json(row.to_dict()).encode() + b"\n"
+
+def _proposal_filters(args) -> List[Any]:
+    filters = []
+    if args.get("status"):
+        filters.append(Proposal.status == ProposalStatus(args["status"]))
+    return filters
+
+def _vote_filters(args) -> List[Any]:
+    filters = []
+    if args.get("proposal_id"):
+        filters.append(Vote.proposal_id == int(args["proposal_id"]))
+    if args.get("voter_address"):
+        filters.append(Vote.voter_address == args["voter_address"])
+    return filters
+
+def _transaction_filters(args) -> List[Any]:
+    filters = []
+    if args.get("from_address"):
+        filters.append(TreasuryTransaction.from_address == args["from_address"])
+    if args.get("to_address"):
+        filters.append(TreasuryTransaction.to_address == args["to_address"])
+    return filters
+
+def _chat_filters(args) -> List[Any]:
+    filters = []
+    if args.get("session_id"):
+        filters.append(ChatMessage.session_id == args["session_id"])
+    if args.get("agent_name"):
+        filters.append(ChatMessage.agent_name == args["agent_name"])
+    return filters
+
+# Listable resources: model, query-string filter builder and default
+# serializer ("fast" column projection or the models' "dict" path)
+RESOURCES = {
+    "proposals": (Proposal, _proposal_filters, "dict"),
+    "votes": (Vote, _vote_filters, "fast"),
+    "transactions": (TreasuryTransaction, _transaction_filters, "fast"),
+    "chat": (ChatMessage, _chat_filters, "fast"),
+}
+
+def _use_fast_serializer(default: str) -> bool:
+    """Per-endpoint serializer choice, overridable with ?serializer=fast|dict"""
+    return request.args.get("serializer", default) == "fast"
+
+listing_bp = Blueprint('listing', __name__)
+
+def _cache_namespace(resource: str) -> Optional[str]:
+    """Pages are cached under their table, so writes to it invalidate them"""
+    return RESOURCES[resource][0].__tablename__ if resource in RESOURCES else None
+
+@listing_bp.route('/<resource>/page', methods=['GET'])
+@response_cache.cached(_cache_namespace)
+def list_page(resource):
+    """Keyset-paginated listing: ?cursor=&limit=&order=asc|desc plus resource filters"""
+    if resource not in RESOURCES:
+        return jsonify({"error": f"Unknown resource: {resource}"}), 404
+    model, build_filters, serializer = RESOURCES[resource]
+    fetch_page = keyset_page_json if _use_fast_serializer(serializer) else keyset_page
+    try:
+        page = fetch_page(
+            model,
+            filters=build_filters(request.args),
+            cursor=request.args.get("cursor"),
+            limit=request.args.get("limit", DEFAULT_PAGE_SIZE, type=int),
+            newest_first=request.args.get("order", "desc") != "asc"
+        )
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    if isinstance(page, dict):
+        page = encode_json(page)
+    return Response(page, mimetype="application/json")
+
+@listing_bp.route('/<resource>/export', methods=['GET'])
+def export_ndjson(resource):
+    """Stream every matching row as newline-delimited JSON"""
+    if resource not in RESOURCES:
+        return jsonify({"error": f"Unknown resource: {resource}"}), 404
+    model, build_filters, serializer = RESOURCES[resource]
+    try:
+        filters = build_filters(request.args)
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    return Response(
+        stream_with_context(stream_ndjson(model, filters, fast=_use_fast_serializer(serializer))),
+        mimetype="application/x-ndjson"
+    )
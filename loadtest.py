@@ -0,0 +1,149 @@
+"""
+HTTP Load Test for XMRT DAO
+Requests/sec and tail latency of the API blueprints per worker count
+
+    python -m src.loadtest --workers 1,2,4 --duration 15 --concurrency 32
+    python -m src.loadtest --url http://127.0.0.1:5000 --duration 15
+
+With ``--workers`` a gunicorn server is started from src/gunicorn.conf.py
+for each count; with ``--url`` an already running server is measured.
+"""
+
+import argparse
+import http.client
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from typing import Dict, List, Any, Optional
+from urllib.parse import urlsplit
+
+DEFAULT_PATHS = [
+    "/api/dao/proposals/page",
+    "/api/dao/votes/page",
+    "/api/dao/transactions/page?serializer=fast",
+    "/api/blockchain/token/info",
+    "/api/blockchain/network/stats",
+]
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+def run_load(base_url: str, paths: List[str], duration: float, concurrency: int) -> Dict[str, Dict[str, Any]]:
+    """Hit ``paths`` round-robin from ``concurrency`` keep-alive clients"""
+    parts = urlsplit(base_url)
+    latencies: Dict[str, List[float]] = {path: [] for path in paths}
+    errors: Dict[str, int] = {path: 0 for path in paths}
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def client(offset: int):
+        local: Dict[str, List[float]] = {path: [] for path in paths}
+        local_errors: Dict[str, int] = {path: 0 for path in paths}
+        connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+        index = offset
+        while time.monotonic() < deadline:
+            path = paths[index % len(paths)]
+            index += 1
+            started = time.perf_counter()
+            try:
+                connection.request("GET", path)
+                response = connection.getresponse()
+                response.read()
+                if response.status >= 400:
+                    local_errors[path] += 1
+                else:
+                    local[path].append(time.perf_counter() - started)
+            except (OSError, http.client.HTTPException):
+                local_errors[path] += 1
+                connection.close()
+                connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+        connection.close()
+        with lock:
+            for path in paths:
+                latencies[path].extend(local[path])
+                errors[path] += local_errors[path]
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    results = {}
+    for path in paths:
+        values = sorted(latencies[path])
+        results[path] = {
+            "requests": len(values),
+            "rps": round(len(values) / duration, 1),
+            "p50_ms": round(percentile(values, 0.50) * 1000, 2),
+            "p95_ms": round(percentile(values, 0.95) * 1000, 2),
+            "p99_ms": round(percentile(values, 0.99) * 1000, 2),
+            "errors": errors[path]
+        }
+    return results
+
+def wait_ready(base_url: str, timeout: float = 30) -> bool:
+    parts = urlsplit(base_url)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=2)
+            connection.request("GET", "/api/health/readyz")
+            if connection.getresponse().status == 200:
+                return True
+        except OSError:
+            pass
+        time.sleep(0.2)
+    return False
+
+def start_server(workers: int, port: int) -> subprocess.Popen:
+    """Start gunicorn with ``workers`` processes from the repository root"""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    config = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gunicorn.conf.py")
+    env = dict(os.environ, WEB_CONCURRENCY=str(workers), BIND=f"127.0.0.1:{port}", GUNICORN_ACCESS_LOG="")
+    return subprocess.Popen([sys.executable, "-m", "gunicorn", "-c", config], cwd=root, env=env)
+
+def print_results(label: str, results: Dict[str, Dict[str, Any]]):
+    print(f"\n{label}")
+    print(f"{'path':<46}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>8}")
+    for path, row in results.items():
+        print(f"{path:<46}{row['rps']:>9}{row['p50_ms']:>9}{row['p95_ms']:>9}{row['p99_ms']:>9}{row['errors']:>8}")
+    print(f"{'total':<46}{round(sum(row['rps'] for row in results.values()), 1):>9}")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", help="measure a running server instead of starting gunicorn")
+    parser.add_argument("--workers", default="1,2,4", help="comma-separated worker counts")
+    parser.add_argument("--port", type=int, default=5055)
+    parser.add_argument("--duration", type=float, default=15)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--path", action="append", dest="paths", help="path to request (repeatable)")
+    args = parser.parse_args(argv)
+    paths = args.paths or DEFAULT_PATHS
+
+    if args.url:
+        print_results(args.url, run_load(args.url, paths, args.duration, args.concurrency))
+        return 0
+
+    for workers in (int(count) for count in args.workers.split(",")):
+        base_url = f"http://127.0.0.1:{args.port}"
+        server = start_server(workers, args.port)
+        try:
+            if not wait_ready(base_url):
+                print(f"Server with {workers} workers did not become ready")
+                return 1
+            print_results(f"{workers} worker(s), {args.concurrency} clients",
+                          run_load(base_url, paths, args.duration, args.concurrency))
+        finally:
+            server.send_signal(signal.SIGTERM)
+            server.wait()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""
+Agent Load Test for XMRT DAO
+Latency of ElizaAgent.generate_response_async per number of concurrent sessions
+
+    python -m src.loadtest_agent [--sessions 1,8,64] [--duration 5] [--workers 4]
+
+Each session is a coroutine sending chat messages back to back, so the
+figures include queueing behind the agent's bounded worker pool.
+"""
+
+import argparse
+import asyncio
+import itertools
+import time
+from typing import Dict, List, Any, Optional
+
+from src.services.eliza_agent import AgentBusyError, AgentPersonality, ElizaAgent
+from src.loadtest import percentile
+
+MESSAGES = [
+    "what is the status of proposal #12?",
+    "how is the treasury allocation doing?",
+    "is there any security risk i should know about?",
+    "i support this proposal, please vote for it",
+    "explain how staking xmrt works in the dao",
+]
+
+async def run_sessions(agent: ElizaAgent, sessions: int, duration: float) -> Dict[str, Any]:
+    """Drive ``sessions`` concurrent chats for ``duration`` seconds"""
+    latencies: List[float] = []
+    busy = 0
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + duration
+
+    async def session(index: int):
+        nonlocal busy
+        messages = itertools.cycle(MESSAGES)
+        while loop.time() < deadline:
+            started = time.perf_counter()
+            try:
+                await agent.generate_response_async(next(messages), f"load-{sessions}-{index}", timeout=5)
+            except AgentBusyError:
+                busy += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(session(index) for index in range(sessions)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "busy": busy,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000
+    }
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", default="1,8,64", help="comma-separated concurrent session counts")
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--queue-size", type=int, default=256)
+    args = parser.parse_args(argv)
+
+    agent = ElizaAgent("Eliza-Load", AgentPersonality.GOVERNANCE,
+                       {"workers": args.workers, "queue_size": args.queue_size})
+    print(f"{'sessions':>8}{'requests':>10}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'busy':>7}")
+    try:
+        for sessions in (int(count) for count in args.sessions.split(",")):
+            result = asyncio.run(run_sessions(agent, sessions, args.duration))
+            print(f"{sessions:>8}{result['requests']:>10}{result['rps']:>10.0f}"
+                  f"{result['p50_ms']:>10.2f}{result['p99_ms']:>10.2f}{result['busy']:>7}")
+    finally:
+        agent.executor.shutdown()
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
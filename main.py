@@ -3,12 +3,19 @@ import sys
 # DON'T CHANGE THIS !!!
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from flask import Flask, send_from_directory
+from flask import Flask, jsonify
 from flask_cors import CORS
-from src.models.user import db
+from src.database import configure_database
 from src.routes.user import user_bp
 from src.routes.dao import dao_bp
 from src.routes.blockchain import blockchain_bp
+from src.routes.listing import listing_bp
+from src.routes.health import health_bp
+from src.services.eliza_agent import configure_transcript_journal, create_metrics_refresher
+from src.services.cache import response_cache
+from src.services.blockchain import get_blockchain_service
+from src.services.chain_indexer import create_chain_indexer
+from src.static_site import StaticSite
 
 app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
 app.config['SECRET_KEY'] = 'asdf#FGSgvasgf$5$WGT'
@@ -19,33 +26,57 @@ CORS(app)
 app.register_blueprint(user_bp, url_prefix='/api')
 app.register_blueprint(dao_bp, url_prefix='/api/dao')
 app.register_blueprint(blockchain_bp, url_prefix='/api/blockchain')
+app.register_blueprint(listing_bp, url_prefix='/api/dao')
+app.register_blueprint(health_bp, url_prefix='/api/health')
 
-# Database configuration
-app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(os.path.dirname(__file__), 'database', 'app.db')}"
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# Database configuration from DATABASE_URL; create or update the schema
+# with `python -m src.migrations upgrade` before serving
+configure_database(app, os.path.join(os.path.dirname(__file__), 'database', 'app.db'))
 
-# Initialize database
-db.init_app(app)
+# Background services are created here but only started by the WSGI worker
+# hooks (src/wsgi.py) or the development server below, so a preloading
+# gunicorn master never runs their threads.
 
-with app.app_context():
-    db.create_all()
+# Keep agent knowledge in sync with chain and DAO metrics in the background
+metrics_refresher = create_metrics_refresher(app)
+
+# Persist agent transcripts to chat_messages in batches, off the request path
+transcript_journal = configure_transcript_journal()
+
+# Follow contract logs into treasury_transactions. Every process may start
+# it, but only the holder of the indexer's lease indexes. Alternatively run
+# `python -m src.services.chain_indexer follow` as its own process.
+chain_indexer = create_chain_indexer() if os.environ.get('CHAIN_INDEXER_ENABLED', 'false').lower() == 'true' else None
+
+@app.route('/api/cache/stats')
+def cache_stats():
+    stats = response_cache.get_stats()
+    stats["chain_reads"] = get_blockchain_service().get_cache_stats()
+    return jsonify(stats)
+
+@app.route('/api/transactions/stats')
+def transaction_stats():
+    return jsonify(get_blockchain_service().get_transaction_stats())
+
+# Built frontend, indexed once; see src/static_site.py
+static_site = StaticSite(app.static_folder)
 
 @app.route('/', defaults={'path': ''})
 @app.route('/<path:path>')
 def serve(path):
-    static_folder_path = app.static_folder
-    if static_folder_path is None:
-            return "Static folder not configured", 404
-
-    if path != "" and os.path.exists(os.path.join(static_folder_path, path)):
-        return send_from_directory(static_folder_path, path)
-    else:
-        index_path = os.path.join(static_folder_path, 'index.html')
-        if os.path.exists(index_path):
-            return send_from_directory(static_folder_path, 'index.html')
-        else:
-            return "index.html not found", 404
+    if app.static_folder is None:
+        return "Static folder not configured", 404
+    return static_site.serve(path)
 
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    # Development server only; production runs `gunicorn -c src/gunicorn.conf.py`
+    import atexit
+
+    metrics_refresher.start()
+    transcript_journal.start(app)
+    atexit.register(transcript_journal.stop)
+    if chain_indexer is not None:
+        chain_indexer.start(app)
+    app.run(host=os.environ.get('HOST', '0.0.0.0'), port=int(os.environ.get('PORT', 5000)),
+            debug=os.environ.get('FLASK_DEBUG', '0') == '1')
@@ -0,0 +1,190 @@
+"""
+Schema Migrations for XMRT DAO
+Creates missing tables and indexes and guards the hot query plans
+"""
+
+import os
+import sys
+from typing import Dict, List, Any, Callable
+
+from datetime import datetime
+
+from sqlalchemy import and_, desc, func, inspect, or_, text
+
+from src.models.user import db
+from src.models.dao import Proposal, ProposalStatus, Vote, TreasuryTransaction, ChatMessage
+
+# Queries served on every page view, with representative parameters. Each of
+# them must be answered from an index rather than a full table scan.
+HOT_QUERIES: Dict[str, Callable[[], Any]] = {
+    "chat_session_history": lambda: (
+        db.select(ChatMessage)
+        .where(ChatMessage.session_id == "session")
+        .order_by(ChatMessage.created_at)
+    ),
+    "chat_session_restore": lambda: (
+        db.select(ChatMessage)
+        .where(ChatMessage.session_id == "session", ChatMessage.agent_name == "Eliza-Governance")
+        .order_by(desc(ChatMessage.created_at), desc(ChatMessage.id))
+        .limit(40)
+    ),
+    "votes_by_voter": lambda: (
+        db.select(Vote)
+        .where(Vote.voter_address == "0x0000000000000000000000000000000000000000")
+        .order_by(desc(Vote.created_at))
+    ),
+    "votes_by_proposal": lambda: (
+        db.select(Vote).where(Vote.proposal_id == 1)
+    ),
+    "active_proposals": lambda: (
+        db.select(Proposal)
+        .where(Proposal.status == ProposalStatus.ACTIVE, Proposal.voting_ends_at > func.current_timestamp())
+        .order_by(Proposal.voting_ends_at)
+    ),
+    "recent_proposals": lambda: (
+        db.select(Proposal).order_by(desc(Proposal.created_at)).limit(20)
+    ),
+    "ledger_from_address": lambda: (
+        db.select(TreasuryTransaction)
+        .where(TreasuryTransaction.from_address == "0x0000000000000000000000000000000000000000")
+        .order_by(desc(TreasuryTransaction.created_at))
+    ),
+    "ledger_to_address": lambda: (
+        db.select(TreasuryTransaction)
+        .where(TreasuryTransaction.to_address == "0x0000000000000000000000000000000000000000")
+        .order_by(desc(TreasuryTransaction.created_at))
+    ),
+    "ledger_block_range": lambda: (
+        db.select(TreasuryTransaction)
+        .where(TreasuryTransaction.block_number.between(1, 100))
+    ),
+    # Filtered listing pages as built by routes.listing: a (created_at, id)
+    # seek below the cursor, newest first
+    "proposals_by_status_page": lambda: (
+        db.select(Proposal)
+        .where(Proposal.status == ProposalStatus.ACTIVE,
+               or_(Proposal.created_at < datetime(2024, 1, 1),
+                   and_(Proposal.created_at == datetime(2024, 1, 1), Proposal.id < 100)))
+        .order_by(desc(Proposal.created_at), desc(Proposal.id))
+        .limit(51)
+    ),
+    "votes_by_proposal_page": lambda: (
+        db.select(Vote)
+        .where(Vote.proposal_id == 1,
+               or_(Vote.created_at < datetime(2024, 1, 1),
+                   and_(Vote.created_at == datetime(2024, 1, 1), Vote.id < 100)))
+        .order_by(desc(Vote.created_at), desc(Vote.id))
+        .limit(51)
+    ),
+    "recent_chat_messages": lambda: (
+        db.select(ChatMessage).order_by(desc(ChatMessage.created_at)).limit(50)
+    ),
+}
+
+def upgrade() -> List[str]:
+    """Create missing tables and indexes; return the names of created indexes"""
+    engine = db.engine
+    db.create_all()
+    existing_tables = set(inspect(engine).get_table_names())
+    created = []
+    for table in db.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        present = {index["name"] for index in inspect(engine).get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in present:
+                index.create(bind=engine)
+                created.append(index.name)
+    return created
+
+def explain(statement) -> List[str]:
+    """Return the database's query plan lines for a statement"""
+    engine = db.engine
+    sql = str(statement.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+    with engine.connect() as connection:
+        if engine.dialect.name == "sqlite":
+            rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")
+            return [row[-1] for row in rows]
+        if engine.dialect.name == "postgresql":
+            # Tiny tables make sequential scans cheapest, so only accept them
+            # when no index can answer the query at all
+            with connection.begin():
+                connection.execute(text("SET LOCAL enable_seqscan = off"))
+                rows = connection.exec_driver_sql(f"EXPLAIN {sql}")
+                return [row[0] for row in rows]
+    raise NotImplementedError(f"Query plans are not checked on {engine.dialect.name}")
+
+def is_table_scan(plan_line: str, ordered_scan_ok: bool = False) -> bool:
+    """Whether a plan line reads a whole table instead of searching an index
+
+    Walking a whole index just for its order is only accepted when
+    ``ordered_scan_ok`` is set, i.e. for unfiltered newest-first pages.
+    """
+    line = plan_line.strip()
+    if "Seq Scan" in line:
+        return True
+    if line.startswith("SCAN "):
+        return " USING " not in line or not ordered_scan_ok
+    return False
+
+def is_full_scan(plan: List[str], ordered_scan_ok: bool = False) -> bool:
+    """Whether a query plan reads a whole table or a whole index"""
+    if any(is_table_scan(line, ordered_scan_ok) for line in plan):
+        return True
+    # PostgreSQL: an index scan without an index condition walks the whole index
+    index_scan = any("Index Scan" in line or "Index Only Scan" in line for line in plan)
+    return index_scan and not ordered_scan_ok and not any("Index Cond:" in line for line in plan)
+
+def is_sorted_in_memory(plan: List[str]) -> bool:
+    """Whether a query plan sorts the matching rows instead of reading them in index order"""
+    return any("TEMP B-TREE FOR ORDER BY" in line or line.strip().lstrip("-> ").startswith("Sort ")
+               for line in plan)
+
+def find_table_scans() -> Dict[str, List[str]]:
+    """Explain every hot query and return those that fall back to a full scan
+
+    Pages (queries with a LIMIT) must also come out of an index in order: a
+    sort reads every matching row before the first page is returned.
+    """
+    regressions = {}
+    for name, build in HOT_QUERIES.items():
+        statement = build()
+        paged = statement._limit_clause is not None
+        ordered_scan_ok = statement.whereclause is None and paged
+        plan = explain(statement)
+        if is_full_scan(plan, ordered_scan_ok) or (paged and is_sorted_in_memory(plan)):
+            regressions[name] = plan
+    return regressions
+
+def create_app():
+    """Minimal app bound to the configured database, without background services"""
+    from flask import Flask
+    from src.database import configure_database
+
+    default_path = os.path.join(os.path.dirname(__file__), 'database', 'app.db')
+    os.makedirs(os.path.dirname(default_path), exist_ok=True)
+    app = Flask(__name__)
+    configure_database(app, default_path)
+    return app
+
+def main(argv: List[str]) -> int:
+    app = create_app()
+    command = argv[0] if argv else "upgrade"
+    with app.app_context():
+        if command == "upgrade":
+            created = upgrade()
+            print(f"Created indexes: {', '.join(created) if created else 'none'}")
+            return 0
+        if command == "check-plans":
+            regressions = find_table_scans()
+            for name, plan in regressions.items():
+                print(f"{name}: table scan")
+                for line in plan:
+                    print(f"    {line}")
+            print(f"{len(HOT_QUERIES) - len(regressions)}/{len(HOT_QUERIES)} hot queries use an index")
+            return 1 if regressions else 0
+    print(f"Unknown command: {command} (expected 'upgrade' or 'check-plans')")
+    return 2
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,451 @@
+"""
+JSON-RPC Transport for XMRT DAO
+Ethereum node access for the blockchain service
+"""
+
+import http.client
+import itertools
+import json
+import threading
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+class RpcError(Exception):
+    """The node answered a call with a JSON-RPC error"""
+
+    def __init__(self, code: int, message: str, data: Any = None):
+        super().__init__(f"RPC error {code}: {message}")
+        self.code = code
+        self.message = message
+        self.data = data
+
+class RpcTransportError(RpcError):
+    """No answer from the node; the request may or may not have reached it"""
+
+    def __init__(self, message: str):
+        super().__init__(-32603, message)
+
+# Calls with side effects: replaying one after a lost reply could act twice,
+# so they are never retried or failed over
+NON_RETRYABLE_METHODS = frozenset({"eth_sendRawTransaction", "eth_sendTransaction"})
+
+class JsonRpcClient:
+    """Synchronous JSON-RPC client over a single keep-alive HTTP connection
+
+    ``batch`` sends many calls in one HTTP round trip as a JSON-RPC batch
+    and returns their results in the order given, whatever order the node
+    answers in. A request whose connection fails is resent once on a fresh
+    connection, unless it contains one of ``NON_RETRYABLE_METHODS``.
+    """
+
+    def __init__(self, url: str, timeout: float = 10.0, headers: Dict[str, str] = None):
+        self.url = url
+        self.timeout = timeout
+        parts = urlsplit(url)
+        self._https = parts.scheme == "https"
+        self._host = parts.hostname
+        self._port = parts.port
+        self._path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        self._headers = {"Content-Type": "application/json", **(headers or {})}
+        self._connection = None
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self.stats = {"round_trips": 0, "calls": 0}
+
+    def _connect(self) -> http.client.HTTPConnection:
+        connection_class = http.client.HTTPSConnection if self._https else http.client.HTTPConnection
+        return connection_class(self._host, self._port, timeout=self.timeout)
+
+    def _post(self, payload: Any, retry: bool = True) -> Any:
+        body = json.dumps(payload).encode()
+        with self._lock:
+            for attempt in range(2 if retry else 1):
+                if self._connection is None:
+                    self._connection = self._connect()
+                try:
+                    self._connection.request("POST", self._path, body, self._headers)
+                    response = self._connection.getresponse()
+                    data = response.read()
+                    break
+                except (OSError, http.client.HTTPException) as exc:
+                    # The node may have closed an idle keep-alive connection
+                    self._connection.close()
+                    self._connection = None
+                    if attempt or not retry:
+                        raise RpcTransportError(f"Request to {self.url} failed: {exc!r}") from exc
+            self.stats["round_trips"] += 1
+        if response.status != 200:
+            raise RpcError(response.status, f"HTTP {response.status}: {data[:200]!r}")
+        return json.loads(data)
+
+    @staticmethod
+    def _result(reply: Dict[str, Any]) -> Any:
+        if "error" in reply:
+            error = reply["error"]
+            raise RpcError(error.get("code", 0), error.get("message", ""), error.get("data"))
+        return reply.get("result")
+
+    def call(self, method: str, params: Sequence[Any] = ()) -> Any:
+        """Send a single call"""
+        self.stats["calls"] += 1
+        return self._result(self._post({"jsonrpc": "2.0", "id": next(self._ids), "method": method,
+                                        "params": list(params)}, retry=method not in NON_RETRYABLE_METHODS))
+
+    def batch(self, calls: Sequence[Tuple[str, Sequence[Any]]]) -> List[Any]:
+        """Send several calls in one round trip; results follow the input order"""
+        if not calls:
+            return []
+        ids = [next(self._ids) for _ in calls]
+        self.stats["calls"] += len(calls)
+        replies = self._post([
+            {"jsonrpc": "2.0", "id": call_id, "method": method, "params": list(params)}
+            for call_id, (method, params) in zip(ids, calls)
+        ], retry=not any(method in NON_RETRYABLE_METHODS for method, _ in calls))
+        if isinstance(replies, dict):
+            # Nodes reject a malformed batch with a single error object
+            self._result(replies)
+        by_id = {reply.get("id"): reply for reply in replies}
+        missing = [call_id for call_id in ids if call_id not in by_id]
+        if missing:
+            raise RpcError(-32603, f"No reply for batch ids {missing}")
+        return [self._result(by_id[call_id]) for call_id in ids]
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+class _HttpConnection:
+    """One keep-alive HTTP/1.1 connection driven by asyncio streams"""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.reusable = True
+
+    async def post(self, host: str, path: str, body: bytes, headers: Dict[str, str]) -> Tuple[int, bytes]:
+        head = [f"POST {path} HTTP/1.1", f"Host: {host}", f"Content-Length: {len(body)}", "Connection: keep-alive"]
+        head += [f"{name}: {value}" for name, value in headers.items()]
+        self.writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + body)
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError("Connection closed by node")
+        status = int(status_line.split()[1])
+        length, chunked = None, False
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            name, value = name.strip().lower(), value.strip()
+            if name == "content-length":
+                length = int(value)
+            elif name == "transfer-encoding" and "chunked" in value.lower():
+                chunked = True
+            elif name == "connection" and value.lower() == "close":
+                self.reusable = False
+
+        if chunked:
+            parts = []
+            while True:
+                size = int((await self.reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    await self.reader.readline()
+                    break
+                parts.append(await self.reader.readexactly(size))
+                await self.reader.readline()
+            data = b"".join(parts)
+        elif length is not None:
+            data = await self.reader.readexactly(length)
+        else:
+            data = await self.reader.read()
+            self.reusable = False
+        return status, data
+
+    def close(self):
+        self.reusable = False
+        self.writer.close()
+
+class _RetryableError(Exception):
+    """Transport failure or overloaded node; the request may go elsewhere"""
+
+class RpcEndpoint:
+    """A node URL with its own connection pool, concurrency limit and health"""
+
+    def __init__(self, url: str, max_concurrency: int, headers: Dict[str, str]):
+        parts = urlsplit(url)
+        self.url = url
+        self.ssl = parts.scheme == "https"
+        self.host = parts.hostname
+        self.port = parts.port or (443 if self.ssl else 80)
+        self.path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        self.headers = {"Content-Type": "application/json", **headers}
+        self.max_concurrency = max_concurrency
+        self._semaphore = None
+        self._idle: List[_HttpConnection] = []
+        self.consecutive_failures = 0
+        self.down_until = 0.0
+        self.stats = {"requests": 0, "failures": 0, "connections_opened": 0}
+
+    @property
+    def semaphore(self):
+        import asyncio
+
+        # Created on first use so it binds to the running loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def post(self, body: bytes) -> bytes:
+        import asyncio
+
+        async with self.semaphore:
+            if self._idle:
+                connection = self._idle.pop()
+            else:
+                reader, writer = await asyncio.open_connection(self.host, self.port, ssl=self.ssl or None)
+                connection = _HttpConnection(reader, writer)
+                self.stats["connections_opened"] += 1
+            self.stats["requests"] += 1
+            try:
+                status, data = await connection.post(self.host, self.path, body, self.headers)
+            except BaseException:
+                connection.close()
+                raise
+            if connection.reusable:
+                self._idle.append(connection)
+            else:
+                connection.close()
+        if status == 429 or status >= 500:
+            raise _RetryableError(f"HTTP {status} from {self.url}")
+        if status != 200:
+            raise RpcError(status, f"HTTP {status}: {data[:200]!r}")
+        return data
+
+    def close(self):
+        while self._idle:
+            self._idle.pop().close()
+
+class AsyncRpcClient:
+    """asyncio JSON-RPC client with pooling, pipelining and failover
+
+    - Each endpoint keeps a pool of keep-alive connections and allows at
+      most ``max_concurrency`` requests in flight.
+    - Calls issued within ``batch_window`` seconds of each other are
+      pipelined into one JSON-RPC batch of up to ``max_batch`` calls.
+    - Transport errors, timeouts, HTTP 429 and 5xx are retried up to
+      ``retries`` times with full-jitter exponential backoff.
+    - Endpoints are tried in the configured order. One that fails
+      ``failure_threshold`` times in a row is skipped for ``cooldown``
+      seconds, so traffic fails over to the next endpoint.
+    - Calls to ``non_retryable`` methods are pipelined only with each other
+      and sent exactly once: the first transport error is raised as
+      ``RpcTransportError``, since the node may have acted on the request.
+    JSON-RPC errors come from the node itself and are raised, not retried.
+    """
+
+    def __init__(self, urls: Sequence[str], max_concurrency: int = 16, timeout: float = 10.0,
+                 retries: int = 3, backoff: float = 0.1, max_backoff: float = 2.0,
+                 failure_threshold: int = 3, cooldown: float = 30.0,
+                 batch_window: float = 0.002, max_batch: int = 100, headers: Dict[str, str] = None,
+                 non_retryable: Sequence[str] = NON_RETRYABLE_METHODS):
+        if not urls:
+            raise ValueError("At least one RPC endpoint is required")
+        self.endpoints = [RpcEndpoint(url, max_concurrency, headers or {}) for url in urls]
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.non_retryable = frozenset(non_retryable)
+        self._ids = itertools.count(1)
+        self._pending: List[Tuple[int, str, Sequence[Any], Any]] = []
+        self._flush_handle = None
+        self.stats = {"round_trips": 0, "calls": 0, "retries": 0, "failovers": 0}
+
+    def _pick_endpoint(self, now: float, avoid: Optional[RpcEndpoint] = None) -> RpcEndpoint:
+        healthy = [endpoint for endpoint in self.endpoints if endpoint.down_until <= now]
+        # A retry goes to another healthy endpoint when there is one
+        for endpoint in healthy:
+            if endpoint is not avoid:
+                return endpoint
+        if healthy:
+            return healthy[0]
+        # Every endpoint is cooling down: use the one that recovers first
+        return min(self.endpoints, key=lambda endpoint: endpoint.down_until)
+
+    async def _send(self, payload: Any, retry: bool = True) -> Any:
+        import asyncio
+        import random
+
+        body = json.dumps(payload).encode()
+        loop = asyncio.get_running_loop()
+        failed = None
+        attempts = self.retries + 1 if retry else 1
+        for attempt in range(attempts):
+            endpoint = self._pick_endpoint(loop.time(), avoid=failed)
+            if failed is not None and endpoint is not failed:
+                self.stats["failovers"] += 1
+            try:
+                data = await asyncio.wait_for(endpoint.post(body), self.timeout)
+            except (_RetryableError, OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError) as exc:
+                failed = endpoint
+                endpoint.stats["failures"] += 1
+                endpoint.consecutive_failures += 1
+                if endpoint.consecutive_failures >= self.failure_threshold:
+                    endpoint.down_until = loop.time() + self.cooldown
+                if not retry:
+                    raise RpcTransportError(f"Request to {endpoint.url} failed, not retried: {exc!r}") from exc
+                if attempt == attempts - 1:
+                    raise RpcTransportError(f"All attempts failed, last: {exc!r}") from exc
+                self.stats["retries"] += 1
+                await asyncio.sleep(random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt)))
+                continue
+            endpoint.consecutive_failures = 0
+            endpoint.down_until = 0.0
+            self.stats["round_trips"] += 1
+            return json.loads(data)
+
+    async def call(self, method: str, params: Sequence[Any] = ()) -> Any:
+        """Send one call, pipelined with any issued in the same batch window"""
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((next(self._ids), method, params, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_window, self._flush)
+        return await future
+
+    def _flush(self):
+        import asyncio
+
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        pending, self._pending = self._pending, []
+        if pending:
+            asyncio.ensure_future(self._dispatch(pending))
+
+    async def _dispatch(self, pending: List[Tuple[int, str, Sequence[Any], Any]]):
+        import asyncio
+
+        once = [call for call in pending if call[1] in self.non_retryable]
+        if not once:
+            return await self._dispatch_group(pending, retry=True)
+        # A retried batch would replay the calls with side effects in it
+        others = [call for call in pending if call[1] not in self.non_retryable]
+        await asyncio.gather(self._dispatch_group(once, retry=False), self._dispatch_group(others, retry=True))
+
+    async def _dispatch_group(self, pending: List[Tuple[int, str, Sequence[Any], Any]], retry: bool):
+        if not pending:
+            return
+        self.stats["calls"] += len(pending)
+        try:
+            if len(pending) == 1:
+                call_id, method, params, _ = pending[0]
+                replies = [await self._send({"jsonrpc": "2.0", "id": call_id, "method": method,
+                                             "params": list(params)}, retry)]
+            else:
+                replies = await self._send([
+                    {"jsonrpc": "2.0", "id": call_id, "method": method, "params": list(params)}
+                    for call_id, method, params, _ in pending
+                ], retry)
+                if isinstance(replies, dict):
+                    replies = [dict(replies, id=call_id) for call_id, _, _, _ in pending]
+        except Exception as exc:
+            for _, _, _, future in pending:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        by_id = {reply.get("id"): reply for reply in replies}
+        for call_id, _, _, future in pending:
+            if future.done():
+                continue
+            reply = by_id.get(call_id)
+            try:
+                if reply is None:
+                    raise RpcError(-32603, f"No reply for id {call_id}")
+                future.set_result(JsonRpcClient._result(reply))
+            except RpcError as exc:
+                future.set_exception(exc)
+
+    async def batch(self, calls: Sequence[Tuple[str, Sequence[Any]]]) -> List[Any]:
+        """Send calls concurrently; results follow the input order"""
+        import asyncio
+
+        return list(await asyncio.gather(*(self.call(method, params) for method, params in calls)))
+
+    async def close(self):
+        for endpoint in self.endpoints:
+            endpoint.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "endpoints": [
+                {"url": endpoint.url, "healthy": endpoint.consecutive_failures < self.failure_threshold,
+                 "idle_connections": len(endpoint._idle), **endpoint.stats}
+                for endpoint in self.endpoints
+            ]
+        }
+
+class PooledRpcClient:
+    """Synchronous facade over ``AsyncRpcClient`` for Flask request threads
+
+    The client runs on a private event loop thread, started on first use
+    and restarted in a forked worker, so every request thread shares the
+    same pools. It exposes the same ``call``/``batch`` interface as
+    ``JsonRpcClient``.
+    """
+
+    def __init__(self, urls: Sequence[str], **options: Any):
+        self.urls = list(urls)
+        self.options = options
+        self._lock = threading.Lock()
+        self._loop = None
+        self._client: AsyncRpcClient = None
+        self._pid = None
+
+    def _ensure_started(self):
+        import asyncio
+        import os
+
+        with self._lock:
+            if self._loop is not None and self._pid == os.getpid():
+                return
+            self._loop = asyncio.new_event_loop()
+            self._client = AsyncRpcClient(self.urls, **self.options)
+            self._pid = os.getpid()
+            threading.Thread(target=self._loop.run_forever, name="rpc-client", daemon=True).start()
+
+    def _run(self, coroutine) -> Any:
+        import asyncio
+
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def call(self, method: str, params: Sequence[Any] = ()) -> Any:
+        self._ensure_started()
+        return self._run(self._client.call(method, params))
+
+    def batch(self, calls: Sequence[Tuple[str, Sequence[Any]]]) -> List[Any]:
+        self._ensure_started()
+        return self._run(self._client.batch(calls))
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        return self._client.get_stats() if self._client is not None else {}
+
+    def close(self):
+        if self._loop is not None:
+            self._run(self._client.close())
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop = None
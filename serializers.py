@@ -0,0 +1,159 @@
+"""
+Fast Row Serialization for XMRT DAO
+Column-projected JSON encoding matching the models' to_dict() output
+"""
+
+import json
+from datetime import datetime
+from json.encoder import encode_basestring_ascii
+from typing import Dict, Any, Callable, Iterable, Iterator, Sequence, Tuple
+
+from src.models.dao import Proposal, Vote, AIAgent, TreasuryTransaction, ChatMessage
+
+# Separators used for every JSON document produced from model rows, so the
+# to_dict() path and the fast path emit the same bytes
+JSON_SEPARATORS = (",", ":")
+
+def encode_json(data: Dict[str, Any]) -> str:
+    """Reference JSON encoding of to_dict() results and the documents built from them"""
+    return json.dumps(data, separators=JSON_SEPARATORS)
+
+def _encode_int(value: Any) -> str:
+    return "null" if value is None else str(int(value))
+
+def _encode_str(value: Any) -> str:
+    return "null" if value is None else encode_basestring_ascii(value)
+
+def _encode_bool(value: Any) -> str:
+    if value is None:
+        return "null"
+    return "true" if value else "false"
+
+def _encode_enum(value: Any) -> str:
+    return "null" if value is None else encode_basestring_ascii(value.value)
+
+class _DatetimeEncoder:
+    """isoformat() with a bounded memo, since listings repeat timestamps heavily"""
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._cache: Dict[datetime, str] = {}
+
+    def __call__(self, value: Any) -> str:
+        if value is None:
+            return "null"
+        encoded = self._cache.get(value)
+        if encoded is None:
+            if len(self._cache) >= self.max_entries:
+                self._cache.clear()
+            encoded = self._cache[value] = '"' + value.isoformat() + '"'
+        return encoded
+
+_ENCODERS: Dict[str, Callable[[Any], str]] = {
+    "int": _encode_int,
+    "str": _encode_str,
+    "bool": _encode_bool,
+    "enum": _encode_enum,
+    "datetime": _DatetimeEncoder(),
+}
+
+class RowSerializer:
+    """Encodes projected column tuples straight to JSON
+
+    ``fields`` lists (output key, column name, kind) in ``to_dict()`` order.
+    Keys are pre-encoded once per model, rows are selected as plain tuples
+    of only those columns, and each value goes through a per-kind encoder,
+    so no ORM instance or intermediate dict is built per row.
+    """
+
+    def __init__(self, model, fields: Sequence[Tuple[str, str, str]]):
+        self.model = model
+        self.fields = tuple(fields)
+        self.columns = [getattr(model, column) for _, column, _ in self.fields]
+        self._plan = [
+            (("{" if index == 0 else ",") + encode_basestring_ascii(key) + ":", _ENCODERS[kind])
+            for index, (key, _, kind) in enumerate(self.fields)
+        ]
+
+    def index_of(self, column: str) -> int:
+        """Position of a column in the projected tuples"""
+        for index, (_, name, _) in enumerate(self.fields):
+            if name == column:
+                return index
+        raise KeyError(column)
+
+    def encode_row(self, row: Sequence[Any]) -> str:
+        """Encode one projected row as a JSON object"""
+        parts = []
+        for (prefix, encode), value in zip(self._plan, row):
+            parts.append(prefix)
+            parts.append(encode(value))
+        parts.append("}")
+        return "".join(parts)
+
+    def encode_rows(self, rows: Iterable[Sequence[Any]]) -> Iterator[str]:
+        """Encode many projected rows"""
+        encode_row = self.encode_row
+        for row in rows:
+            yield encode_row(row)
+
+    def encode_array(self, rows: Iterable[Sequence[Any]]) -> str:
+        """Encode rows as a JSON array"""
+        return "[" + ",".join(self.encode_rows(rows)) + "]"
+
+SERIALIZERS: Dict[Any, RowSerializer] = {
+    Proposal: RowSerializer(Proposal, [
+        ("id", "id", "int"),
+        ("title", "title", "str"),
+        ("description", "description", "str"),
+        ("status", "status", "enum"),
+        ("votes_for", "votes_for", "int"),
+        ("votes_against", "votes_against", "int"),
+        ("total_votes", "total_votes", "int"),
+        ("created_at", "created_at", "datetime"),
+        ("voting_ends_at", "voting_ends_at", "datetime"),
+        ("ai_recommendation", "ai_recommendation", "str"),
+        ("creator_address", "creator_address", "str"),
+    ]),
+    Vote: RowSerializer(Vote, [
+        ("id", "id", "int"),
+        ("proposal_id", "proposal_id", "int"),
+        ("voter_address", "voter_address", "str"),
+        ("vote_choice", "vote_choice", "bool"),
+        ("vote_weight", "vote_weight", "int"),
+        ("created_at", "created_at", "datetime"),
+    ]),
+    AIAgent: RowSerializer(AIAgent, [
+        ("id", "id", "int"),
+        ("name", "name", "str"),
+        ("type", "agent_type", "enum"),
+        ("status", "status", "str"),
+        ("last_action", "last_action", "str"),
+        ("performance", "performance_score", "int"),
+        ("created_at", "created_at", "datetime"),
+        ("last_active", "last_active", "datetime"),
+    ]),
+    TreasuryTransaction: RowSerializer(TreasuryTransaction, [
+        ("id", "id", "int"),
+        ("hash", "transaction_hash", "str"),
+        ("type", "transaction_type", "str"),
+        ("description", "description", "str"),
+        ("amount", "amount", "str"),
+        ("from_address", "from_address", "str"),
+        ("to_address", "to_address", "str"),
+        ("block_number", "block_number", "int"),
+        ("created_at", "created_at", "datetime"),
+    ]),
+    ChatMessage: RowSerializer(ChatMessage, [
+        ("id", "id", "int"),
+        ("session_id", "session_id", "str"),
+        ("agent_name", "agent_name", "str"),
+        ("type", "message_type", "str"),
+        ("content", "content", "str"),
+        ("timestamp", "created_at", "datetime"),
+    ]),
+}
+
+def get_serializer(model) -> RowSerializer:
+    """Fast serializer registered for a model"""
+    return SERIALIZERS[model]
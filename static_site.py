@@ -0,0 +1,177 @@
+"""
+Static Site Serving for XMRT DAO
+In-memory manifest of the built frontend with precompressed variants
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from flask import Response, request
+from werkzeug.wsgi import wrap_file
+
+# Vite emits content-hashed names such as assets/index-Bcjdok3u.js; those
+# files never change, so browsers may keep them forever. Files copied from
+# public/ (apple-touch-icon.png, hero-background.jpg) keep their names.
+HASHED_ASSET = re.compile(
+    r"^assets/(?:[^/]+/)*[^/]+-[A-Za-z0-9_-]{8}\.(?:js|mjs|css|woff2?|ttf|svg|png|jpe?g|gif|webp|avif|ico)(?:\.map)?$"
+)
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE = "no-cache"
+
+# Content-Encoding of each precompressed sidecar suffix
+ENCODINGS = {".br": "br", ".gz": "gzip"}
+
+@dataclass
+class StaticVariant:
+    """One stored representation of a file"""
+    path: str
+    size: int
+    etag: str
+    body: Optional[bytes] = None
+
+@dataclass
+class StaticFile:
+    """Manifest entry for a file and its precompressed variants"""
+    mimetype: str
+    cache_control: str
+    last_modified: float
+    variants: Dict[str, StaticVariant] = field(default_factory=dict)
+
+class StaticSite:
+    """Serves a static folder from a manifest built once at startup
+
+    Paths, types, ETags and cache policy are resolved in memory, bodies up
+    to ``max_inline_bytes`` are kept in memory, and any unknown path falls
+    back to the SPA's ``index.html`` without a filesystem lookup. Clients
+    get the ``.br`` or ``.gz`` sidecar their Accept-Encoding allows, with
+    conditional and range requests handled by Werkzeug.
+    """
+
+    def __init__(self, folder: Optional[str], index: str = "index.html", max_inline_bytes: int = 2 * 1024 * 1024):
+        self.folder = folder
+        self.index = index
+        self.max_inline_bytes = max_inline_bytes
+        self.files: Dict[str, StaticFile] = {}
+        if folder and os.path.isdir(folder):
+            self.files = self._build_manifest(folder)
+
+    def _build_manifest(self, folder: str) -> Dict[str, StaticFile]:
+        files: Dict[str, StaticFile] = {}
+        sidecars: List[str] = []
+        for root, _, names in os.walk(folder):
+            for name in names:
+                relative = os.path.relpath(os.path.join(root, name), folder).replace(os.sep, "/")
+                if os.path.splitext(relative)[1] in ENCODINGS:
+                    sidecars.append(relative)
+                    continue
+                path = os.path.join(folder, relative)
+                mimetype = mimetypes.guess_type(relative)[0] or "application/octet-stream"
+                files[relative] = StaticFile(
+                    mimetype=mimetype,
+                    cache_control=IMMUTABLE_CACHE if HASHED_ASSET.search(relative) else REVALIDATE_CACHE,
+                    last_modified=os.path.getmtime(path),
+                    variants={"identity": self._load_variant(path, "")}
+                )
+        for relative in sidecars:
+            original, suffix = os.path.splitext(relative)
+            if original in files:
+                encoding = ENCODINGS[suffix]
+                files[original].variants[encoding] = self._load_variant(os.path.join(folder, relative), encoding)
+        return files
+
+    def _load_variant(self, path: str, encoding: str) -> StaticVariant:
+        with open(path, "rb") as handle:
+            body = handle.read()
+        etag = hashlib.sha1(body).hexdigest()[:20] + (f"-{encoding}" if encoding else "")
+        return StaticVariant(
+            path=path,
+            size=len(body),
+            etag=etag,
+            body=body if len(body) <= self.max_inline_bytes else None
+        )
+
+    def _choose_variant(self, entry: StaticFile) -> str:
+        if len(entry.variants) == 1:
+            return "identity"
+        accepted = request.accept_encodings
+        for encoding in ("br", "gzip"):
+            if encoding in entry.variants and accepted[encoding]:
+                return encoding
+        return "identity"
+
+    def serve(self, path: str) -> Response:
+        """Response for a request path, falling back to the SPA index"""
+        entry = self.files.get(path)
+        if entry is None:
+            entry = self.files.get(self.index)
+            if entry is None:
+                return Response(f"{self.index} not found", status=404)
+
+        encoding = self._choose_variant(entry)
+        variant = entry.variants[encoding]
+        if variant.body is not None:
+            response = Response(variant.body, mimetype=entry.mimetype)
+        else:
+            response = Response(wrap_file(request.environ, open(variant.path, "rb")),
+                                mimetype=entry.mimetype, direct_passthrough=True)
+        response.content_length = variant.size
+        if encoding != "identity":
+            response.content_encoding = encoding
+        if len(entry.variants) > 1:
+            response.vary.add("Accept-Encoding")
+        response.set_etag(variant.etag)
+        response.last_modified = entry.last_modified
+        response.headers["Cache-Control"] = entry.cache_control
+        return response.make_conditional(request, accept_ranges=True, complete_length=variant.size)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "files": len(self.files),
+            "precompressed": sum(1 for entry in self.files.values() if len(entry.variants) > 1),
+            "inline_bytes": sum(
+                variant.size
+                for entry in self.files.values()
+                for variant in entry.variants.values()
+                if variant.body is not None
+            )
+        }
+
+COMPRESSIBLE = re.compile(r"\.(js|mjs|css|html|json|svg|map|txt|xml|ico)$")
+
+def precompress(folder: str, min_size: int = 1024) -> List[str]:
+    """Write .gz (and .br when the brotli package is available) next to compressible files"""
+    try:
+        import brotli
+    except ImportError:
+        brotli = None
+    written = []
+    for root, _, names in os.walk(folder):
+        for name in names:
+            if not COMPRESSIBLE.search(name):
+                continue
+            path = os.path.join(root, name)
+            with open(path, "rb") as handle:
+                body = handle.read()
+            if len(body) < min_size:
+                continue
+            outputs = {".gz": gzip.compress(body, compresslevel=9, mtime=0)}
+            if brotli is not None:
+                outputs[".br"] = brotli.compress(body, quality=11)
+            for suffix, compressed in outputs.items():
+                # Only keep variants that actually save bytes
+                if len(compressed) < len(body):
+                    with open(path + suffix, "wb") as handle:
+                        handle.write(compressed)
+                    written.append(path + suffix)
+    return written
+
+if __name__ == "__main__":
+    target = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(__file__), "static")
+    for written_path in precompress(target):
+        print(written_path)
@@ -0,0 +1,66 @@
+"""
+Agent Registry Tests for XMRT DAO
+Agents are built on first lookup, once, and unknown tenants share the global instance
+"""
+
+import threading
+
+from src.services.eliza_agent import AgentRegistry
+
+class CountingFactory:
+    """Builds a new object per call and counts the calls"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return object()
+
+def test_agent_is_built_on_first_lookup_only():
+    registry, factory = AgentRegistry(), CountingFactory()
+    registry.register("Eliza-Governance", factory)
+    assert factory.calls == 0
+    assert registry.get_stats() == {"Eliza-Governance": {"loaded": False, "loads": 0}}
+    agent = registry.get("Eliza-Governance")
+    assert registry.get("Eliza-Governance") is agent
+    assert factory.calls == 1
+    assert registry.get_stats() == {"Eliza-Governance": {"loaded": True, "loads": 2}}
+    assert registry.get("Eliza-Unknown") is None
+
+def test_unknown_tenants_share_the_global_instance():
+    registry, factory = AgentRegistry(), CountingFactory()
+    registry.register("Eliza-Governance", factory)
+    agent = registry.get("Eliza-Governance")
+    for tenant in ("acme", "globex", "initech"):
+        assert registry.get("Eliza-Governance", tenant) is agent
+    assert factory.calls == 1
+    assert len(registry.loaded_agents()) == 1
+    assert registry.get_stats()["Eliza-Governance"]["loads"] == 4
+
+def test_tenant_factory_builds_its_own_instance():
+    registry, shared, own = AgentRegistry(), CountingFactory(), CountingFactory()
+    registry.register("Eliza-Governance", shared)
+    registry.register("Eliza-Governance", own, tenant="acme")
+    assert registry.get("Eliza-Governance", "acme") is not registry.get("Eliza-Governance")
+    assert (shared.calls, own.calls) == (1, 1)
+    assert registry.get_stats()["acme/Eliza-Governance"] == {"loaded": True, "loads": 1}
+
+def test_concurrent_lookups_build_once_and_count_every_load():
+    registry, factory = AgentRegistry(), CountingFactory()
+    registry.register("Eliza-Governance", factory)
+    start = threading.Barrier(8)
+    agents = []
+
+    def lookup():
+        start.wait()
+        agents.extend(registry.get("Eliza-Governance", f"tenant-{index}") for index in range(500))
+
+    threads = [threading.Thread(target=lookup) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert factory.calls == 1
+    assert len({id(agent) for agent in agents}) == 1
+    assert registry.get_stats()["Eliza-Governance"]["loads"] == 8 * 500
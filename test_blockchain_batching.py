@@ -0,0 +1,50 @@
+"""
+Blockchain Batching Tests for XMRT DAO
+Bulk token reads cost one round trip per chunk and keep input order
+"""
+
+from decimal import Decimal
+
+import pytest
+
+from src.services.blockchain import BlockchainService
+from src.services.rpc import JsonRpcClient
+
+ADDRESSES = [f"0x{index:040x}" for index in range(250, 0, -1)]
+
+@pytest.fixture
+def service(node):
+    client = JsonRpcClient(node.url)
+    yield BlockchainService(client, batch_size=100, multicall_size=100)
+    client.close()
+
+def _tokens(wei: int) -> str:
+    return f"{(Decimal(wei) / Decimal(10) ** 18).normalize():f}"
+
+@pytest.mark.parametrize("use_multicall", [False, True])
+def test_balances_in_input_order(node, service, use_multicall):
+    balances = service.get_balances(ADDRESSES, use_multicall=use_multicall)
+    assert [balance["address"] for balance in balances] == ADDRESSES
+    assert [balance["balance_wei"] for balance in balances] == [str(node.balance_of(address)) for address in ADDRESSES]
+    assert balances[0]["balance"] == _tokens(node.balance_of(ADDRESSES[0]))
+    # 250 addresses in chunks of 100
+    assert node.round_trips == 3
+    assert node.methods["eth_call"] == (3 if use_multicall else 250)
+
+@pytest.mark.parametrize("use_multicall", [False, True])
+def test_staking_infos_in_input_order(node, service, use_multicall):
+    infos = service.get_staking_infos(ADDRESSES, chunk_size=50, use_multicall=use_multicall)
+    assert [info["address"] for info in infos] == ADDRESSES
+    assert [info["staked_amount"] for info in infos] == [_tokens(node.balance_of(address) // 2) for address in ADDRESSES]
+    assert {info["rewards_earned"] for info in infos} == {"1"}
+    assert node.round_trips == 5
+
+def test_single_reads_match_bulk_reads(node, service):
+    address = ADDRESSES[7]
+    assert service.get_balance(address) == service.get_balances([address])[0]
+    assert service.get_staking_info(address) == service.get_staking_infos([address])[0]
+
+def test_empty_input_sends_nothing(node, service):
+    assert service.get_balances([]) == []
+    assert service.get_staking_infos([], use_multicall=True) == []
+    assert node.round_trips == 0
@@ -0,0 +1,75 @@
+"""
+Chain Read Cache Tests for XMRT DAO
+One RPC per read per block, and nothing empty memoized for good
+"""
+
+import threading
+
+from src.services.blockchain import BlockchainService
+from src.services.chain_cache import ChainReadCache
+from src.services.rpc import JsonRpcClient
+
+TX_HASH = "0x" + "aa" * 32
+BLOCK_HASH = "0x" + "bb" * 32
+
+def test_concurrent_reads_share_one_fetch():
+    fetches = []
+    release = threading.Event()
+
+    def fetch(block):
+        fetches.append(block)
+        release.wait(1)
+        return block * 2
+
+    cache = ChainReadCache(lambda: 7, head_ttl=60)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get("read", (), fetch))) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert results == [14] * 20
+    assert fetches == [7]
+    cache.on_new_head(8)
+    assert cache.get("read", (), fetch) == 16
+    assert fetches == [7, 8]
+
+def test_empty_immutable_reads_are_refetched():
+    answers = iter([None, [], {"timestamp": "0x1"}])
+    fetches = []
+
+    def fetch():
+        fetches.append(1)
+        return next(answers)
+
+    cache = ChainReadCache(lambda: 1)
+    assert cache.get_immutable("eth_getBlockByHash", (BLOCK_HASH,), fetch) is None
+    assert cache.get_immutable("eth_getBlockByHash", (BLOCK_HASH,), fetch) == []
+    assert cache.get_immutable("eth_getBlockByHash", (BLOCK_HASH,), fetch) == {"timestamp": "0x1"}
+    assert cache.get_immutable("eth_getBlockByHash", (BLOCK_HASH,), fetch) == {"timestamp": "0x1"}
+    assert len(fetches) == 3
+    cache.remember("eth_getTransactionReceipt", (TX_HASH,), None)
+    assert cache.lookup_immutable("eth_getTransactionReceipt", (TX_HASH,)) == (False, None)
+
+def test_transaction_status_with_unknown_block(node):
+    blocks = {}
+    node.block = 200
+    node.handlers["eth_getTransactionReceipt"] = lambda params: {
+        "transactionHash": params[0], "blockHash": BLOCK_HASH, "blockNumber": hex(100),
+        "status": "0x1", "gasUsed": hex(21000)
+    }
+    node.handlers["eth_getBlockByHash"] = lambda params: blocks.get(params[0])
+    client = JsonRpcClient(node.url)
+    service = BlockchainService(client, head_ttl=0)
+
+    status = service.get_transaction_status(TX_HASH)
+    assert status["status"] == "confirmed" and status["timestamp"] is None
+    # Neither the missing block nor the receipt without it became final
+    assert service.chain_cache.lookup_immutable("eth_getTransactionReceipt", (TX_HASH,)) == (False, None)
+
+    blocks[BLOCK_HASH] = {"hash": BLOCK_HASH, "timestamp": hex(1700000000)}
+    status = service.get_transaction_status(TX_HASH)
+    assert status["timestamp"] == "2023-11-14T22:13:20"
+    assert service.chain_cache.lookup_immutable("eth_getTransactionReceipt", (TX_HASH,))[0]
+    client.close()
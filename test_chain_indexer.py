@@ -0,0 +1,157 @@
+"""
+Chain Indexer Tests for XMRT DAO
+Logs from a local node land in treasury_transactions and survive reorgs and result caps
+"""
+
+import os
+from datetime import datetime
+
+import pytest
+
+from conftest import NodeError
+from src.benchmark_db import _create_app
+from src.models.user import db
+from src.models.dao import IndexedTransaction, TreasuryTransaction
+from src.migrations import upgrade
+from src.services.abi import encode_arguments, event_topic, find_entry
+from src.services.blockchain import BlockchainService
+from src.services.chain_indexer import ChainIndexer, IndexerError
+from src.services.rpc import JsonRpcClient, RpcError
+
+SENDER = "0x" + "11" * 20
+RECIPIENT = "0x" + "22" * 20
+
+class FakeChain:
+    """One Transfer per block; blocks from ``fork_from`` on belong to fork ``fork``"""
+
+    def __init__(self, node, token_address: str, transfer_topic: str):
+        self.node = node
+        self.token_address = token_address
+        self.transfer_topic = transfer_topic
+        self.fork = 0
+        self.fork_from = 0
+        self.cap = None
+        self.error = None
+        node.handlers["eth_getLogs"] = self.get_logs
+        node.handlers["eth_getBlockByNumber"] = self.get_block
+
+    def _fork_of(self, number: int) -> int:
+        return self.fork if number >= self.fork_from else 0
+
+    def block_hash(self, number: int) -> str:
+        return f"0x{self._fork_of(number):02x}{number:062x}"
+
+    def transaction_hash(self, number: int) -> str:
+        return f"0x{0xff - self._fork_of(number):02x}{number:062x}"
+
+    def get_block(self, params):
+        number = int(params[0], 16)
+        if number > self.node.block:
+            return None
+        return {"number": hex(number), "hash": self.block_hash(number), "timestamp": hex(1700000000 + 12 * number)}
+
+    def get_logs(self, params):
+        if self.error is not None:
+            raise NodeError(self.error)
+        first, last = int(params[0]["fromBlock"], 16), min(int(params[0]["toBlock"], 16), self.node.block)
+        numbers = range(max(first, 1), last + 1)
+        if self.cap is not None and len(numbers) > self.cap:
+            raise NodeError(f"query returned more than {self.cap} results", -32005)
+        return [{
+            "address": self.token_address,
+            "blockNumber": hex(number),
+            "blockHash": self.block_hash(number),
+            "transactionHash": self.transaction_hash(number),
+            "topics": [self.transfer_topic, "0x" + SENDER[2:].rjust(64, "0"), "0x" + RECIPIENT[2:].rjust(64, "0")],
+            "data": "0x" + encode_arguments(["uint256"], [number * 10 ** 18]).hex(),
+            "removed": False
+        } for number in numbers]
+
+@pytest.fixture
+def app(tmp_path):
+    app = _create_app(f"sqlite:///{os.path.join(tmp_path, 'indexer.db')}", {})
+    with app.app_context():
+        upgrade()
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+
+@pytest.fixture
+def service(node):
+    client = JsonRpcClient(node.url)
+    yield BlockchainService(client)
+    client.close()
+
+@pytest.fixture
+def chain(node, service):
+    node.block = 40
+    return FakeChain(node, service.token_info.contract_address,
+                     event_topic(find_entry(service.token_abi, "Transfer", "event")))
+
+def _indexer(service, **options) -> ChainIndexer:
+    options = {"range_size": 16, "reorg_depth": 8, "workers": 2, **options}
+    return ChainIndexer(service, **options)
+
+def _ledger():
+    return db.session.execute(db.select(TreasuryTransaction).order_by(TreasuryTransaction.block_number)).scalars().all()
+
+def test_indexes_every_transfer(app, chain, service):
+    indexer = _indexer(service)
+    assert indexer.sync_once() == 40
+    ledger = _ledger()
+    assert [row.block_number for row in ledger] == list(range(1, 41))
+    assert ledger[6].transaction_hash == chain.transaction_hash(7)
+    assert ledger[6].description == "Transferred 7 XMRT"
+    assert indexer.next_block() == 41
+    # Nothing new on the chain: nothing written
+    assert indexer.sync_once() == 0
+
+def test_reorg_rolls_back_only_indexed_rows(app, node, chain, service):
+    indexer = _indexer(service)
+    indexer.sync_once()
+    manual = TreasuryTransaction(transaction_hash="0x" + "ab" * 32, transaction_type="treasury",
+                                 description="Recorded by hand", amount="1", block_number=38,
+                                 created_at=datetime.utcnow())
+    db.session.add(manual)
+    db.session.commit()
+    chain.fork, chain.fork_from = 1, 35
+    node.block = 42
+    assert indexer.sync_once() == 10
+    assert indexer.stats["reorgs"] == 1
+    hashes = {row.transaction_hash for row in _ledger()}
+    assert manual.transaction_hash in hashes
+    assert {chain.transaction_hash(number) for number in range(1, 43)} <= hashes
+    assert len(hashes) == 43
+    assert db.session.query(IndexedTransaction).count() == 42
+
+def test_result_cap_splits_the_range(app, node, chain, service):
+    chain.cap = 5
+    indexer = _indexer(service)
+    assert indexer.sync_once() == 40
+    assert [row.block_number for row in _ledger()] == list(range(1, 41))
+    assert node.methods["eth_getLogs"] > 4
+
+def test_other_errors_are_not_split(app, node, chain, service):
+    chain.error = "internal error"
+    indexer = _indexer(service)
+    with pytest.raises(RpcError):
+        indexer.fetch_range(1, 16)
+    assert node.methods["eth_getLogs"] == 1
+
+def test_one_lease_holder(app, chain, service):
+    first, second = _indexer(service), _indexer(service)
+    assert first.acquire_lease()
+    assert first.acquire_lease()
+    assert not second.acquire_lease()
+    first.release_lease()
+    assert second.acquire_lease()
+    assert not first.acquire_lease()
+    with pytest.raises(IndexerError):
+        first._hold_lease()
+
+def test_expired_lease_is_taken_over(app, chain, service):
+    stalled = _indexer(service, lease_ttl=-1)
+    assert stalled.acquire_lease()
+    successor = _indexer(service)
+    assert successor.acquire_lease()
+    assert not stalled.acquire_lease()
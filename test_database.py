@@ -0,0 +1,36 @@
+"""
+Database Configuration Tests for XMRT DAO
+Engine settings and SQLite pragmas come from the environment
+"""
+
+import os
+
+import pytest
+from sqlalchemy import text
+
+from src.benchmark_db import MODES, _create_app
+from src.database import database_url, engine_options
+from src.models.user import db
+
+def test_database_url_defaults_to_sqlite_and_fixes_legacy_scheme(monkeypatch):
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+    assert database_url("/srv/app.db") == "sqlite:////srv/app.db"
+    monkeypatch.setenv("DATABASE_URL", "postgres://dao@db/xmrt")
+    assert database_url("/srv/app.db") == "postgresql://dao@db/xmrt"
+
+def test_engine_options_per_backend(monkeypatch):
+    monkeypatch.setenv("DB_POOL_SIZE", "5")
+    monkeypatch.setenv("SQLITE_BUSY_TIMEOUT_MS", "2500")
+    postgres = engine_options("postgresql://dao@db/xmrt")
+    assert (postgres["pool_size"], postgres["max_overflow"], postgres["pool_pre_ping"]) == (5, 20, True)
+    assert engine_options("sqlite:///app.db")["connect_args"] == {"timeout": 2.5, "check_same_thread": False}
+
+@pytest.mark.parametrize("mode, expected", [("sqlite-wal", ("wal", 1, 5000)), ("sqlite-default", ("delete", 2, 0))])
+def test_sqlite_pragmas_are_applied_per_connection(tmp_path, mode, expected):
+    app = _create_app(f"sqlite:///{os.path.join(tmp_path, 'pragmas.db')}", MODES[mode])
+    with app.app_context():
+        settings = tuple(db.session.execute(text(f"PRAGMA {name}")).scalar()
+                         for name in ("journal_mode", "synchronous", "busy_timeout"))
+        db.session.remove()
+        db.engine.dispose()
+    assert settings == expected
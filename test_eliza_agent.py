@@ -0,0 +1,169 @@
+"""
+Eliza Agent Tests for XMRT DAO
+Batched, concurrent and single requests leave agents in the same state
+"""
+
+import threading
+from datetime import datetime
+
+import pytest
+
+from src.services.eliza_agent import (
+    AgentBusyError, AgentDecision, AgentPersonality, ConversationHistory, DecisionHistory, ElizaAgent,
+    ResponseTemplateCache, SharedKnowledgeBase, get_message_analyzer, shared_knowledge
+)
+
+MESSAGES = [
+    "What is the status of proposal #3?",
+    "Is the treasury allocation safe?",
+    "I love this DAO, how do I vote?",
+    "Urgent: audit the security of the bridge now",
+    "Tell me about XMRT token performance",
+]
+
+@pytest.fixture
+def agent():
+    return ElizaAgent("Eliza-Test", AgentPersonality.GOVERNANCE, {"history_window": 100})
+
+def _history(agent, session_id):
+    return [(entry["user"], entry["agent"]) for entry in agent.memory_store.get(session_id).conversation_history]
+
+def test_batch_matches_single_requests(agent):
+    single = ElizaAgent("Eliza-Single", AgentPersonality.GOVERNANCE, {"history_window": 100})
+    items = [(f"session-{index % 2}", message) for index, message in enumerate(MESSAGES * 3)]
+    expected = [(session_id, single.generate_response(message, session_id)) for session_id, message in items]
+    assert list(agent.generate_responses(items, batch_size=4)) == expected
+    for session_id in ("session-0", "session-1"):
+        assert _history(agent, session_id) == _history(single, session_id)
+    assert agent.decision_history.total_count == len(items)
+    assert agent.memory_store.get("session-0").context == single.memory_store.get("session-0").context
+
+def test_batch_is_consumed_lazily(agent):
+    consumed = []
+
+    def messages():
+        for message in MESSAGES:
+            consumed.append(message)
+            yield "session", message
+
+    results = agent.generate_responses(messages(), batch_size=2)
+    next(results)
+    assert consumed == MESSAGES[:2]
+
+def test_history_window_drops_the_oldest_exchange():
+    history = ConversationHistory(3)
+    for index in range(5):
+        history.append(float(index), f"q{index}", f"answer {index}")
+    assert len(history) == 3
+    assert [entry["user"] for entry in history] == ["q2", "q3", "q4"]
+    assert history[-1] == {"timestamp": "1970-01-01T00:00:04", "user": "q4", "agent": "answer 4"}
+    # Only the retained text is accounted
+    assert history.text_size == sum(len(f"q{index}answer {index}") for index in range(2, 5))
+    assert history.to_list() == list(history)
+
+def _decision(decision_type: str, confidence: float, second: int) -> AgentDecision:
+    return AgentDecision(decision_type=decision_type, confidence=confidence, reasoning=f"{decision_type} reasoning",
+                         recommended_action="Provide guidance", data_sources=["knowledge_base"],
+                         timestamp=datetime(2024, 1, 1, 0, 0, second))
+
+def test_decision_ring_keeps_window_and_lifetime_aggregates():
+    history = DecisionHistory(capacity=3)
+    assert not history and history.last_timestamp() is None
+    for second, (decision_type, confidence) in enumerate([("governance", 0.5), ("treasury", 0.75),
+                                                          ("governance", 1.0), ("security", 0.5)]):
+        history.append(_decision(decision_type, confidence, second))
+    assert [decision.decision_type for decision in history] == ["treasury", "governance", "security"]
+    assert history[0] == _decision("treasury", 0.75, 1)
+    assert history.last_timestamp() == datetime(2024, 1, 1, 0, 0, 3)
+    assert history.get_stats() == {
+        "total": 4,
+        "mean_confidence": 2.75 / 4,
+        "by_type": {"governance": 2, "treasury": 1, "security": 1},
+        "window_size": 3,
+        "window_mean_confidence": 2.25 / 3,
+        "window_by_type": {"treasury": 1, "governance": 1, "security": 1}
+    }
+    with pytest.raises(IndexError):
+        history[3]
+
+def test_executor_completes_each_session_in_submission_order(agent):
+    sessions = [f"session-{index}" for index in range(6)]
+    futures = [(session_id, message, agent.executor.submit(session_id, message))
+               for index in range(20) for session_id in sessions
+               for message in [f"{MESSAGES[index % len(MESSAGES)]} ({index})"]]
+    for session_id, message, future in futures:
+        assert future.result(5)
+    for session_id in sessions:
+        assert [user for user, _ in _history(agent, session_id)] == \
+            [message for owner, message, _ in futures if owner == session_id]
+    agent.executor.shutdown()
+    assert agent.executor.get_stats()["completed"] == 120
+
+def test_full_queue_and_shutdown_refuse_requests(agent, monkeypatch):
+    agent.config.update(workers=1, queue_size=1)
+    started, release = threading.Event(), threading.Event()
+
+    def generate_response(message, session_id, additional_data):
+        started.set()
+        release.wait(5)
+        return message
+
+    monkeypatch.setattr(agent, "generate_response", generate_response)
+    executor = agent.executor
+    running = executor.submit("a", "first")
+    assert started.wait(5)
+    queued = executor.submit("b", "second")
+    with pytest.raises(AgentBusyError):
+        executor.submit("c", "third", timeout=0)
+    assert executor.try_submit("c", "third") is None
+    release.set()
+    assert (running.result(5), queued.result(5)) == ("first", "second")
+    executor.shutdown()
+    with pytest.raises(RuntimeError, match="shut down"):
+        executor.submit("a", "late")
+    assert executor.get_stats()["rejected"] == 1
+
+def _render(templates: ResponseTemplateCache, message: str) -> str:
+    return templates.render(message, get_message_analyzer().scan(message.lower()))
+
+def test_response_table_renders_metrics_and_quotes_the_message():
+    templates = ResponseTemplateCache(AgentPersonality.GOVERNANCE, {"current_metrics": {"voting_participation": "40%"}})
+    assert "with 40% of token holders" in _render(templates, "How does voting work?")
+    assert "Regarding 'Hello {there}', I can" in _render(templates, "Hello {there}")
+    assert _render(templates, "Hi again").count("'Hi again'") == 1
+    # Messages with the same trigger keywords share one table entry
+    assert templates.get_stats() == {"entries": 2, "hits": 1, "misses": 2, "hit_rate": 1 / 3}
+    templates.reload({"current_metrics": {"voting_participation": "55%"}})
+    assert "with 55% of token holders" in _render(templates, "How does voting work?")
+    assert templates.get_stats()["entries"] == 1
+
+def test_knowledge_overlay_stays_with_its_agent(agent):
+    other = ElizaAgent("Eliza-Other", AgentPersonality.GOVERNANCE)
+    shared = shared_knowledge.view(AgentPersonality.GOVERNANCE)
+    agent.reload_knowledge_base({"specialization": "Quadratic voting", "current_metrics": {"voting_participation": "12%"}})
+    assert agent.knowledge_base["specialization"] == "Quadratic voting"
+    assert agent.knowledge_base["dao_principles"] == shared["dao_principles"]
+    assert other.knowledge_base is shared
+    assert shared["specialization"] == "Governance and proposal analysis"
+    assert agent.response_templates is not other.response_templates
+    assert "with 12% of token holders" in agent.generate_response("How does voting work?", "s")
+    assert "with 12% of token holders" not in other.generate_response("How does voting work?", "s")
+
+def test_shared_knowledge_is_read_only_and_refreshed_for_every_personality():
+    knowledge = SharedKnowledgeBase({"principles": ["transparency"]},
+                                    {AgentPersonality.TREASURY: {"specialization": "Treasury"}},
+                                    {"tvl": "$1M"})
+    view = knowledge.view(AgentPersonality.TREASURY)
+    with pytest.raises(TypeError):
+        view["specialization"] = "Anything"
+    with pytest.raises(TypeError):
+        view["current_metrics"]["tvl"] = "$0"
+    assert view["principles"] == ("transparency",)
+    assert "specialization" not in knowledge.view(AgentPersonality.SECURITY)
+    templates = knowledge.response_templates(AgentPersonality.TREASURY)
+    knowledge.refresh_metrics({"tvl": "$2M"})
+    # Views are swapped on refresh, never modified in place
+    assert view["current_metrics"]["tvl"] == "$1M"
+    for personality in (AgentPersonality.TREASURY, AgentPersonality.SECURITY):
+        assert knowledge.view(personality)["current_metrics"]["tvl"] == "$2M"
+    assert "$2M TVL" in _render(templates, "treasury")
@@ -0,0 +1,24 @@
+"""
+Message Analyzer Regression Tests for XMRT DAO
+The analyzer and its keyword mask must agree with the original per-keyword checks
+"""
+
+import pytest
+
+from src.benchmark_analyzer import CORPUS, generate_messages, keywords, reference_analyze
+from src.services.eliza_agent import get_message_analyzer
+
+@pytest.mark.parametrize("message", CORPUS)
+def test_corpus_matches_reference(message):
+    assert get_message_analyzer().analyze(message) == reference_analyze(message)
+
+def test_generated_messages_match_reference():
+    analyzer = get_message_analyzer()
+    for message in generate_messages(5000, seed=11):
+        assert analyzer.analyze(message) == reference_analyze(message), message
+
+def test_find_keywords_is_substring_containment():
+    analyzer = get_message_analyzer()
+    known = keywords()
+    for message in CORPUS + generate_messages(2000, seed=13):
+        assert sorted(analyzer.find_keywords(message)) == [word for word in known if word in message], message
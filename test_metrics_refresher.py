@@ -0,0 +1,63 @@
+"""
+Metrics Refresher Tests for XMRT DAO
+Only live values are published, and failing sources are flagged stale past the bound
+"""
+
+import pytest
+
+from src.services.blockchain import BlockchainService
+from src.services.eliza_agent import (
+    AgentPersonality, MetricsRefresher, SharedKnowledgeBase, blockchain_metrics_source
+)
+from src.services.rpc import JsonRpcClient
+
+@pytest.fixture
+def knowledge():
+    return SharedKnowledgeBase({"name": "XMRT DAO"}, {}, {"proposals_count": 3})
+
+class FlakySource:
+    """Returns ``values`` until ``failing`` is set"""
+
+    def __init__(self, **values):
+        self.values = values
+        self.failing = False
+
+    def __call__(self):
+        if self.failing:
+            raise RuntimeError("source down")
+        return dict(self.values)
+
+def test_chain_source_publishes_only_node_values(node):
+    client = JsonRpcClient(node.url)
+    metrics = blockchain_metrics_source(BlockchainService(client))()
+    client.close()
+    assert metrics == {"latest_block": 100, "gas_price": "20 gwei"}
+
+def test_mock_chain_source_publishes_nothing():
+    assert blockchain_metrics_source(BlockchainService())() == {}
+
+def test_refresh_publishes_to_every_view(knowledge):
+    refresher = MetricsRefresher({"dao": FlakySource(proposals_count=5)}, knowledge=knowledge)
+    refresher.refresh_once()
+    for personality in (None, AgentPersonality.GOVERNANCE):
+        metrics = knowledge.view(personality)["current_metrics"]
+        assert metrics["proposals_count"] == 5
+        assert metrics["metrics_stale"] is False
+
+def test_failing_source_keeps_last_values_until_stale(knowledge):
+    source = FlakySource(proposals_count=5)
+    refresher = MetricsRefresher({"dao": source}, max_staleness=60, knowledge=knowledge)
+    refresher.refresh_once()
+    source.failing = True
+    source.values["proposals_count"] = 6
+    metrics = refresher.refresh_once()
+    assert metrics["proposals_count"] == 5
+    assert not metrics["metrics_stale"]
+    assert refresher.get_status()["sources"]["dao"]["error"] == "source down"
+    refresher._fetched_at["dao"] -= 61
+    assert refresher.refresh_once()["metrics_stale"]
+    assert knowledge.metrics["metrics_stale"]
+    source.failing = False
+    metrics = refresher.refresh_once()
+    assert metrics["proposals_count"] == 6
+    assert not metrics["metrics_stale"]
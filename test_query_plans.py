@@ -0,0 +1,46 @@
+"""
+Query Plan Tests for XMRT DAO
+Every hot query must be answered from an index, not a table scan
+"""
+
+import os
+
+import pytest
+from sqlalchemy import text
+
+from src.benchmark_db import _create_app
+from src.models.user import db
+from src.migrations import find_table_scans, upgrade
+
+@pytest.fixture
+def app(tmp_path):
+    app = _create_app(f"sqlite:///{os.path.join(tmp_path, 'plans.db')}", {})
+    with app.app_context():
+        upgrade()
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+
+def test_hot_queries_use_an_index(app):
+    assert find_table_scans() == {}
+
+# Index each hot query depends on; the two chat session indexes back each
+# other up, and the status listing index also serves active_proposals
+INDEX_FOR_QUERY = {
+    "recent_chat_messages": "ix_chat_messages_created_at",
+    "proposals_by_status_page": "ix_proposals_status_created_at_id",
+    "recent_proposals": "ix_proposals_created_at",
+    "ledger_block_range": "ix_treasury_transactions_block_number",
+    "ledger_from_address": "ix_treasury_transactions_from_address_created_at",
+    "ledger_to_address": "ix_treasury_transactions_to_address_created_at",
+    "votes_by_proposal_page": "ix_votes_proposal_id_created_at_id",
+    "votes_by_voter": "ix_votes_voter_address_created_at",
+}
+
+@pytest.mark.parametrize("query, index", sorted(INDEX_FOR_QUERY.items()))
+def test_dropped_index_is_reported(app, query, index):
+    with db.engine.begin() as connection:
+        connection.execute(text(f"DROP INDEX {index}"))
+    assert set(find_table_scans()) == {query}
+    assert upgrade() == [index]
+    assert find_table_scans() == {}
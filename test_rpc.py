@@ -0,0 +1,85 @@
+"""
+RPC Transport Tests for XMRT DAO
+Reads are retried and fail over; transaction sends are never replayed
+"""
+
+import asyncio
+
+import pytest
+
+from src.services.rpc import AsyncRpcClient, JsonRpcClient, RpcTransportError
+
+RAW_TRANSACTION = "0x" + "ab" * 100
+
+@pytest.fixture
+def sends(node):
+    received = []
+    node.handlers["eth_sendRawTransaction"] = lambda params: received.append(params[0]) or "0x" + "11" * 32
+    return received
+
+def _run(coroutine):
+    return asyncio.run(coroutine)
+
+def test_reads_are_retried(node):
+    async def read():
+        client = AsyncRpcClient([node.url], backoff=0.001)
+        try:
+            return await client.call("eth_blockNumber"), client.stats["retries"]
+        finally:
+            await client.close()
+
+    node.unavailable = 1
+    assert _run(read()) == (hex(node.block), 1)
+    assert node.round_trips == 2
+
+def test_sends_are_not_replayed(node, sends):
+    async def send():
+        client = AsyncRpcClient([node.url, node.url], backoff=0.001)
+        try:
+            return await client.call("eth_sendRawTransaction", [RAW_TRANSACTION])
+        finally:
+            await client.close()
+
+    node.unavailable = 1
+    with pytest.raises(RpcTransportError):
+        _run(send())
+    assert sends == [RAW_TRANSACTION]
+    assert node.round_trips == 1
+
+def test_sends_are_pipelined_apart_from_reads(node, sends):
+    async def mixed():
+        client = AsyncRpcClient([node.url], backoff=0.001, batch_window=0.05)
+        try:
+            return await asyncio.gather(
+                client.call("eth_blockNumber"),
+                client.call("eth_sendRawTransaction", [RAW_TRANSACTION]),
+                client.call("eth_sendRawTransaction", [RAW_TRANSACTION[:-2] + "cd"]),
+                client.call("eth_gasPrice"),
+                return_exceptions=True
+            )
+        finally:
+            await client.close()
+
+    results = _run(mixed())
+    assert results == [hex(node.block), "0x" + "11" * 32, "0x" + "11" * 32, hex(20 * 10 ** 9)]
+    assert node.round_trips == 2
+
+    # Both first requests fail: the reads are retried, the sends are not
+    node.reset()
+    sends.clear()
+    node.unavailable = 2
+    results = _run(mixed())
+    assert results[0] == hex(node.block) and results[3] == hex(20 * 10 ** 9)
+    assert all(isinstance(result, RpcTransportError) for result in results[1:3])
+    assert len(sends) == 2
+    assert node.round_trips == 3
+
+def test_sync_client_does_not_resend(node, sends):
+    client = JsonRpcClient(node.url)
+    client.call("eth_blockNumber")
+    # Drop the keep-alive connection under the client
+    client._connection.sock.close()
+    with pytest.raises(RpcTransportError):
+        client.call("eth_sendRawTransaction", [RAW_TRANSACTION])
+    assert client.call("eth_blockNumber") == hex(node.block)
+    client.close()
@@ -0,0 +1,84 @@
+"""
+Session Memory Tests for XMRT DAO
+Agent sessions are bounded by count, idle time and estimated bytes
+"""
+
+from datetime import datetime, timedelta
+
+from src.services.eliza_agent import AgentMemory, ConversationHistory, SessionMemoryStore
+
+def _memory(session_id: str, idle: float = 0, text: str = "") -> AgentMemory:
+    now = datetime.utcnow()
+    history = ConversationHistory(entries=[(0.0, text, text)] if text else ())
+    return AgentMemory(session_id=session_id, context={}, conversation_history=history, user_preferences={},
+                       created_at=now, last_updated=now - timedelta(seconds=idle))
+
+def test_least_recently_used_session_is_evicted():
+    store = SessionMemoryStore(max_sessions=2)
+    store.put("a", _memory("a"))
+    store.put("b", _memory("b"))
+    # Reading "a" makes "b" the least recently used
+    assert store.get("a") is not None
+    store.put("c", _memory("c"))
+    assert list(store) == ["a", "c"]
+    assert store.get_stats()["evicted_lru"] == 1
+
+def test_idle_sessions_expire():
+    store = SessionMemoryStore(idle_ttl=60)
+    store.put("idle", _memory("idle", idle=120))
+    store.put("fresh", _memory("fresh", idle=30))
+    # The expired session at the front of the ordering went on insert
+    assert "idle" not in store
+    store.get("fresh").last_updated -= timedelta(seconds=60)
+    assert store.get("fresh") is None
+    assert store.get_stats()["evicted_ttl"] == 2
+    assert len(store) == 0
+
+def test_evict_expired_sweeps_every_idle_session():
+    store = SessionMemoryStore(idle_ttl=60)
+    for session_id in ("a", "b", "c"):
+        store.put(session_id, _memory(session_id))
+    store.get("a").last_updated -= timedelta(seconds=120)
+    store.get("c").last_updated -= timedelta(seconds=120)
+    assert store.evict_expired() == 2
+    assert list(store) == ["b"]
+
+def test_byte_budget_evicts_oldest_but_keeps_one_session():
+    # Each of these sessions is estimated at about 1.6 kB
+    store = SessionMemoryStore(max_bytes=3500)
+    store.put("a", _memory("a", text="x" * 500))
+    store.put("b", _memory("b", text="x" * 500))
+    assert list(store) == ["a", "b"]
+    store.put("c", _memory("c", text="x" * 500))
+    assert list(store) == ["b", "c"]
+    assert store.get_stats()["evicted_bytes"] == 1
+    # A single session over the budget stays
+    store.put("big", _memory("big", text="x" * 5000))
+    assert list(store) == ["big"]
+    assert store.total_bytes == store.get_stats()["bytes"] > store.max_bytes
+
+def test_touch_reaccounts_a_grown_session():
+    store = SessionMemoryStore(max_bytes=3000)
+    store.put("a", _memory("a"))
+    store.put("b", _memory("b"))
+    before = store.total_bytes
+    memory = store.get("a")
+    memory.conversation_history.append(0.0, "x" * 1000, "x" * 1000)
+    store.touch("a")
+    assert store.total_bytes > before
+    # "a" was touched last, so "b" made room for it
+    assert list(store) == ["a"]
+
+def test_miss_is_restored_through_the_loader():
+    loaded = []
+
+    def loader(session_id):
+        loaded.append(session_id)
+        return _memory(session_id) if session_id == "known" else None
+
+    store = SessionMemoryStore(loader=loader)
+    assert store.get("known") is store.get("known")
+    assert store.get("unknown") is None
+    assert store.get("other", restore=False) is None
+    assert loaded == ["known", "unknown"]
+    assert store.get_stats()["restored"] == 1
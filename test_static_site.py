@@ -0,0 +1,67 @@
+"""
+Static Site Tests for XMRT DAO
+Only content-hashed build assets may be cached as immutable, and sidecars are negotiated
+"""
+
+import gzip
+import os
+
+import pytest
+from flask import Flask
+
+from src.static_site import HASHED_ASSET, StaticSite, precompress
+
+@pytest.mark.parametrize("path", [
+    "assets/index-Bcjdok3u.js",
+    "assets/index-B_c-ok3u.css",
+    "assets/index-Bcjdok3u.js.map",
+    "assets/fonts/inter-AbCdEf12.woff2",
+])
+def test_hashed_assets(path):
+    assert HASHED_ASSET.search(path)
+
+@pytest.mark.parametrize("path", [
+    "index.html",
+    "favicon.ico",
+    "apple-touch-icon.png",
+    "hero-background.jpg",
+    "android-chrome-192x192.png",
+    "xmrt-whitepaper.svg",
+    "assets/hero-background.jpg",
+    "images/index-Bcjdok3u.js",
+])
+def test_unhashed_files(path):
+    assert not HASHED_ASSET.search(path)
+
+@pytest.fixture
+def site_folder(tmp_path):
+    (tmp_path / "assets").mkdir()
+    (tmp_path / "index.html").write_text("<html>" + "<div>XMRT DAO</div>" * 200 + "</html>")
+    (tmp_path / "assets" / "index-Bcjdok3u.js").write_text("console.log('xmrt');" * 200)
+    (tmp_path / "assets" / "tiny-Bcjdok3u.css").write_text("body{margin:0}")
+    (tmp_path / "hero-background.jpg").write_bytes(bytes(range(256)) * 8)
+    return tmp_path
+
+def test_precompress_writes_only_useful_variants(site_folder):
+    written = precompress(str(site_folder))
+    gzipped = sorted(os.path.relpath(path, site_folder).replace(os.sep, "/") for path in written if path.endswith(".gz"))
+    # Too small and not compressible files are skipped
+    assert gzipped == ["assets/index-Bcjdok3u.js.gz", "index.html.gz"]
+    body = (site_folder / "index.html").read_bytes()
+    assert gzip.decompress((site_folder / "index.html.gz").read_bytes()) == body
+    # Output is reproducible, so rebuilds do not change ETags
+    assert precompress(str(site_folder)) == written
+
+@pytest.mark.parametrize("accept, encoding", [("gzip, deflate", "gzip"), ("identity", None), ("", None)])
+def test_precompressed_variant_is_negotiated(site_folder, accept, encoding):
+    precompress(str(site_folder))
+    site = StaticSite(str(site_folder))
+    assert site.get_stats()["precompressed"] == 2
+    body = (site_folder / "assets" / "index-Bcjdok3u.js").read_bytes()
+    with Flask(__name__).test_request_context("/assets/index-Bcjdok3u.js", headers={"Accept-Encoding": accept}):
+        response = site.serve("assets/index-Bcjdok3u.js")
+    assert response.content_encoding == encoding
+    assert "Accept-Encoding" in response.vary
+    assert response.headers["Cache-Control"] == "public, max-age=31536000, immutable"
+    data = response.get_data()
+    assert (gzip.decompress(data) if encoding else data) == body
@@ -0,0 +1,89 @@
+"""
+Transcript Journal Tests for XMRT DAO
+Buffered chat messages reach chat_messages at least once, in order, and are never dropped
+"""
+
+import os
+import threading
+
+import pytest
+
+from src.benchmark_db import _create_app
+from src.models.user import db
+from src.models.dao import ChatMessage
+from src.migrations import upgrade
+from src.services.eliza_agent import TranscriptJournal, TranscriptJournalFullError
+
+@pytest.fixture
+def app(tmp_path):
+    app = _create_app(f"sqlite:///{os.path.join(tmp_path, 'journal.db')}", {})
+    with app.app_context():
+        upgrade()
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+
+@pytest.fixture
+def journal(app):
+    journal = TranscriptJournal(batch_size=2, max_pending=4, max_wait=0.05)
+    # Attached without the flusher thread, so tests flush explicitly
+    journal.app = app
+    return journal
+
+def _contents():
+    return [row.content for row in db.session.query(ChatMessage).order_by(ChatMessage.id)]
+
+def test_flush_writes_every_message_in_batches(journal):
+    journal.record("Eliza-Governance", "s1", [("q1", "a1"), ("q2", "a2")])
+    assert journal.pending() == 4
+    assert journal.flush() == 4
+    assert _contents() == ["q1", "a1", "q2", "a2"]
+    assert journal.get_stats()["batches"] == 2
+    assert journal.pending() == 0
+
+def test_failed_batch_is_retried_in_order(journal, monkeypatch):
+    journal.record("Eliza-Governance", "s1", [("q1", "a1"), ("q2", "a2")])
+    write = journal._write
+    failures = iter([True])
+
+    def flaky_write(rows):
+        if next(failures, False):
+            raise RuntimeError("database is locked")
+        write(rows)
+
+    monkeypatch.setattr(journal, "_write", flaky_write)
+    with pytest.raises(RuntimeError):
+        journal.flush()
+    assert journal.pending() == 4
+    assert journal.last_error == "database is locked"
+    assert journal.flush() == 4
+    assert _contents() == ["q1", "a1", "q2", "a2"]
+    assert journal.get_stats()["failures"] == 1
+
+def test_full_buffer_refuses_instead_of_dropping(journal):
+    journal.record("Eliza-Governance", "s1", [("q1", "a1"), ("q2", "a2")])
+    assert journal.is_full()
+    with pytest.raises(TranscriptJournalFullError):
+        journal.record("Eliza-Governance", "s1", [("q3", "a3")])
+    stats = journal.get_stats()
+    assert (stats["pending"], stats["refused"], stats["waits"]) == (4, 2, 1)
+    journal.flush()
+    assert _contents() == ["q1", "a1", "q2", "a2"]
+
+def test_waiting_record_proceeds_once_flushed(journal):
+    journal.max_wait = 5
+    journal.record("Eliza-Governance", "s1", [("q1", "a1"), ("q2", "a2")])
+    recorded = threading.Event()
+
+    def record():
+        journal.record("Eliza-Governance", "s1", [("q3", "a3")])
+        recorded.set()
+
+    thread = threading.Thread(target=record)
+    thread.start()
+    assert not recorded.wait(0.1)
+    journal.flush()
+    thread.join()
+    assert recorded.is_set()
+    journal.flush()
+    assert _contents() == ["q1", "a1", "q2", "a2", "q3", "a3"]
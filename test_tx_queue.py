@@ -0,0 +1,175 @@
+"""
+Transaction Queue Tests for XMRT DAO
+Sends are matched by their local hash, nonce gaps are filled and overdue transactions replaced
+"""
+
+import threading
+
+import pytest
+
+from conftest import NodeError
+from src.services.blockchain import BlockchainService
+from src.services.rpc import JsonRpcClient
+from src.services.tx_queue import PendingTransaction, TransactionQueue, transaction_hash
+
+ACCOUNT = "0x" + "aa" * 20
+CONTRACT = "0x" + "cc" * 20
+
+class FakeSigner:
+    """Encodes the nonce, recipient and data instead of signing"""
+    address = ACCOUNT
+
+    @staticmethod
+    def sign(transaction):
+        return f"0x{transaction['nonce']:016x}{transaction['to'][2:]}{transaction['data'][2:]}"
+
+class FakePool:
+    """Transaction pool of the mock node; ``replies`` forces a send error per hash"""
+
+    def __init__(self, node, nonce: int = 5):
+        self.nonce = nonce
+        self.mined_nonces = nonce
+        self.sent = []
+        self.known = set()
+        self.replies = {}
+        self.receipts = {}
+        node.handlers["eth_getTransactionCount"] = lambda params: hex(self.nonce if params[1] == "pending"
+                                                                      else self.mined_nonces)
+        node.handlers["eth_sendRawTransaction"] = self.send
+        node.handlers["eth_getTransactionByHash"] = lambda params: {"hash": params[0]} if params[0] in self.known else None
+        node.handlers["eth_getTransactionReceipt"] = lambda params: self.receipts.get(params[0])
+
+    def send(self, params):
+        raw = params[0]
+        tx_hash = transaction_hash(raw)
+        if tx_hash in self.replies:
+            raise NodeError(self.replies[tx_hash])
+        self.sent.append(raw)
+        self.known.add(tx_hash)
+        return tx_hash
+
+@pytest.fixture
+def pool(node):
+    return FakePool(node)
+
+@pytest.fixture
+def tx_queue(node, pool):
+    client = JsonRpcClient(node.url)
+    tx_queue = TransactionQueue(BlockchainService(client), FakeSigner(), poll_interval=60)
+    tx_queue._ensure_started()
+    yield tx_queue
+    tx_queue.stop(0.1)
+    client.close()
+
+def _raw(nonce: int, data: str, to: str = CONTRACT) -> str:
+    return FakeSigner.sign({"nonce": nonce, "to": to, "data": data})
+
+def _pending(*datas: str):
+    return [PendingTransaction(to=CONTRACT, data=data, gas=100000) for data in datas]
+
+@pytest.mark.parametrize("reply, known", [("already known", False), ("nonce too low", True)])
+def test_node_already_holding_the_hash_is_accepted(tx_queue, pool, reply, known):
+    tx_hash = transaction_hash(_raw(5, "0x01"))
+    pool.replies[tx_hash] = reply
+    if known:
+        pool.known.add(tx_hash)
+    batch = _pending("0x01")
+    tx_queue._send_batch(batch)
+    assert batch[0].error is None
+    assert batch[0].tx_hash == tx_hash
+    # The allocator was not reset
+    assert tx_queue.nonces.next_nonce == 6
+    assert tx_queue.stats["sent"] == 1
+
+def test_nonce_too_low_for_another_hash_is_rejected(tx_queue, pool):
+    pool.replies[transaction_hash(_raw(5, "0x01"))] = "nonce too low"
+    batch = _pending("0x01")
+    tx_queue._send_batch(batch)
+    assert "nonce too low" in batch[0].error
+    assert tx_queue.nonces.next_nonce is None
+
+def test_rejected_nonce_below_an_accepted_one_is_filled(tx_queue, pool):
+    pool.replies[transaction_hash(_raw(6, "0x02"))] = "insufficient funds for gas * price + value"
+    batch = _pending("0x01", "0x02", "0x03")
+    tx_queue._send_batch(batch)
+    assert [pending.error is None for pending in batch] == [True, False, True]
+    assert _raw(6, "0x", to=ACCOUNT) in pool.sent
+    assert tx_queue.stats["gap_fills"] == 1
+    assert tx_queue.nonces.next_nonce is None
+
+def test_trailing_rejection_leaves_no_gap(tx_queue, pool):
+    pool.replies[transaction_hash(_raw(6, "0x02"))] = "insufficient funds for gas * price + value"
+    batch = _pending("0x01", "0x02")
+    tx_queue._send_batch(batch)
+    assert tx_queue.stats["gap_fills"] == 0
+    assert pool.sent == [_raw(5, "0x01")]
+
+def test_overdue_transaction_is_replaced_then_fails(tx_queue, pool):
+    mined, stuck = _pending("0x01", "0x02")
+    tx_queue._send_batch([mined, stuck])
+    pool.receipts[mined.tx_hash] = {"status": "0x1"}
+    pool.mined_nonces = 6
+    tx_queue.confirm_timeout = 0
+    assert tx_queue.poll_receipts() == 1
+    assert mined.error is None and mined.done.is_set()
+    # Still minable: replaced at its nonce, not failed
+    assert not stuck.done.is_set()
+    assert stuck.cancel_hash is not None
+    assert tx_queue.stats["cancels"] == 1
+    assert tx_queue.nonces.next_nonce == 7
+    tx_queue.poll_receipts()
+    assert tx_queue.stats["cancels"] == 1
+    # The replacement took the nonce
+    pool.mined_nonces = 7
+    tx_queue.poll_receipts()
+    assert "was used by another transaction" in stuck.error and stuck.done.is_set()
+    assert tx_queue.get_stats()["in_flight"] == 0
+    assert tx_queue.stats["expired"] == 1
+    assert tx_queue.nonces.next_nonce == 7
+
+def test_overdue_transaction_mined_late_is_confirmed(tx_queue, pool):
+    batch = _pending("0x01")
+    tx_queue._send_batch(batch)
+    tx_queue.confirm_timeout = 0
+    tx_queue.poll_receipts()
+    pool.receipts[batch[0].tx_hash] = {"status": "0x1"}
+    pool.mined_nonces = 6
+    assert tx_queue.poll_receipts() == 1
+    assert batch[0].error is None
+    assert tx_queue.stats["confirmed"] == 1
+
+def test_least_recently_used_queue_is_stopped(node, monkeypatch):
+    class KeySigner(FakeSigner):
+        def __init__(self, private_key):
+            self.address = "0x" + private_key[-40:]
+
+    monkeypatch.setattr("src.services.blockchain.LocalSigner", KeySigner)
+    service = BlockchainService(JsonRpcClient(node.url), max_tx_queues=2)
+    keys = ["0x" + f"{index:064x}" for index in range(3)]
+    first, second = service.transaction_queue(keys[0]), service.transaction_queue(keys[1])
+    stopped = threading.Event()
+    monkeypatch.setattr(second, "stop", lambda timeout: stopped.set())
+    # Using the first key makes the second the least recently used
+    assert service.transaction_queue(keys[0]) is first
+    service.transaction_queue(keys[2])
+    assert stopped.wait(5)
+    assert len(service.get_transaction_stats()) == 2
+    assert service.transaction_queue(keys[1]) is not second
+
+@pytest.mark.parametrize("amount", ["", "ten", "NaN", "-1", "0", "1e-19", None])
+def test_invalid_stake_amount_is_refused(node, amount):
+    client = JsonRpcClient(node.url)
+    result = BlockchainService(client).stake_tokens(ACCOUNT, amount)
+    client.close()
+    assert not result.success
+    assert result.error_message
+    assert "eth_sendRawTransaction" not in node.methods
+
+def test_signing_key_without_eth_account_fails_at_startup(node):
+    try:
+        import eth_account  # noqa: F401
+        pytest.skip("eth-account is installed")
+    except ImportError:
+        pass
+    with pytest.raises(RuntimeError, match="eth-account"):
+        BlockchainService(JsonRpcClient(node.url), private_key="0x" + "01" * 32)
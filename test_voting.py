@@ -0,0 +1,109 @@
+"""
+Vote Casting Tests for XMRT DAO
+One vote per address, and counters that stay exact under concurrent writers
+"""
+
+import os
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from src.benchmark_db import MODES, _create_app
+from src.models.user import db
+from src.models.dao import Proposal, Vote
+from src.migrations import upgrade
+from src.services.voting import (
+    DuplicateVoteError, ProposalNotFoundError, cast_vote, ingest_votes, reconcile_vote_counts
+)
+
+@pytest.fixture
+def app(tmp_path):
+    app = _create_app(f"sqlite:///{os.path.join(tmp_path, 'votes.db')}", MODES["sqlite-wal"])
+    with app.app_context():
+        upgrade()
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+
+def _proposal() -> int:
+    proposal = Proposal(title="Test", description="test", creator_address="0x0",
+                        voting_ends_at=datetime.utcnow() + timedelta(days=7))
+    db.session.add(proposal)
+    db.session.commit()
+    return proposal.id
+
+def test_duplicate_vote_is_rejected_without_counting(app):
+    proposal_id = _proposal()
+    cast_vote(proposal_id, "0xabc", True, 3)
+    with pytest.raises(DuplicateVoteError):
+        cast_vote(proposal_id, "0xabc", False, 5)
+    proposal = db.session.get(Proposal, proposal_id)
+    assert (proposal.votes_for, proposal.votes_against, proposal.total_votes) == (3, 0, 3)
+    assert db.session.query(Vote).count() == 1
+
+def test_other_integrity_errors_are_not_duplicates(app):
+    proposal_id = _proposal()
+    with pytest.raises(IntegrityError) as raised:
+        cast_vote(proposal_id, None, True)
+    assert not isinstance(raised.value, DuplicateVoteError)
+
+def test_missing_proposal(app):
+    with pytest.raises(ProposalNotFoundError):
+        cast_vote(12345, "0xabc", True)
+
+def test_concurrent_votes_keep_counters_exact(app):
+    proposal_id = _proposal()
+    errors = []
+
+    def voter(worker: int):
+        with app.app_context():
+            for sequence in range(25):
+                try:
+                    # Every worker also retries one shared address, which only one may win
+                    cast_vote(proposal_id, f"0x{worker:02x}{sequence:02x}", sequence % 2 == 0, 2)
+                    cast_vote(proposal_id, "0xshared", True, 7)
+                except DuplicateVoteError:
+                    pass
+                except Exception as exc:
+                    errors.append(exc)
+
+    threads = [threading.Thread(target=voter, args=(worker,)) for worker in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    db.session.expire_all()
+    proposal = db.session.get(Proposal, proposal_id)
+    assert db.session.query(Vote).count() == 8 * 25 + 1
+    assert (proposal.votes_for, proposal.votes_against, proposal.total_votes) == (8 * 13 * 2 + 7, 8 * 12 * 2, 8 * 25 * 2 + 7)
+    assert reconcile_vote_counts(fix=False) == []
+
+def test_ingest_skips_duplicates(app):
+    proposal_id = _proposal()
+    cast_vote(proposal_id, "0x1", True)
+    stats = ingest_votes([
+        {"proposal_id": proposal_id, "voter_address": "0x1", "vote_choice": False},
+        {"proposal_id": proposal_id, "voter_address": "0x2", "vote_choice": False, "vote_weight": 4},
+        {"proposal_id": proposal_id, "voter_address": "0x2", "vote_choice": True},
+    ])
+    assert stats == {"accepted": 1, "duplicates": 2, "rejected": 0, "batches": 1}
+    assert reconcile_vote_counts(fix=False) == []
+
+def test_ingest_rejects_unknown_proposals_and_bad_weights(app):
+    proposal_id = _proposal()
+    stats = ingest_votes([
+        {"proposal_id": proposal_id, "voter_address": "0x1", "vote_choice": True, "vote_weight": 3},
+        {"proposal_id": proposal_id + 1, "voter_address": "0x2", "vote_choice": True},
+        {"proposal_id": proposal_id, "voter_address": "0x3", "vote_choice": True, "vote_weight": 0},
+        {"proposal_id": proposal_id, "voter_address": "0x4", "vote_choice": False, "vote_weight": -2},
+        {"proposal_id": proposal_id, "voter_address": "0x5", "vote_choice": False, "vote_weight": "2"},
+        {"proposal_id": proposal_id, "voter_address": "0x6", "vote_choice": False, "vote_weight": True},
+    ], batch_size=2)
+    assert stats == {"accepted": 1, "duplicates": 0, "rejected": 5, "batches": 1}
+    assert db.session.query(Vote).count() == 1
+    assert db.session.get(Proposal, proposal_id).total_votes == 3
+    assert reconcile_vote_counts(fix=False) == []
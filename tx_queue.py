@@ -0,0 +1,445 @@
+"""
+Transaction Submission Queue for XMRT DAO
+Nonce allocation, concurrent signing, batched sends and shared receipt polling
+"""
+
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Optional
+
+from src.services.abi import keccak256
+from src.services.rpc import RpcError, RpcTransportError
+
+# How nodes say they already hold a transaction with the same hash
+ALREADY_KNOWN_ERRORS = ("already known", "known transaction", "already imported")
+
+# Gas of a plain value transfer, used for the self-transfers filling nonce gaps
+TRANSFER_GAS = 21000
+
+def transaction_hash(raw: str) -> str:
+    """Hash of a signed raw transaction, as the node will report it"""
+    return "0x" + keccak256(bytes.fromhex(raw[2:])).hex()
+
+def require_eth_account():
+    """Raise a clear error when eth-account, which signs transactions, is missing"""
+    try:
+        import eth_account  # noqa: F401
+    except ImportError:
+        raise RuntimeError("Sending transactions requires the eth-account package (pip install eth-account)")
+
+class LocalSigner:
+    """Signs legacy (EIP-155) transactions with an in-memory key using eth-account"""
+
+    def __init__(self, private_key: str):
+        require_eth_account()
+        from eth_account import Account
+
+        self._account = Account.from_key(private_key)
+        self.address = self._account.address
+
+    def sign(self, transaction: Dict[str, Any]) -> str:
+        signed = self._account.sign_transaction(transaction)
+        raw = getattr(signed, "raw_transaction", None) or signed.rawTransaction
+        return "0x" + bytes(raw).hex()
+
+class NonceAllocator:
+    """Hands out consecutive nonces for one account without asking the node each time
+
+    The first allocation reads the account's pending transaction count;
+    after a rejected send ``reset`` makes the next allocation re-read it,
+    so nonces the node never accepted are reused.
+    """
+
+    def __init__(self, rpc, address: str):
+        self.rpc = rpc
+        self.address = address
+        self._next: Optional[int] = None
+        self._lock = threading.Lock()
+        self.syncs = 0
+
+    def allocate(self, count: int = 1) -> List[int]:
+        with self._lock:
+            if self._next is None:
+                self._next = int(self.rpc.call("eth_getTransactionCount", [self.address, "pending"]), 16)
+                self.syncs += 1
+            nonces = list(range(self._next, self._next + count))
+            self._next += count
+            return nonces
+
+    def reset(self):
+        with self._lock:
+            self._next = None
+
+    @property
+    def next_nonce(self) -> Optional[int]:
+        return self._next
+
+@dataclass
+class PendingTransaction:
+    """A contract call travelling through the queue"""
+    to: str
+    data: str
+    gas: int
+    label: str = ""
+    submitted_at: float = field(default_factory=time.monotonic)
+    nonce: Optional[int] = None
+    gas_price: Optional[int] = None
+    tx_hash: Optional[str] = None
+    cancel_hash: Optional[str] = None
+    sent_at: Optional[float] = None
+    confirmed_at: Optional[float] = None
+    receipt: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    sent: threading.Event = field(default_factory=threading.Event, repr=False)
+    done: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    def wait_sent(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the node accepted (or rejected) the transaction"""
+        return self.sent.wait(timeout)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the transaction is mined or has failed"""
+        return self.done.wait(timeout)
+
+class TransactionQueue:
+    """Sends one account's transactions through a single pipeline
+
+    ``submit`` only enqueues. A dispatcher thread takes up to ``max_batch``
+    queued calls at a time, gives them consecutive nonces from a local
+    allocator, prices them with the per-block cached gas price, signs them
+    on ``workers`` threads and broadcasts them all at once, which the
+    pooled RPC client pipelines into one JSON-RPC batch. A watcher thread
+    polls receipts for every transaction in flight with one batched
+    request per new block, instead of one poll loop per transaction.
+
+    A send counts as accepted once the node holds the locally computed
+    hash, even when it answers "already known" or "nonce too low" for it.
+    A rejected nonce below an accepted one would hold the later
+    transactions back forever, so it is filled with a zero-value transfer
+    to the account itself. A transaction still unmined ``confirm_timeout``
+    seconds after it was sent is replaced by such a transfer at the same
+    nonce and a higher gas price; it fails only once the chain has used
+    its nonce for something else, since until then it can still be mined.
+    """
+
+    def __init__(self, service, signer, workers: int = 4, max_batch: int = 50,
+                 poll_interval: float = 2.0, gas_price_multiplier: float = 1.0,
+                 confirm_timeout: float = 600.0):
+        self.service = service
+        self.rpc = service.rpc
+        self.signer = signer
+        self.workers = workers
+        self.max_batch = max_batch
+        self.poll_interval = poll_interval
+        self.gas_price_multiplier = gas_price_multiplier
+        self.confirm_timeout = confirm_timeout
+        self.nonces = NonceAllocator(self.rpc, signer.address)
+        self._queue: "queue.Queue[PendingTransaction]" = queue.Queue()
+        self._in_flight: Dict[str, PendingTransaction] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._pid = None
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._send_pool: Optional[ThreadPoolExecutor] = None
+        self._threads: List[threading.Thread] = []
+        self._confirm_times: deque = deque(maxlen=1000)
+        self._last_head: Optional[int] = None
+        self.last_gas_price: Optional[int] = None
+        self.stats = {
+            "submitted": 0,
+            "sent": 0,
+            "confirmed": 0,
+            "reverted": 0,
+            "failed": 0,
+            "expired": 0,
+            "cancels": 0,
+            "gap_fills": 0,
+            "batches": 0,
+            "receipt_polls": 0
+        }
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._pid == os.getpid() and all(thread.is_alive() for thread in self._threads):
+                return
+            # Threads do not survive fork; a worker gets its own
+            self._pid = os.getpid()
+            self._stop.clear()
+            self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="tx-sign")
+            self._send_pool = ThreadPoolExecutor(max_workers=self.max_batch, thread_name_prefix="tx-send")
+            self._threads = [
+                threading.Thread(target=self._dispatch_loop, name="tx-dispatch", daemon=True),
+                threading.Thread(target=self._receipt_loop, name="tx-receipts", daemon=True)
+            ]
+            for thread in self._threads:
+                thread.start()
+
+    def submit(self, to: str, data: str, gas: int, label: str = "") -> PendingTransaction:
+        """Queue a contract call; never blocks on the node"""
+        self._ensure_started()
+        pending = PendingTransaction(to=to, data=data, gas=gas, label=label)
+        with self._lock:
+            self.stats["submitted"] += 1
+        self._queue.put(pending)
+        return pending
+
+    def stop(self, timeout: float = 30.0):
+        """Send what is queued, then stop; transactions in flight are not waited for"""
+        deadline = time.monotonic() + timeout
+        while not self._queue.empty() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+        for pool in (self._pool, self._send_pool):
+            if pool is not None:
+                pool.shutdown(wait=False)
+
+    def _gas_price(self) -> int:
+        fetch = lambda *_: int(self.rpc.call("eth_gasPrice"), 16)
+        cache = self.service.chain_cache
+        wei = cache.get("eth_gasPrice", (), fetch) if cache is not None else fetch()
+        self.last_gas_price = int(wei * self.gas_price_multiplier)
+        return self.last_gas_price
+
+    def _take_batch(self) -> List[PendingTransaction]:
+        try:
+            batch = [self._queue.get(timeout=self.poll_interval)]
+        except queue.Empty:
+            return []
+        while len(batch) < self.max_batch:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _fail(self, pending: PendingTransaction, error: str):
+        pending.error = error
+        with self._lock:
+            self.stats["failed"] += 1
+        pending.sent.set()
+        pending.done.set()
+
+    def _is_known(self, tx_hash: str) -> Optional[bool]:
+        """Whether the node has a transaction; None when it cannot tell"""
+        try:
+            return self.rpc.call("eth_getTransactionByHash", [tx_hash]) is not None
+        except Exception:
+            return None
+
+    def _broadcast(self, raw: str) -> Optional[str]:
+        """Send a signed transaction; None once the node holds it, else why not"""
+        tx_hash = transaction_hash(raw)
+        try:
+            self.rpc.call("eth_sendRawTransaction", [raw])
+            return None
+        except RpcTransportError as exc:
+            # The send may have reached the node; only a definite "no" is a rejection
+            return str(exc) if self._is_known(tx_hash) is False else None
+        except RpcError as exc:
+            message = exc.message.lower()
+            if any(fragment in message for fragment in ALREADY_KNOWN_ERRORS):
+                return None
+            # The nonce is used up, possibly by this very transaction
+            if "nonce too low" in message and self._is_known(tx_hash):
+                return None
+            return str(exc)
+        except Exception as exc:
+            return str(exc)
+
+    def _transaction(self, nonce: int, gas_price: int, gas: int, to: str, data: str) -> Dict[str, Any]:
+        return {
+            "nonce": nonce,
+            "gasPrice": gas_price,
+            "gas": gas,
+            "to": to,
+            "value": 0,
+            "data": data,
+            "chainId": self.service.chain_id
+        }
+
+    def _send_noop(self, nonce: int, gas_price: int) -> Optional[str]:
+        """Send a zero-value transfer to the account itself; its hash, or None if refused"""
+        try:
+            raw = self.signer.sign(self._transaction(nonce, gas_price, TRANSFER_GAS, self.signer.address, "0x"))
+        except Exception:
+            return None
+        return transaction_hash(raw) if self._broadcast(raw) is None else None
+
+    def _fill_gap(self, nonce: int, gas_price: int) -> bool:
+        """Use up a rejected nonce"""
+        if self._send_noop(nonce, gas_price) is None:
+            return False
+        with self._lock:
+            self.stats["gap_fills"] += 1
+        return True
+
+    def _cancel(self, pending: PendingTransaction):
+        """Replace an overdue transaction; nodes require at least 10% more gas price"""
+        try:
+            gas_price = max(self._gas_price(), pending.gas_price * 9 // 8 + 1)
+        except Exception:
+            return
+        pending.cancel_hash = self._send_noop(pending.nonce, gas_price)
+        if pending.cancel_hash is not None:
+            with self._lock:
+                self.stats["cancels"] += 1
+
+    def _send_batch(self, batch: List[PendingTransaction]):
+        try:
+            gas_price = self._gas_price()
+            nonces = self.nonces.allocate(len(batch))
+        except Exception as exc:
+            for pending in batch:
+                self._fail(pending, f"Could not prepare transaction: {exc}")
+            return
+        transactions = []
+        for pending, nonce in zip(batch, nonces):
+            pending.nonce = nonce
+            pending.gas_price = gas_price
+            transactions.append(self._transaction(nonce, gas_price, pending.gas, pending.to, pending.data))
+
+        def sign(transaction: Dict[str, Any]) -> Any:
+            try:
+                return self.signer.sign(transaction)
+            except Exception as exc:
+                return exc
+
+        def send(raw: Any) -> Optional[str]:
+            if isinstance(raw, Exception):
+                return str(raw)
+            return self._broadcast(raw)
+
+        # Sends run all at once so the RPC client pipelines them together
+        raws = list(self._pool.map(sign, transactions))
+        errors = list(self._send_pool.map(send, raws))
+        accepted = [pending.nonce for pending, error in zip(batch, errors) if error is None]
+        now = time.monotonic()
+        for pending, raw, error in zip(batch, raws, errors):
+            if error is not None:
+                self._fail(pending, error)
+                continue
+            pending.tx_hash = transaction_hash(raw)
+            pending.sent_at = now
+            with self._lock:
+                self._in_flight[pending.tx_hash] = pending
+                self.stats["sent"] += 1
+            pending.sent.set()
+        if len(accepted) < len(batch):
+            # Later transactions the node accepted wait for every lower nonce
+            for pending, error in zip(batch, errors):
+                if error is not None and accepted and pending.nonce < max(accepted):
+                    self._fill_gap(pending.nonce, gas_price)
+            # Nonces still unused on the node are handed out again
+            self.nonces.reset()
+        with self._lock:
+            self.stats["batches"] += 1
+
+    def _dispatch_loop(self):
+        while not self._stop.is_set():
+            batch = self._take_batch()
+            if batch:
+                self._send_batch(batch)
+
+    def poll_receipts(self) -> int:
+        """Look up every in-flight transaction once; return how many were mined
+
+        Transactions still unmined ``confirm_timeout`` seconds after they
+        were sent are replaced at their nonce, and fail once the chain has
+        used that nonce without mining them.
+        """
+        with self._lock:
+            in_flight = list(self._in_flight.items())
+        if not in_flight:
+            return 0
+        receipts = []
+        for start in range(0, len(in_flight), self.max_batch):
+            chunk = in_flight[start:start + self.max_batch]
+            receipts.extend(self.rpc.batch([("eth_getTransactionReceipt", [tx_hash]) for tx_hash, _ in chunk]))
+        mined = 0
+        overdue = []
+        now = time.monotonic()
+        with self._lock:
+            self.stats["receipt_polls"] += 1
+            for (tx_hash, pending), receipt in zip(in_flight, receipts):
+                if receipt is None:
+                    if now - pending.sent_at > self.confirm_timeout:
+                        overdue.append((tx_hash, pending))
+                    continue
+                del self._in_flight[tx_hash]
+                pending.receipt = receipt
+                pending.confirmed_at = now
+                if int(receipt.get("status", "0x1"), 16) == 1:
+                    self.stats["confirmed"] += 1
+                else:
+                    pending.error = "Transaction reverted"
+                    self.stats["reverted"] += 1
+                self._confirm_times.append(now - pending.submitted_at)
+                pending.done.set()
+                mined += 1
+        if overdue:
+            self._resolve_overdue(overdue)
+        return mined
+
+    def _resolve_overdue(self, overdue: List[Any]):
+        mined_nonces = int(self.rpc.call("eth_getTransactionCount", [self.signer.address, "latest"]), 16)
+        used = [(tx_hash, pending) for tx_hash, pending in overdue if pending.nonce < mined_nonces]
+        # Still no receipt once the nonce is used: another transaction took it.
+        # Asked again since the transaction may have been mined after the poll.
+        receipts = self.rpc.batch([("eth_getTransactionReceipt", [tx_hash]) for tx_hash, _ in used]) if used else []
+        replaced = {tx_hash for (tx_hash, _), receipt in zip(used, receipts) if receipt is None}
+        for tx_hash, pending in overdue:
+            if tx_hash in replaced:
+                with self._lock:
+                    if self._in_flight.pop(tx_hash, None) is None:
+                        continue
+                    self.stats["expired"] += 1
+                self._fail(pending, f"Transaction not mined within {self.confirm_timeout:g}s; "
+                                    f"nonce {pending.nonce} was used by another transaction")
+            elif pending.nonce >= mined_nonces and pending.cancel_hash is None:
+                self._cancel(pending)
+
+    def _receipt_loop(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                cache = self.service.chain_cache
+                head = cache.head() if cache is not None else int(self.rpc.call("eth_blockNumber"), 16)
+                # Receipts can only appear with a new block
+                if head != self._last_head:
+                    self._last_head = head
+                    self.poll_receipts()
+            except Exception:
+                # Retried on the next tick; a failing node must not end the loop
+                continue
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue depth, in-flight count, counters and time-to-confirm percentiles"""
+        with self._lock:
+            samples = sorted(self._confirm_times)
+            stats = dict(self.stats)
+            in_flight = len(self._in_flight)
+
+        def percentile(fraction: float) -> Optional[float]:
+            return round(samples[min(len(samples) - 1, int(fraction * len(samples)))], 3) if samples else None
+
+        return {
+            "address": self.signer.address,
+            "queue_depth": self._queue.qsize(),
+            "in_flight": in_flight,
+            "next_nonce": self.nonces.next_nonce,
+            "nonce_syncs": self.nonces.syncs,
+            "gas_price_wei": self.last_gas_price,
+            "time_to_confirm": {
+                "samples": len(samples),
+                "p50": percentile(0.5),
+                "p95": percentile(0.95),
+                "max": round(samples[-1], 3) if samples else None
+            },
+            **stats
+        }
@@ -0,0 +1,239 @@
+"""
+Vote Casting Service for XMRT DAO
+Keeps Proposal vote counters consistent with the Vote rows
+"""
+
+from collections import defaultdict
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+
+from sqlalchemy import case, func, insert, update
+from sqlalchemy.exc import IntegrityError
+
+from src.models.user import db
+from src.models.dao import Proposal, Vote
+
+class VoteError(ValueError):
+    """Base class for rejected votes"""
+
+class DuplicateVoteError(VoteError):
+    """The address has already voted on the proposal"""
+
+class ProposalNotFoundError(VoteError):
+    """The proposal being voted on does not exist"""
+
+# Names the one-vote-per-address constraint has: ours, and PostgreSQL's
+# default for tables created before it was named
+VOTE_UNIQUE_CONSTRAINTS = ("uq_votes_proposal_id_voter_address", "votes_proposal_id_voter_address_key")
+UNIQUE_VIOLATION = "23505"
+FOREIGN_KEY_VIOLATION = "23503"
+
+def _integrity_violation(error: IntegrityError) -> Tuple[Optional[str], Optional[str]]:
+    """(SQLSTATE, constraint name) of an integrity error, where the driver reports them"""
+    orig = error.orig
+    sqlstate = getattr(orig, "sqlstate", None) or getattr(orig, "pgcode", None)
+    diag = getattr(orig, "diag", None)
+    return sqlstate, getattr(diag, "constraint_name", None)
+
+def _is_duplicate_vote(error: IntegrityError) -> bool:
+    sqlstate, constraint = _integrity_violation(error)
+    if sqlstate is not None:
+        return sqlstate == UNIQUE_VIOLATION and constraint in VOTE_UNIQUE_CONSTRAINTS
+    # SQLite and MySQL only describe the violation in the message
+    message = str(error.orig)
+    return (
+        "UNIQUE constraint failed: votes.proposal_id, votes.voter_address" in message
+        or any(name in message for name in VOTE_UNIQUE_CONSTRAINTS)
+    )
+
+def _counter_deltas(votes_for: int, votes_against: int) -> Dict[str, Any]:
+    """SQL-side increments of the proposal counters for one or more votes"""
+    return {
+        "votes_for": func.coalesce(Proposal.votes_for, 0) + votes_for,
+        "votes_against": func.coalesce(Proposal.votes_against, 0) + votes_against,
+        "total_votes": func.coalesce(Proposal.total_votes, 0) + votes_for + votes_against
+    }
+
+def cast_vote(proposal_id: int, voter_address: str, vote_choice: bool, vote_weight: int = 1) -> Vote:
+    """Record a vote and apply its weight to the proposal counters
+
+    The Vote insert and the counter increment run in one transaction. The
+    increment is a single ``UPDATE ... SET votes_for = votes_for + :weight``,
+    so concurrent voters never overwrite each other's counts.
+    """
+    vote = Vote(
+        proposal_id=proposal_id,
+        voter_address=voter_address,
+        vote_choice=vote_choice,
+        vote_weight=vote_weight
+    )
+    session = db.session
+    try:
+        session.add(vote)
+        session.flush()
+        result = session.execute(
+            update(Proposal)
+            .where(Proposal.id == proposal_id)
+            .values(**_counter_deltas(vote_weight if vote_choice else 0, 0 if vote_choice else vote_weight))
+        )
+        if result.rowcount == 0:
+            raise ProposalNotFoundError(f"Proposal {proposal_id} not found")
+        session.commit()
+    except IntegrityError as exc:
+        session.rollback()
+        if _is_duplicate_vote(exc):
+            raise DuplicateVoteError(f"{voter_address} has already voted on proposal {proposal_id}") from exc
+        if _integrity_violation(exc)[0] == FOREIGN_KEY_VIOLATION:
+            raise ProposalNotFoundError(f"Proposal {proposal_id} not found") from exc
+        raise
+    except Exception:
+        session.rollback()
+        raise
+    return vote
+
+def reconcile_vote_counts(proposal_ids: Optional[Iterable[int]] = None, fix: bool = True) -> List[Dict[str, Any]]:
+    """Compare proposal counters with the weighted Vote sums in one pass
+
+    A single grouped aggregate over ``votes`` is joined to ``proposals``.
+    Every proposal whose counters disagree is returned with its stored and
+    expected values, and when ``fix`` is set, all mismatches are corrected
+    in one bulk update.
+    """
+    totals = (
+        db.session.query(
+            Vote.proposal_id.label("proposal_id"),
+            func.sum(case((Vote.vote_choice.is_(True), Vote.vote_weight), else_=0)).label("votes_for"),
+            func.sum(case((Vote.vote_choice.is_(False), Vote.vote_weight), else_=0)).label("votes_against"),
+            func.sum(Vote.vote_weight).label("total_votes")
+        )
+        .group_by(Vote.proposal_id)
+        .subquery()
+    )
+    query = (
+        db.session.query(
+            Proposal.id,
+            Proposal.votes_for,
+            Proposal.votes_against,
+            Proposal.total_votes,
+            func.coalesce(totals.c.votes_for, 0),
+            func.coalesce(totals.c.votes_against, 0),
+            func.coalesce(totals.c.total_votes, 0)
+        )
+        .outerjoin(totals, totals.c.proposal_id == Proposal.id)
+    )
+    if proposal_ids is not None:
+        query = query.filter(Proposal.id.in_(list(proposal_ids)))
+
+    mismatches = []
+    for (proposal_id, stored_for, stored_against, stored_total,
+         expected_for, expected_against, expected_total) in query:
+        stored = (stored_for or 0, stored_against or 0, stored_total or 0)
+        expected = (int(expected_for), int(expected_against), int(expected_total))
+        if stored != expected:
+            mismatches.append({
+                "id": proposal_id,
+                "stored": dict(zip(("votes_for", "votes_against", "total_votes"), stored)),
+                "expected": dict(zip(("votes_for", "votes_against", "total_votes"), expected))
+            })
+
+    if fix and mismatches:
+        db.session.bulk_update_mappings(Proposal, [
+            {"id": mismatch["id"], **mismatch["expected"]} for mismatch in mismatches
+        ])
+        db.session.commit()
+    return mismatches
+
+def ingest_votes(votes: Iterable[Dict[str, Any]], batch_size: int = 1000) -> Dict[str, int]:
+    """Bulk-insert a stream of votes, skipping duplicates
+
+    Votes are dicts with ``proposal_id``, ``voter_address``, ``vote_choice``
+    and optional ``vote_weight``. Each batch is deduplicated in memory, then
+    written with one multi-row ``INSERT ... ON CONFLICT DO NOTHING`` (or an
+    executemany of the rows not yet stored, on databases without it). The
+    counters of each proposal get one UPDATE per batch for the accepted
+    votes, in the same transaction. Votes whose weight is not a positive
+    integer, or whose proposal does not exist, are counted as ``rejected``.
+    """
+    stats = {"accepted": 0, "duplicates": 0, "rejected": 0, "batches": 0}
+    batch: Dict[Tuple[int, str], Dict[str, Any]] = {}
+    for vote in votes:
+        if not _is_valid_weight(vote.get("vote_weight", 1)):
+            stats["rejected"] += 1
+            continue
+        key = (vote["proposal_id"], vote["voter_address"])
+        if key in batch:
+            stats["duplicates"] += 1
+            continue
+        batch[key] = {
+            "proposal_id": vote["proposal_id"],
+            "voter_address": vote["voter_address"],
+            "vote_choice": bool(vote["vote_choice"]),
+            "vote_weight": vote.get("vote_weight", 1)
+        }
+        if len(batch) >= batch_size:
+            _ingest_batch(list(batch.values()), stats)
+            batch = {}
+    if batch:
+        _ingest_batch(list(batch.values()), stats)
+    return stats
+
+def _is_valid_weight(vote_weight: Any) -> bool:
+    return isinstance(vote_weight, int) and not isinstance(vote_weight, bool) and vote_weight > 0
+
+def _ingest_batch(rows: List[Dict[str, Any]], stats: Dict[str, int]):
+    session = db.session
+    try:
+        # One lookup per batch instead of relying on foreign keys, which
+        # SQLite does not enforce by default
+        proposal_ids = {row["proposal_id"] for row in rows}
+        known = set(session.scalars(db.select(Proposal.id).where(Proposal.id.in_(proposal_ids))))
+        valid = [row for row in rows if row["proposal_id"] in known]
+        rejected = len(rows) - len(valid)
+        rows = valid
+        accepted = _insert_new_votes(rows) if rows else []
+        deltas: Dict[int, List[int]] = defaultdict(lambda: [0, 0])
+        for proposal_id, vote_choice, vote_weight in accepted:
+            deltas[proposal_id][0 if vote_choice else 1] += vote_weight
+        for proposal_id, (votes_for, votes_against) in deltas.items():
+            session.execute(
+                update(Proposal)
+                .where(Proposal.id == proposal_id)
+                .values(**_counter_deltas(votes_for, votes_against))
+            )
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    stats["accepted"] += len(accepted)
+    stats["duplicates"] += len(rows) - len(accepted)
+    stats["rejected"] += rejected
+    stats["batches"] += 1
+
+def _insert_new_votes(rows: List[Dict[str, Any]]) -> List[Tuple[int, bool, int]]:
+    """Insert rows whose (proposal_id, voter_address) is new; return what was stored"""
+    session = db.session
+    dialect = session.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        statement = (
+            dialect_insert(Vote)
+            .on_conflict_do_nothing(index_elements=["proposal_id", "voter_address"])
+            .returning(Vote.proposal_id, Vote.vote_choice, Vote.vote_weight)
+        )
+        return [tuple(row) for row in session.execute(statement, rows)]
+
+    existing = set()
+    voters_by_proposal: Dict[int, List[str]] = defaultdict(list)
+    for row in rows:
+        voters_by_proposal[row["proposal_id"]].append(row["voter_address"])
+    for proposal_id, voters in voters_by_proposal.items():
+        existing.update(
+            (proposal_id, voter) for (voter,) in session.query(Vote.voter_address)
+            .filter(Vote.proposal_id == proposal_id, Vote.voter_address.in_(voters))
+        )
+    new_rows = [row for row in rows if (row["proposal_id"], row["voter_address"]) not in existing]
+    if new_rows:
+        session.execute(insert(Vote), new_rows)
+    return [(row["proposal_id"], row["vote_choice"], row["vote_weight"]) for row in new_rows]
@@ -0,0 +1,31 @@
+"""
+WSGI Entry Point for XMRT DAO
+
+    gunicorn -c src/gunicorn.conf.py
+
+The app is imported once in the master (``preload_app``), which starts no
+background threads; every worker starts its own after fork.
+"""
+
+from src.main import app, chain_indexer, metrics_refresher, transcript_journal
+from src.models.user import db
+from src.services.blockchain import get_blockchain_service
+
+def start_background_services():
+    """Reset inherited connections and start this process's background threads"""
+    with app.app_context():
+        # Pooled connections opened before fork must not be shared
+        db.engine.dispose(close=False)
+    metrics_refresher.start()
+    transcript_journal.start(app)
+    if chain_indexer is not None:
+        # Every worker starts it; the indexer lease lets one of them index
+        chain_indexer.start(app)
+
+def stop_background_services(timeout: float = 30.0):
+    """Stop background threads, draining buffered transcripts and queued transactions"""
+    metrics_refresher.stop(wait=False)
+    if chain_indexer is not None:
+        chain_indexer.stop(timeout)
+    get_blockchain_service().stop_transaction_queues(timeout)
+    transcript_journal.stop(timeout)